@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Scaling benchmark for multi-process correlation mining.
+Generates a synthetic sensor dataset with groups of correlated columns and
+times parallel_correlated_pairs for each worker count, reporting speedup
+over the single-process run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(REPO_ROOT))
+
+from src.data_processing.correlation_engine import correlated_pairs, parallel_correlated_pairs
+
+
+def generate_sensor_data(rows=2000, columns=10000, group_size=10, noise=0.3, seed=0):
+    """
+    Synthetic sensor matrix where each group of group_size columns follows one latent signal.
+
+    Returns:
+        2D float64 array (rows x columns)
+    """
+    rng = np.random.default_rng(seed)
+    groups = -(-columns // group_size)
+    latent = rng.normal(size=(rows, groups))
+    values = np.repeat(latent, group_size, axis=1)[:, :columns]
+    values += rng.normal(scale=noise, size=(rows, columns))
+    return values
+
+
+def run_scaling(values, worker_counts, threshold=0.7, block_size=1024, temp_dir=None):
+    """Time the correlation pass for each worker count."""
+    results = []
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        if workers == 1:
+            pairs = correlated_pairs(values.copy(), threshold, block_size)
+        else:
+            pairs = parallel_correlated_pairs(values, threshold, block_size, workers, temp_dir)
+        wall_time = time.perf_counter() - start
+        baseline = baseline or wall_time
+        result = {
+            "workers": workers,
+            "wall_time_s": wall_time,
+            "speedup": baseline / wall_time,
+            "pairs": int(len(pairs[0]))
+        }
+        results.append(result)
+        print(f"{workers:>3} workers: {wall_time:.2f}s  speedup x{result['speedup']:.2f}  "
+              f"{result['pairs']} pairs")
+    return results
+
+
+def main():
+    """Main entry point for the correlation scaling benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark correlation mining against worker count')
+    parser.add_argument('--rows', type=int, default=2000, help='Rows of synthetic data (default: 2000)')
+    parser.add_argument('--columns', type=int, default=10000, help='Columns of synthetic data (default: 10000)')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        help='Worker counts to run (default: 1, 2, 4, ... up to the CPU count)')
+    parser.add_argument('--block-size', type=int, default=1024, help='Columns per block (default: 1024)')
+    parser.add_argument('--threshold', type=float, default=0.7, help='Correlation threshold (default: 0.7)')
+    parser.add_argument('--temp-dir', help='Directory for the memory-mapped data')
+    parser.add_argument('--output', '-o', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    worker_counts = args.workers
+    if not worker_counts:
+        cpus = os.cpu_count() or 1
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cpus:
+            worker_counts.append(worker_counts[-1] * 2)
+
+    print(f"Generating {args.rows} x {args.columns} synthetic sensor data...")
+    values = generate_sensor_data(args.rows, args.columns)
+    results = run_scaling(values, worker_counts, args.threshold, args.block_size, args.temp_dir)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "rows": args.rows,
+                "columns": args.columns,
+                "block_size": args.block_size,
+                "cpu_count": os.cpu_count(),
+                "platform": platform.platform(),
+                "results": results
+            }, f, indent=2)
+        print(f"Results saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Throughput benchmark for the dictionary entity extractor.
+Builds a synthetic vocabulary of equipment, component and symptom terms and a
+corpus of synthetic work-order text, then reports compile time, automaton
+save/load time and single-core scan throughput in MB/s.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(REPO_ROOT))
+
+from src.knowledge_graph.ml.entity_extraction.extractor import DictionaryEntityExtractor
+
+ENTITY_TYPES = ("equipment", "component", "symptom")
+FILLER = ("technician", "reported", "replaced", "inspected", "during", "shift", "the", "on",
+          "and", "after", "found", "with", "unit", "was", "checked", "no", "further", "issues",
+          "scheduled", "follow", "up", "work", "order", "completed", "operator", "noted")
+
+
+def _word(rng):
+    """A pronounceable synthetic word."""
+    syllables = rng.randint(2, 4)
+    return "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(syllables))
+
+
+def generate_vocabulary(terms=300000, lexicon=20000, synonym_rate=0.2, seed=0):
+    """Synthetic vocabulary entries: 1-4 word terms over a shared lexicon, some with synonyms."""
+    rng = random.Random(seed)
+    words = sorted({_word(rng) for _ in range(lexicon)})
+    entries = []
+    seen = set()
+    while len(entries) < terms:
+        term = " ".join(rng.choice(words) for _ in range(rng.choice((1, 2, 2, 3, 3, 4))))
+        if term in seen:
+            continue
+        seen.add(term)
+        entry = {"term": term, "type": ENTITY_TYPES[len(entries) % len(ENTITY_TYPES)]}
+        if rng.random() < synonym_rate:
+            entry["synonyms"] = [f"{term[:3]}-{rng.randrange(1000)}"]
+        entries.append(entry)
+    return entries, words
+
+
+def generate_work_orders(entries, words, megabytes=5, term_rate=0.3, seed=1):
+    """Synthetic work-order text: filler and lexicon words with vocabulary terms mixed in."""
+    rng = random.Random(seed)
+    documents = []
+    size = 0
+    while size < megabytes * 1e6:
+        parts = []
+        for _ in range(rng.randint(10, 60)):
+            roll = rng.random()
+            if roll < term_rate:
+                # Some terms in upper case, as operators often write them
+                term = rng.choice(entries)["term"]
+                parts.append(term.upper() if roll < 0.05 else term)
+            elif roll < term_rate + 0.2:
+                parts.append(rng.choice(words))
+            else:
+                parts.append(rng.choice(FILLER))
+        document = f"WO-{len(documents):07d}: " + " ".join(parts) + "."
+        documents.append(document)
+        size += len(document.encode("utf-8"))
+    return documents
+
+
+def run_benchmark(terms=300000, megabytes=5, repeats=3):
+    """Compile, persist and scan; return the timings."""
+    entries, words = generate_vocabulary(terms)
+    documents = generate_work_orders(entries, words, megabytes)
+    corpus_bytes = sum(len(document.encode("utf-8")) for document in documents)
+
+    start = time.perf_counter()
+    extractor = DictionaryEntityExtractor(entries).compile()
+    compile_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "vocabulary.npz")
+        start = time.perf_counter()
+        extractor.save(path)
+        save_time = time.perf_counter() - start
+        file_size = os.path.getsize(path)
+        start = time.perf_counter()
+        extractor = DictionaryEntityExtractor.load(path)
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        DictionaryEntityExtractor.load(path, mmap_mode='r')
+        mmap_load_time = time.perf_counter() - start
+
+    scan_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        entities = sum(len(found) for found in extractor.extract_documents(documents))
+        scan_times.append(time.perf_counter() - start)
+    scan_time = min(scan_times)
+
+    return {
+        "terms": len(extractor),
+        "documents": len(documents),
+        "corpus_mb": corpus_bytes / 1e6,
+        "compile_s": compile_time,
+        "save_s": save_time,
+        "load_s": load_time,
+        "mmap_load_s": mmap_load_time,
+        "automaton_mb": file_size / 1e6,
+        "scan_s": scan_time,
+        "entities": entities,
+        "mb_per_s": corpus_bytes / 1e6 / scan_time
+    }
+
+
+def main():
+    """Main entry point for the entity extraction benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark dictionary entity extraction throughput')
+    parser.add_argument('--terms', type=int, default=300000, help='Vocabulary terms (default: 300000)')
+    parser.add_argument('--megabytes', type=float, default=5, help='Size of the synthetic corpus (default: 5)')
+    parser.add_argument('--repeats', type=int, default=3, help='Scan repetitions, best is reported (default: 3)')
+    parser.add_argument('--output', '-o', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    print(f"Building {args.terms} terms and {args.megabytes} MB of work orders...")
+    result = run_benchmark(args.terms, args.megabytes, args.repeats)
+    print(f"compile {result['compile_s']:.2f}s  save {result['save_s']:.2f}s  "
+          f"load {result['load_s']:.2f}s (mapped {result['mmap_load_s']:.2f}s)  "
+          f"({result['automaton_mb']:.1f} MB automaton)")
+    print(f"scan {result['corpus_mb']:.1f} MB in {result['scan_s']:.2f}s: "
+          f"{result['mb_per_s']:.2f} MB/s, {result['entities']} entities")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(dict(result, cpu_count=os.cpu_count(), platform=platform.platform()), f, indent=2)
+        print(f"Results saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark suite for the Excel converters.
+Generates synthetic workbooks and runs both excel_metadata_processor and the
+improved processor against them, reporting wall time, peak RSS and rows/second.
+Results are stored as JSON so runs from different commits can be compared.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(REPO_ROOT))
+
+from src.data_processing.synthetic_workbooks import generate_synthetic_workbook
+
+IMPROVED_PROCESSOR_PATH = (REPO_ROOT / "src" / "data_processing" / "excel-to-json" /
+                           "improved-excel-processor.py")
+
+CONVERTERS = ("basic", "improved")
+
+# Parameter grids: each case is one combination of the listed values
+PRESETS = {
+    "quick": {
+        "rows": [500, 2000],
+        "columns": [8],
+        "merge_density": [0.0, 0.05],
+        "merge_height": [3],
+        "metadata_layout": ["title_fields"],
+    },
+    "full": {
+        "rows": [1000, 10000, 50000],
+        "columns": [8, 32],
+        "merge_density": [0.0, 0.02, 0.1],
+        "merge_height": [2, 8],
+        "metadata_layout": ["none", "title_fields"],
+    },
+}
+
+
+def _load_converter(name):
+    """Import a converter's convert_hierarchical_excel function."""
+    if name == "basic":
+        from src.data_processing.excel_metadata_processor import convert_hierarchical_excel
+        return convert_hierarchical_excel
+    spec = importlib.util.spec_from_file_location("improved_excel_processor", IMPROVED_PROCESSOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    logging.getLogger("excel_processor").setLevel(logging.WARNING)
+    return module.convert_hierarchical_excel
+
+
+def _run_converter(name, excel_file, json_file, queue):
+    """Child process body: convert once and report timing and peak RSS."""
+    try:
+        convert = _load_converter(name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = convert(excel_file, json_file)
+            wall_time = time.perf_counter() - start
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rss_bytes = max_rss if sys.platform == "darwin" else max_rss * 1024
+        queue.put({
+            "status": "success",
+            "wall_time_s": wall_time,
+            "peak_rss_mb": rss_bytes / (1024 * 1024),
+            "records": len(result["data"])
+        })
+    except Exception as e:
+        queue.put({"status": "error", "error": str(e)})
+
+
+def run_case(converter, excel_file, json_file, timeout=3600):
+    """Run one converter on one workbook in a fresh process."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_run_converter, args=(converter, excel_file, json_file, queue))
+    process.start()
+    try:
+        measurement = queue.get(timeout=timeout)
+    except Exception:
+        measurement = {"status": "error", "error": "timed out"}
+        process.terminate()
+    process.join()
+    return measurement
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmarks(grid, converters=CONVERTERS, repeat=1, work_dir=None):
+    """Generate workbooks for every case in grid and benchmark each converter."""
+    work_dir = Path(work_dir or tempfile.mkdtemp(prefix="excel_bench_"))
+    os.makedirs(work_dir, exist_ok=True)
+
+    keys = list(grid)
+    cases = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        params = dict(zip(keys, values))
+        case_id = "_".join(f"{key}-{value}" for key, value in params.items())
+        excel_file = work_dir / f"{case_id}.xlsx"
+        if not excel_file.exists():
+            generate_synthetic_workbook(excel_file, **params)
+
+        for converter in converters:
+            runs = [run_case(converter, str(excel_file), str(work_dir / f"{case_id}_{converter}.json"))
+                    for _ in range(repeat)]
+            successful = [run for run in runs if run["status"] == "success"]
+            case = {"case": case_id, "converter": converter, "params": params}
+            if successful:
+                best = min(successful, key=lambda run: run["wall_time_s"])
+                case.update(best)
+                case["rows_per_s"] = params["rows"] / best["wall_time_s"]
+            else:
+                case.update(runs[-1])
+            cases.append(case)
+            print(_format_case(case))
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "cases": cases
+    }
+
+
+def _format_case(case):
+    if case["status"] != "success":
+        return f"{case['converter']:>9}  {case['case']}: ERROR {case.get('error')}"
+    return (f"{case['converter']:>9}  {case['case']}: {case['wall_time_s']:.3f}s  "
+            f"{case['peak_rss_mb']:.1f} MB  {case['rows_per_s']:.0f} rows/s")
+
+
+def compare_results(current, baseline, threshold=0.10):
+    """
+    Compare two result files case by case.
+
+    Returns a list of regressions: cases whose wall time or peak RSS grew by more
+    than threshold (a fraction) relative to the baseline.
+    """
+    baseline_cases = {(c["case"], c["converter"]): c for c in baseline["cases"]
+                      if c["status"] == "success"}
+    regressions = []
+    print(f"\nComparison against {baseline.get('commit', 'baseline')}:")
+    for case in current["cases"]:
+        base = baseline_cases.get((case["case"], case["converter"]))
+        if base is None or case["status"] != "success":
+            continue
+        time_ratio = case["wall_time_s"] / base["wall_time_s"]
+        rss_ratio = case["peak_rss_mb"] / base["peak_rss_mb"]
+        flag = ""
+        if time_ratio > 1 + threshold or rss_ratio > 1 + threshold:
+            flag = "  <-- regression"
+            regressions.append({"case": case["case"], "converter": case["converter"],
+                                "time_ratio": time_ratio, "rss_ratio": rss_ratio})
+        print(f"{case['converter']:>9}  {case['case']}: time x{time_ratio:.2f}  "
+              f"rss x{rss_ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    """Main entry point for the converter benchmarks."""
+    parser = argparse.ArgumentParser(description='Benchmark the Excel converters on synthetic workbooks')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='quick',
+                        help='Parameter grid to run (default: quick)')
+    parser.add_argument('--rows', type=int, nargs='+', help='Override the row counts')
+    parser.add_argument('--columns', type=int, nargs='+', help='Override the column counts')
+    parser.add_argument('--merge-density', type=float, nargs='+', help='Override the merge densities')
+    parser.add_argument('--merge-height', type=int, nargs='+', help='Override the merge heights')
+    parser.add_argument('--metadata-layout', nargs='+', help='Override the metadata layouts')
+    parser.add_argument('--converters', nargs='+', choices=CONVERTERS, default=list(CONVERTERS),
+                        help='Converters to benchmark (default: both)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per case; the fastest is kept')
+    parser.add_argument('--work-dir', help='Directory for generated workbooks and outputs')
+    parser.add_argument('--output', '-o', help='Results file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='Baseline results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Relative slowdown reported as a regression (default: 0.10)')
+    args = parser.parse_args()
+
+    grid = dict(PRESETS[args.preset])
+    for key in grid:
+        override = getattr(args, key)
+        if override:
+            grid[key] = override
+
+    results = run_benchmarks(grid, args.converters, args.repeat, args.work_dir)
+
+    output = Path(args.output) if args.output else (
+        REPO_ROOT / "benchmarks" / "results" / f"{results['commit']}.json")
+    os.makedirs(output.parent, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
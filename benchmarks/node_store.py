@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for the node attribute store and its secondary indexes.
+Ingests synthetic typed nodes with numeric properties in batches, then
+reports ingest and index build time, memory per column and index, and the
+latency of type, prefix and range lookups next to a full scan.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(REPO_ROOT))
+
+from src.knowledge_graph.node_store import NodeStore
+from src.knowledge_graph.schema.ontology import ENTITY_TYPES
+
+WORDS = ["bearing", "seal", "pump", "motor", "valve", "impeller", "shaft", "coupling", "gasket", "rotor"]
+
+
+def generate_nodes(nodes=1000000, seed=0):
+    """Return (names, types, mtbf_hours) for synthetic nodes."""
+    rng = random.Random(seed)
+    names = [f"{rng.choice(WORDS)} {rng.choice(WORDS)} {idx}" for idx in range(nodes)]
+    types = [rng.choice(ENTITY_TYPES) for _ in range(nodes)]
+    mtbf = [rng.uniform(10, 50000) for _ in range(nodes)]
+    return names, types, mtbf
+
+
+def _time(function, repeats=5):
+    """Best wall time of function() in milliseconds, and its last result."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    """Main entry point for the node store benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark node store ingest, indexes and lookups')
+    parser.add_argument('--nodes', type=int, default=1000000, help='Nodes to ingest (default: 1000000)')
+    parser.add_argument('--batch-size', type=int, default=100000, help='Nodes per ingest batch (default: 100000)')
+    parser.add_argument('--output', '-o', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    names, types, mtbf = generate_nodes(args.nodes)
+    store = NodeStore(indexed_properties=['mtbf_hours'])
+    start = time.perf_counter()
+    for offset in range(0, args.nodes, args.batch_size):
+        stop = offset + args.batch_size
+        store.upsert(names[offset:stop], types[offset:stop], {'mtbf_hours': mtbf[offset:stop]})
+    ingest_time = time.perf_counter() - start
+    stats = store.stats()
+    start = time.perf_counter()
+    store.rebuild_indexes()
+    rebuild_time = time.perf_counter() - start
+
+    queries = {
+        'type': (lambda: store.ids_of_type('Symptom'),
+                 lambda: [idx for idx, node_type in enumerate(types) if node_type == 'Symptom']),
+        'prefix': (lambda: store.ids_with_prefix('bearing seal'),
+                   lambda: [idx for idx, name in enumerate(names) if name.startswith('bearing seal')]),
+        'range': (lambda: store.ids_in_range('mtbf_hours', 100, 200),
+                  lambda: [idx for idx, value in enumerate(mtbf) if 100 <= value <= 200])
+    }
+    latencies = {}
+    for query, (indexed, scan) in queries.items():
+        indexed_ms, found = _time(indexed)
+        scan_ms, _ = _time(scan, repeats=1)
+        latencies[query] = {'indexed_ms': indexed_ms, 'scan_ms': scan_ms, 'matches': len(found)}
+
+    memory_mb = {name: size / 1e6 for name, size in stats['memory_bytes'].items()}
+    print(f"{args.nodes} nodes ingested in {ingest_time:.2f}s "
+          f"(incremental index time {sum(stats['build_time_s'].values()):.2f}s, full rebuild {rebuild_time:.2f}s)")
+    print("memory: " + ", ".join(f"{name} {size:.1f} MB" for name, size in memory_mb.items()))
+    for query, latency in latencies.items():
+        print(f"{query:>7}: {latency['indexed_ms']:.2f} ms indexed vs {latency['scan_ms']:.0f} ms scan "
+              f"({latency['matches']} matches)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "nodes": args.nodes,
+                "ingest_s": ingest_time,
+                "index_build_s": stats['build_time_s'],
+                "rebuild_s": rebuild_time,
+                "memory_mb": memory_mb,
+                "queries": latencies,
+                "cpu_count": os.cpu_count(),
+                "platform": platform.platform()
+            }, f, indent=2)
+        print(f"Results saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Throughput benchmark for the random-walk corpus generator.
+Builds a synthetic graph with heavy-tailed degrees and random strengths
+directly as CSR arrays, then generates walks for each worker count and
+reports alias-table build time and steps per second.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(REPO_ROOT))
+
+from src.knowledge_graph.algorithms.random_walks import CSRGraph, generate_walks
+
+
+def generate_csr(nodes=1000000, mean_degree=10, seed=0):
+    """
+    Synthetic CSR arrays with Pareto-distributed degrees and uniform strengths.
+
+    Returns:
+        Tuple of (indptr, indices, weights)
+    """
+    rng = np.random.default_rng(seed)
+    degree = np.minimum(rng.pareto(2.0, nodes) * mean_degree / 2 + 1, nodes - 1).astype(np.int64)
+    indptr = np.concatenate([[0], np.cumsum(degree)])
+    indices = rng.integers(0, nodes, indptr[-1], dtype=np.int32)
+    weights = rng.random(indptr[-1])
+    return indptr, indices, weights
+
+
+def main():
+    """Main entry point for the random walk benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark random-walk corpus generation')
+    parser.add_argument('--nodes', type=int, default=1000000, help='Nodes in the synthetic graph (default: 1000000)')
+    parser.add_argument('--mean-degree', type=int, default=10, help='Approximate mean out-degree (default: 10)')
+    parser.add_argument('--walks-per-node', type=int, default=2, help='Walks started per node (default: 2)')
+    parser.add_argument('--walk-length', type=int, default=40, help='Nodes per walk (default: 40)')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        help='Worker counts to run (default: 1, 2, 4, ... up to the CPU count)')
+    parser.add_argument('--temp-dir', help='Directory for the walk files')
+    parser.add_argument('--output', '-o', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    worker_counts = args.workers
+    if not worker_counts:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+            worker_counts.append(worker_counts[-1] * 2)
+
+    indptr, indices, weights = generate_csr(args.nodes, args.mean_degree)
+    start = time.perf_counter()
+    graph = CSRGraph(np.arange(args.nodes), indptr, indices, weights)
+    build_time = time.perf_counter() - start
+    print(f"{args.nodes} nodes, {len(indices)} edges: alias tables built in {build_time:.2f}s")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="walk_bench_", dir=args.temp_dir) as work_dir:
+        for workers in worker_counts:
+            start = time.perf_counter()
+            stats = generate_walks(graph, os.path.join(work_dir, f"walks_{workers}.npy"),
+                                   args.walks_per_node, args.walk_length, workers=workers,
+                                   temp_dir=work_dir)
+            wall_time = time.perf_counter() - start
+            result = {
+                "workers": workers,
+                "wall_time_s": wall_time,
+                "steps": stats['steps'],
+                "steps_per_s": stats['steps'] / wall_time
+            }
+            results.append(result)
+            print(f"{workers:>3} workers: {wall_time:.2f}s  {result['steps_per_s'] / 1e6:.1f}M steps/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "nodes": args.nodes,
+                "edges": int(len(indices)),
+                "alias_build_s": build_time,
+                "cpu_count": os.cpu_count(),
+                "platform": platform.platform(),
+                "results": results
+            }, f, indent=2)
+        print(f"Results saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for the chatbot's resident, hot-reloading knowledge graph.
+Writes a synthetic node-link graph, times a full parse and snapshot build,
+then measures bot query latency while the file is rewritten in the
+background so that snapshots are rebuilt and swapped during the queries.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(REPO_ROOT))
+
+from src.chatbot.azure_bot import RootCauseAnalysisBot
+
+WORDS = ["bearing", "seal", "pump", "motor", "valve", "impeller", "shaft", "coupling", "gasket", "rotor",
+         "noise", "leakage", "vibration", "overheating", "wear", "misalignment", "cavitation", "corrosion"]
+
+
+def write_graph(path, nodes=100000, edges=300000, seed=0):
+    """Write a synthetic node-link graph atomically and return its size in bytes."""
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS)
+    names = [f"{a} {b} {idx}" for idx, (a, b) in enumerate(words[rng.integers(0, len(WORDS), (nodes, 2))])]
+    sources, targets = rng.integers(0, nodes, edges), rng.integers(0, nodes, edges)
+    data = {"nodes": [{"id": name} for name in names],
+            "links": [{"source": names[s], "target": names[t], "type": "CAUSES", "strength": float(w)}
+                      for s, t, w in zip(sources.tolist(), targets.tolist(), rng.random(edges).tolist())]}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def main():
+    """Main entry point for the resident graph benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark chatbot queries during graph hot reloads')
+    parser.add_argument('--nodes', type=int, default=100000, help='Graph nodes (default: 100000)')
+    parser.add_argument('--edges', type=int, default=300000, help='Graph edges (default: 300000)')
+    parser.add_argument('--queries', type=int, default=500, help='Queries to time (default: 500)')
+    parser.add_argument('--rewrites', type=int, default=3, help='Graph rewrites during the queries (default: 3)')
+    parser.add_argument('--output', '-o', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "graph.json")
+        size = write_graph(path, args.nodes, args.edges)
+        bot = RootCauseAnalysisBot()
+        bot.graph.path = path
+        bot.graph.poll_interval = 0.1
+        start = time.perf_counter()
+        bot.create_knowledge_base()
+        load_time = time.perf_counter() - start
+
+        def rewrite():
+            for seed in range(1, args.rewrites + 1):
+                write_graph(path, args.nodes, args.edges, seed)
+                time.sleep(load_time)
+
+        rng = np.random.default_rng(1)
+        questions = [f"what causes {rng.choice(WORDS)} {rng.choice(WORDS)}" for _ in range(args.queries)]
+        writer = threading.Thread(target=rewrite)
+        writer.start()
+        latencies = []
+        for question in questions:
+            start = time.perf_counter()
+            bot.query(question)
+            latencies.append((time.perf_counter() - start) * 1000)
+        writer.join()
+        # Let the last rewrite land before stopping the watcher
+        time.sleep(load_time + 2 * bot.graph.poll_interval)
+        bot.close()
+        reloads = bot.graph.reloads - 1
+
+    latencies = np.array(latencies)
+    result = {
+        "nodes": args.nodes,
+        "edges": args.edges,
+        "graph_mb": size / 1e6,
+        "load_s": load_time,
+        "reloads": reloads,
+        "query_p50_ms": float(np.percentile(latencies, 50)),
+        "query_p99_ms": float(np.percentile(latencies, 99)),
+        "query_max_ms": float(latencies.max())
+    }
+    print(f"{size / 1e6:.1f} MB graph parsed and indexed in {load_time:.2f}s; {reloads} background reloads")
+    print(f"query latency: p50 {result['query_p50_ms']:.2f} ms, p99 {result['query_p99_ms']:.2f} ms, "
+          f"max {result['query_max_ms']:.2f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(dict(result, cpu_count=os.cpu_count(), platform=platform.platform()), f, indent=2)
+        print(f"Results saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
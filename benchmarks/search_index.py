@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for the chatbot's local BM25 search index.
+Indexes synthetic node names, edge descriptions and document chunks drawn
+from a Zipf-distributed vocabulary, then reports build time, index size and
+top-k query latency with and without early termination.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(REPO_ROOT))
+
+from src.chatbot.search_index import LocalSearchIndex
+
+KINDS = ['node', 'edge', 'chunk']
+# Words per entry by kind: short names, edge descriptions, document chunks
+LENGTHS = {'node': (2, 5), 'edge': (5, 12), 'chunk': (30, 80)}
+
+
+def build_index(entries=1000000, vocabulary=50000, seed=0):
+    """Return a built index of synthetic entries over a Zipf vocabulary, and the word list."""
+    rng = np.random.default_rng(seed)
+    words = np.array([f"term{i}" for i in range(vocabulary)])
+    weights = 1.0 / np.arange(1, vocabulary + 1)
+    kinds = rng.choice(KINDS, entries, p=[0.3, 0.5, 0.2])
+    sizes = np.select([kinds == kind for kind in KINDS], [rng.integers(*LENGTHS[kind], entries) for kind in KINDS])
+    tokens = words[rng.choice(vocabulary, int(sizes.sum()), p=weights / weights.sum())].tolist()
+    index = LocalSearchIndex()
+    offset = 0
+    for idx, (kind, size) in enumerate(zip(kinds.tolist(), sizes.tolist())):
+        index.add_document(f"{kind}:{idx}", " ".join(tokens[offset:offset + size]), kind=kind)
+        offset += size
+    return index, words
+
+
+def _latencies(index, queries, top, early_termination):
+    """Per-query wall times in milliseconds."""
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, top=top, early_termination=early_termination)
+        times.append((time.perf_counter() - start) * 1000)
+    return np.array(times)
+
+
+def main():
+    """Main entry point for the search index benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark BM25 indexing and top-k search')
+    parser.add_argument('--entries', type=int, default=1000000, help='Indexed entries (default: 1000000)')
+    parser.add_argument('--vocabulary', type=int, default=50000, help='Distinct words (default: 50000)')
+    parser.add_argument('--queries', type=int, default=200, help='Queries to time (default: 200)')
+    parser.add_argument('--top', type=int, default=10, help='Results per query (default: 10)')
+    parser.add_argument('--output', '-o', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    index, words = build_index(args.entries, args.vocabulary)
+    start = time.perf_counter()
+    index.build()
+    build_time = time.perf_counter() - start
+    stats = index.stats()
+
+    # Queries mix a few frequent words with rarer ones, like "pump seal leak after restart"
+    rng = np.random.default_rng(1)
+    queries = [" ".join(np.concatenate([words[rng.integers(0, 50, 2)],
+                                        words[rng.integers(50, len(words), rng.integers(1, 4))]]))
+               for _ in range(args.queries)]
+    results = {}
+    for mode, early in (('early_termination', True), ('exhaustive', False)):
+        times = _latencies(index, queries, args.top, early)
+        results[mode] = {'p50_ms': float(np.percentile(times, 50)), 'p95_ms': float(np.percentile(times, 95)),
+                         'mean_ms': float(times.mean())}
+
+    print(f"{args.entries} entries indexed in {build_time:.2f}s: {stats['terms']} terms, "
+          f"{stats['postings']} postings in {stats['posting_bytes'] / 1e6:.1f} MB "
+          f"({stats['index_bytes'] / 1e6:.1f} MB with block and length tables)")
+    for mode, latency in results.items():
+        print(f"{mode:>17}: p50 {latency['p50_ms']:.2f} ms, p95 {latency['p95_ms']:.2f} ms (top {args.top})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "entries": args.entries,
+                "build_s": build_time,
+                "index": stats,
+                "queries": results,
+                "cpu_count": os.cpu_count(),
+                "platform": platform.platform()
+            }, f, indent=2)
+        print(f"Results saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
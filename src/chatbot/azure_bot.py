@@ -8,9 +8,18 @@ for engineers to query the knowledge graph and analyze root causes.
 """
 
 import os
+import sys
 import json
 from pathlib import Path
 
+try:
+    from .resident_graph import ResidentGraph
+    from .search_index import tokenize
+except (ImportError, ValueError):
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from resident_graph import ResidentGraph
+    from search_index import tokenize
+
 
 class RootCauseAnalysisBot:
     """Azure-powered chatbot for root cause analysis."""
@@ -35,15 +44,21 @@ class RootCauseAnalysisBot:
         # Knowledge graph configuration
         self.knowledge_graph_path = self.config.get('knowledge_graph_path',
                                                  '../../../data/knowledge_graph/graph.json')
+
+        # Resident graph snapshot, rebuilt in the background when the file
+        # changes; its BM25 index over graph entries and document chunks
+        # answers queries when no Azure Cognitive Search client is connected
+        self.text_documents = []
+        self.graph = ResidentGraph(self.knowledge_graph_path, self.config.get('graph_poll_interval', 2.0),
+                                   self.text_documents)
+        self.search_client = None
+        self.search_top = self.config.get('search_top', 5)
     
     def load_knowledge_graph(self):
-        """Load the knowledge graph data."""
-        try:
-            with open(self.knowledge_graph_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading knowledge graph: {e}")
-            return {}
+        """Return the resident knowledge graph data, parsing the file only on first use."""
+        if self.graph.current is None:
+            self.graph.reload()
+        return self.graph.current.graph_data if self.graph.current is not None else {}
     
     def initialize_azure_services(self):
         """Initialize Azure services for the chatbot."""
@@ -68,6 +83,13 @@ class RootCauseAnalysisBot:
         # Placeholder code
         pdf_files = list(Path(pdf_directory).glob("*.pdf"))
         print(f"Found {len(pdf_files)} PDF files.")
+
+        # Plain-text documents are chunked into the local search index
+        text_files = sorted(Path(pdf_directory).glob("*.txt")) + sorted(Path(pdf_directory).glob("*.md"))
+        for text_file in text_files:
+            self.text_documents.append((text_file.name, text_file.read_text(encoding='utf-8', errors='ignore')))
+        self.graph.invalidate()
+        print(f"Indexed {len(text_files)} text files.")
         
         print("PDF processing complete.")
     
@@ -76,37 +98,97 @@ class RootCauseAnalysisBot:
         # This would create a knowledge base for the chatbot to query
         print("Creating knowledge base...")
         
-        # Load knowledge graph
-        graph_data = self.load_knowledge_graph()
+        # Load the knowledge graph and keep it resident, reloading on change
+        self.graph.start()
         
         # In a real implementation, this would:
         # 1. Upload knowledge graph to Azure Cognitive Search
         # 2. Configure Azure OpenAI for RAG (Retrieval Augmented Generation)
         # 3. Set up prompt templates for root cause analysis
+        entries = len(self.graph.current.search_index) if self.graph.current is not None else 0
         
-        print("Knowledge base created.")
+        print(f"Knowledge base created ({entries} searchable entries).")
     
     def query(self, user_question):
         """Process a user query about root cause analysis."""
         # This would process a user query using Azure OpenAI
         print(f"Processing query: {user_question}")
         
-        # Placeholder for query processing
         # In a real implementation, this would:
         # 1. Use Azure OpenAI to understand the query
         # 2. Retrieve relevant data from Azure Cognitive Search
         # 3. Generate a response with analysis and recommendations
-        
-        # Simulated response
+        # Retrieval runs against the local index until Azure is connected.
+        # The snapshot is read once, so a reload mid-query does not affect it.
+        snapshot = self.graph.current
+        if snapshot is None:
+            if not self.graph.running:
+                # First query of a bot whose knowledge base was never created: start
+                # watching now, so the graph is picked up as soon as it is available
+                self.graph.start(wait=False)
+            state = self.graph.state
+            if state == 'missing':
+                answer = (f"No knowledge graph found at {self.graph.path}; "
+                          "build it first and it will be picked up automatically.")
+            elif state == 'failed':
+                answer = f"The knowledge graph could not be loaded: {self.graph.last_error}"
+            elif state == 'ready':
+                snapshot = self.graph.current
+            else:
+                answer = "The knowledge base is still loading; please try again shortly."
+            if snapshot is None:
+                return {
+                    "answer": answer,
+                    "confidence": 0.0,
+                    "sources": [],
+                    "related_entities": []
+                }
+        client = self.search_client or snapshot.search_index
+        results = list(client.search(search_text=user_question, top=self.search_top))
+        if not results:
+            return {
+                "answer": f"No entries in the knowledge base match '{user_question}'.",
+                "confidence": 0.0,
+                "sources": [],
+                "related_entities": []
+            }
+
+        # Local index entries carry kind/name/source/target; Azure results only
+        # have the fields of their index, so every field is optional here
+        related, sources = [], []
+        for result in results:
+            kind = result.get('kind')
+            if kind == 'node' and result.get('name'):
+                related.append(result['name'])
+                related.extend(snapshot.causes_of(result['name']))
+            elif kind == 'edge':
+                related.extend(entity for entity in (result.get('source'), result.get('target')) if entity)
+            source = result.get('source_document', 'knowledge_graph')
+            if source not in sources:
+                sources.append(source)
+        # Confidence: share of the question's terms found in the best match
+        question_terms = set(tokenize(user_question))
+        matched = question_terms & set(tokenize(self._result_text(results[0])))
+
         response = {
-            "answer": f"Based on the knowledge graph analysis, the potential root causes for '{user_question}' could be related to factors X, Y, and Z. Would you like more details on any specific factor?",
-            "confidence": 0.85,
-            "sources": ["knowledge_graph", "maintenance_records"],
-            "related_entities": ["Factor X", "Factor Y", "Factor Z"]
+            "answer": "Based on the knowledge graph analysis, the entries most relevant to "
+                      f"'{user_question}' are: " + "; ".join(self._result_text(result) for result in results[:3]),
+            "confidence": round(len(matched) / max(len(question_terms), 1), 2),
+            "sources": sources,
+            "related_entities": list(dict.fromkeys(related))
         }
         
         return response
 
+    @staticmethod
+    def _result_text(result):
+        """Text of a search result: 'text' in the local index, 'content' or 'title' in Azure indexes."""
+        return str(result.get('text') or result.get('content') or result.get('title') or '')
+
+    def close(self):
+        """Stop watching the knowledge graph file."""
+        self.graph.stop()
+
 
 if __name__ == "__main__":
     # Example usage
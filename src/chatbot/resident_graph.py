@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Resident, hot-reloading knowledge graph for the chatbot.
+The graph JSON is parsed once into an immutable GraphSnapshot (node lookup,
+adjacency lists and the search index). A background thread polls the
+file's size and mtime and, when they change, builds a new snapshot and swaps
+it in with a single reference assignment. A query reads the current
+snapshot once and uses only that, so in-flight queries finish on the
+graph they started with and never wait for a parse.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    from .search_index import LocalSearchIndex
+except (ImportError, ValueError):
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from search_index import LocalSearchIndex
+
+
+def file_signature(path):
+    """(size, mtime_ns) of path, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class GraphSnapshot:
+    """One parsed version of the knowledge graph; never modified after construction."""
+
+    def __init__(self, graph_data, signature=None, text_documents=()):
+        """
+        Index a node-link graph (KnowledgeGraphBuilder.export_graph).
+
+        Args:
+            graph_data: Parsed graph JSON
+            signature: File (size, mtime_ns) the graph was read at
+            text_documents: (name, text) pairs chunked into the search index
+        """
+        self.graph_data = graph_data
+        self.signature = signature
+        self.nodes = {node['id']: node for node in graph_data.get('nodes', [])}
+        self.out_edges = {}
+        self.in_edges = {}
+        for edge in graph_data.get('links', graph_data.get('edges', [])):
+            self.out_edges.setdefault(edge['source'], []).append(edge)
+            self.in_edges.setdefault(edge['target'], []).append(edge)
+
+        self.search_index = LocalSearchIndex()
+        for name, text in text_documents:
+            self.search_index.add_text_chunks(name, text)
+        self.search_index.add_graph(graph_data)
+        self.search_index.build()
+        self.loaded_at = time.time()
+
+    def causes_of(self, name):
+        """Sources of the CAUSES edges into a node, strongest first."""
+        edges = [edge for edge in self.in_edges.get(name, []) if edge.get('type') == 'CAUSES']
+        return [edge['source'] for edge in sorted(edges, key=lambda edge: -(edge.get('strength') or 0))]
+
+
+class ResidentGraph:
+    """
+    Keep the latest GraphSnapshot of a graph file in memory.
+
+    Typical use:
+        graph = ResidentGraph("data/knowledge_graph/graph.json")
+        graph.start()                  # first load, then watch in the background
+        snapshot = graph.current       # read once per query
+        ...
+        graph.stop()
+    """
+
+    def __init__(self, path, poll_interval=2.0, text_documents=None):
+        """
+        Args:
+            path: Graph JSON file to watch
+            poll_interval: Seconds between signature checks
+            text_documents: Shared list of (name, text) pairs indexed with
+                every snapshot; call invalidate() after extending it
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+        self.text_documents = text_documents if text_documents is not None else []
+        self.current = None
+        self.reloads = 0
+        self.last_error = None
+        self._seen_signature = None
+        self._reload_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """Whether start() was called and stop() has not been since."""
+        return self._thread is not None
+
+    @property
+    def state(self):
+        """
+        Why current is (or is not) available.
+
+        Returns:
+            'ready', 'not_started' (start() was never called), 'missing' (no
+            graph file), 'failed' (the file could not be loaded; see
+            last_error) or 'loading' (the first snapshot is being built)
+        """
+        if self.current is not None:
+            return 'ready'
+        if file_signature(self.path) is None:
+            return 'missing'
+        if self.last_error is not None:
+            return 'failed'
+        if not self.running:
+            return 'not_started'
+        return 'loading'
+
+    def reload(self, force=False):
+        """
+        Build and swap in a new snapshot if the file changed since the last attempt.
+
+        A file that fails to parse (for example while it is being rewritten
+        without an atomic rename) leaves the current snapshot in place and is
+        retried once its signature changes again.
+
+        Returns:
+            True if a new snapshot was swapped in
+        """
+        with self._reload_lock:
+            signature = file_signature(self.path)
+            if signature is None or (signature == self._seen_signature and not force):
+                return False
+            self._seen_signature = signature
+            try:
+                with open(self.path, 'r') as f:
+                    graph_data = json.load(f)
+                snapshot = GraphSnapshot(graph_data, signature, list(self.text_documents))
+            except (OSError, ValueError, KeyError) as e:
+                self.last_error = e
+                print(f"Error loading knowledge graph: {e}")
+                return False
+            self.current = snapshot
+            self.last_error = None
+            self.reloads += 1
+            return True
+
+    def invalidate(self):
+        """Rebuild on the next poll even if the file is unchanged (e.g. new text documents)."""
+        self._seen_signature = None
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload()
+
+    def start(self, wait=True):
+        """
+        Start the background watcher.
+
+        With wait=True the first snapshot is built before returning;
+        otherwise it is built by the watcher thread and current stays None
+        until it is ready.
+        """
+        if wait:
+            self.reload()
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                if not wait:
+                    threading.Thread(target=self.reload, daemon=True).start()
+                self._thread = threading.Thread(target=self._watch, name="resident-graph-watcher",
+                                                daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the background watcher; the current snapshot stays available."""
+        self._stop.set()
+        with self._start_lock:
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
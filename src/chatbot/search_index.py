@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Local BM25 retrieval for the root cause analysis chatbot.
+Knowledge graph node names, edge descriptions and document chunks are
+tokenized into an inverted index. Each term's postings are doc-id gaps,
+variable-byte encoded, in blocks of 128 with the block's last doc id kept
+uncompressed, so a query only decodes the blocks it needs. Top-k search uses
+MaxScore early termination: once the best k partial scores beat everything
+the remaining query terms could still add, those terms are only scored for
+the documents already in the running, and their other blocks are skipped.
+LocalSearchIndex.search mirrors the Azure Cognitive Search client's search()
+call, so the index can stand in for it on air-gapped sites.
+"""
+
+import json
+import os
+import re
+import unicodedata
+
+import numpy as np
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+BLOCK_SIZE = 128
+K1 = 1.2
+B = 0.75
+# Frequent function words carry no signal for BM25 and have the longest postings
+STOPWORDS = frozenset("a an and are as at be by for from has have in is it of on or that the this to was "
+                      "were what which why with".split())
+
+
+def tokenize(text):
+    """Lowercase word tokens of text, without stopwords."""
+    tokens = TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", str(text)).lower())
+    return [token for token in tokens if token not in STOPWORDS]
+
+
+def vbyte_encode(values):
+    """
+    Variable-byte encode non-negative integers: 7 bits per byte, low bits
+    first, high bit set on every byte but a value's last.
+
+    Returns:
+        Tuple of (uint8 buffer, int64 byte offset of each value)
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    for shift in (7, 14, 21, 28, 35):
+        lengths += values >= np.uint64(1 << shift)
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    buffer = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for group in range(int(lengths.max()) if len(values) else 0):
+        present = lengths > group
+        chunk = (values[present] >> np.uint64(7 * group)) & np.uint64(0x7F)
+        more = (lengths[present] > group + 1).astype(np.uint64) << np.uint64(7)
+        buffer[offsets[present] + group] = chunk | more
+    return buffer, offsets
+
+
+def vbyte_decode(buffer):
+    """Decode a buffer of whole variable-byte encoded values (see vbyte_encode) to int64."""
+    buffer = np.asarray(buffer, dtype=np.uint8)
+    if not len(buffer):
+        return np.array([], dtype=np.int64)
+    last = buffer < 0x80
+    starts = np.concatenate([[0], np.flatnonzero(last)[:-1] + 1])
+    value_of_byte = np.cumsum(np.concatenate([[0], last[:-1]]))
+    shift = (np.arange(len(buffer)) - starts[value_of_byte]) * 7
+    parts = (buffer & 0x7F).astype(np.int64) << shift
+    return np.add.reduceat(parts, starts)
+
+
+class LocalSearchIndex:
+    """
+    BM25 inverted index over knowledge graph entries and document chunks.
+
+    Typical use:
+        index = LocalSearchIndex()
+        index.add_document("node:Pump P-101", "Pump P-101", kind="node")
+        index.add_document("chunk:manual.txt:3", "Check the mechanical seal for ...", kind="chunk")
+        index.build()
+        for result in index.search("seal leaking pump", top=5):
+            print(result['id'], result['@search.score'])
+    """
+
+    def __init__(self, k1=K1, b=B):
+        """Create an empty index with BM25 parameters k1 and b."""
+        self.k1 = k1
+        self.b = b
+        self.documents = []
+        self._built = False
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add_document(self, doc_id, text, kind='chunk', **fields):
+        """Add an entry, returned with its fields in search results after the next build() or search()."""
+        self.documents.append(dict(fields, id=doc_id, kind=kind, text=text))
+        self._built = False
+
+    def add_graph(self, graph_data):
+        """
+        Add the nodes and edges of a node-link graph (KnowledgeGraphBuilder.export_graph).
+
+        Nodes are indexed by name (plus type, aliases and their other
+        attributes, the node store properties), edges as "source type target"
+        with their string and numeric metadata.
+        """
+        for node in graph_data.get('nodes', []):
+            name = node['id']
+            properties = {key: value for key, value in node.items() if key not in ('id', 'type', 'aliases')}
+            extra = [node.get('type') or ''] + list(node.get('aliases') or [])
+            extra += [f"{key.replace('_', ' ')} {value}" for key, value in properties.items()]
+            self.add_document(f"node:{name}", " ".join([str(name)] + [str(value) for value in extra if value]),
+                              kind='node', name=name, type=node.get('type'), properties=properties)
+        for edge in graph_data.get('links', graph_data.get('edges', [])):
+            source, target = edge['source'], edge['target']
+            rel_type = edge.get('type', 'related')
+            metadata = edge.get('metadata') or {}
+            words = [str(source), rel_type.replace('_', ' '), str(target)]
+            words += [f"{key} {value}" for key, value in metadata.items()]
+            self.add_document(f"edge:{source}->{target}", " ".join(words), kind='edge',
+                              source=source, target=target, type=rel_type,
+                              strength=edge.get('strength'))
+
+    def add_text_chunks(self, doc_name, text, chunk_words=200, overlap=50):
+        """Split a document into overlapping word windows and add each as a chunk entry."""
+        words = text.split()
+        step = max(chunk_words - overlap, 1)
+        for number, start in enumerate(range(0, max(len(words) - overlap, 1), step)):
+            self.add_document(f"chunk:{doc_name}:{number}", " ".join(words[start:start + chunk_words]),
+                              kind='chunk', source_document=doc_name)
+
+    def build(self):
+        """
+        Compile the inverted index from the added entries.
+
+        Postings are (term, doc) pairs sorted by term then doc; doc ids are
+        stored as gaps from the previous posting of the same term, so the
+        first gap of each block is relative to the block's base (the last
+        doc id of the previous block, 0 for a term's first block).
+        """
+        vocabulary = {}
+        term_ids, doc_ids = [], []
+        doc_lengths = np.zeros(len(self.documents), dtype=np.int32)
+        for doc, document in enumerate(self.documents):
+            tokens = tokenize(document['text'])
+            doc_lengths[doc] = len(tokens)
+            term_ids.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokens)
+            doc_ids.extend([doc] * len(tokens))
+        n_docs, n_terms = len(self.documents), len(vocabulary)
+
+        keys, tfs = np.unique(np.array(term_ids, dtype=np.int64) * max(n_docs, 1)
+                              + np.array(doc_ids, dtype=np.int64), return_counts=True)
+        terms, docs = keys // max(n_docs, 1), keys % max(n_docs, 1)
+        df = np.bincount(terms, minlength=n_terms)
+        posting_ptr = np.concatenate([[0], np.cumsum(df)]).astype(np.int64)
+
+        # Gap to the previous posting of the same term (the doc id itself for a term's first posting)
+        first = np.zeros(len(docs), dtype=bool)
+        first[posting_ptr[:-1][df > 0]] = True
+        gaps = np.where(first, docs, docs - np.concatenate([[0], docs[:-1]]))
+        encoded, byte_offsets = vbyte_encode(gaps)
+
+        n_blocks = -(-df // BLOCK_SIZE)
+        block_ptr = np.concatenate([[0], np.cumsum(n_blocks)]).astype(np.int64)
+        block_term = np.repeat(np.arange(n_terms), n_blocks)
+        block_start = posting_ptr[block_term] + (np.arange(block_ptr[-1]) - block_ptr[block_term]) * BLOCK_SIZE
+        block_end = np.minimum(block_start + BLOCK_SIZE, posting_ptr[block_term + 1])
+        self.block_offsets = np.concatenate([byte_offsets[block_start], [len(encoded)]]).astype(np.int64)
+        self.block_start = np.concatenate([block_start, [len(docs)]]).astype(np.int64)
+        self.block_base = np.where(block_start == posting_ptr[block_term], 0,
+                                   docs[np.maximum(block_start - 1, 0)]).astype(np.int64)
+        self.block_last = docs[self.block_start[1:] - 1].astype(np.int64)
+
+        self.vocabulary = vocabulary
+        self.doc_bytes = encoded
+        self.tfs = np.minimum(tfs, np.iinfo(np.uint16).max).astype(np.uint16)
+        self.df = df.astype(np.int64)
+        self.block_ptr = block_ptr
+        self.doc_lengths = doc_lengths
+        self._finish()
+        # Upper bound of every term's contribution, for early termination
+        impact = self._impact(terms, docs, self.tfs)
+        self.max_impact = np.zeros(n_terms)
+        if len(impact):
+            self.max_impact[df > 0] = np.maximum.reduceat(impact, posting_ptr[:-1][df > 0])
+        return self
+
+    def _impact(self, term, docs, tfs):
+        """BM25 contribution of term(s) to docs."""
+        tf = tfs.astype(np.float64)
+        norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[docs] / max(self.avg_length, 1e-9))
+        return self.idf[term] * tf * (self.k1 + 1.0) / (tf + norm)
+
+    def _decode_blocks(self, blocks):
+        """Doc ids and term frequencies of the postings in the given blocks (ascending block numbers)."""
+        if not len(blocks):
+            return np.array([], dtype=np.int64), np.array([], dtype=np.uint16)
+        # Byte ranges of all requested blocks, decoded in one pass
+        byte_starts = self.block_offsets[blocks]
+        byte_lengths = self.block_offsets[blocks + 1] - byte_starts
+        gaps = vbyte_decode(self.doc_bytes[_ranges(byte_starts, byte_lengths)])
+        posting_starts = self.block_start[blocks]
+        counts = self.block_start[blocks + 1] - posting_starts
+        # Prefix sums restart at every block, from the block's base doc id
+        sums = np.cumsum(gaps)
+        first = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        docs = sums + np.repeat(self.block_base[blocks] - (sums[first] - gaps[first]), counts)
+        return docs, self.tfs[_ranges(posting_starts, counts)]
+
+    def _query_terms(self, text):
+        """Distinct indexed term ids of a query, highest score bound first."""
+        terms = {self.vocabulary[token] for token in tokenize(text) if token in self.vocabulary}
+        return sorted(terms, key=lambda term: -self.max_impact[term])
+
+    def search(self, search_text, top=10, kinds=None, early_termination=True, **kwargs):
+        """
+        Top BM25 matches for search_text, best first.
+
+        Args:
+            search_text: Free-text query
+            top: Number of results
+            kinds: Optional entry kinds to keep ('node', 'edge', 'chunk')
+            early_termination: Skip work that cannot change the top results;
+                False scores every posting of every query term
+
+        Returns:
+            List of entry dicts (id, kind, text and the fields given to
+            add_document) with their '@search.score', as the Azure search
+            client returns them. Other keyword arguments of the Azure call
+            are accepted and ignored.
+        """
+        if not self._built:
+            self.build()
+        terms = self._query_terms(search_text)
+        if not terms or top <= 0:
+            return []
+        allowed = None
+        if kinds is not None:
+            allowed = np.isin(self._kind_codes, [self.kinds.index(kind) for kind in kinds if kind in self.kinds])
+        # remaining[i]: most that terms i.. can add to any document's score, loosened a
+        # little so rounding never prunes a document that would tie with the top
+        remaining = np.cumsum(self.max_impact[terms][::-1])[::-1] * (1 + 1e-9)
+
+        candidates = np.array([], dtype=np.int64)
+        scores = np.array([], dtype=np.float64)
+        for position, term in enumerate(terms):
+            blocks = np.arange(self.block_ptr[term], self.block_ptr[term + 1])
+            threshold = np.partition(scores, -top)[-top] if len(scores) >= top else 0.0
+            if early_termination and len(scores) >= top and remaining[position] < threshold:
+                # No unseen document can reach the top, not even on a tie broken by doc id;
+                # score the live candidates only
+                live = scores + remaining[position] >= threshold
+                candidates, scores = candidates[live], scores[live]
+                hit = np.unique(np.searchsorted(self.block_last[blocks], candidates))
+                docs, tfs = self._decode_blocks(blocks[hit[hit < len(blocks)]])
+                if not len(docs):
+                    continue
+                slot = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+                found = docs[slot] == candidates
+                scores[found] += self._impact(term, candidates[found], tfs[slot[found]])
+                continue
+            docs, tfs = self._decode_blocks(blocks)
+            if allowed is not None:
+                keep = allowed[docs]
+                docs, tfs = docs[keep], tfs[keep]
+            candidates, inverse = np.unique(np.concatenate([candidates, docs]), return_inverse=True)
+            scores = np.bincount(inverse, minlength=len(candidates),
+                                 weights=np.concatenate([scores, self._impact(term, docs, tfs)]))
+
+        # Ties at the cut are broken by doc id, as the exhaustive order does
+        order = np.lexsort((candidates, -scores))[:top]
+        return [dict(self.documents[doc], **{'@search.score': float(scores[idx])})
+                for idx, doc in zip(order.tolist(), candidates[order].tolist())]
+
+    def stats(self):
+        """Entry, term and posting counts and the index size in bytes."""
+        arrays = [self.doc_bytes, self.tfs, self.df, self.block_ptr, self.block_offsets, self.block_start,
+                  self.block_base, self.block_last, self.doc_lengths, self.max_impact]
+        return {
+            'entries': len(self.documents),
+            'terms': len(self.vocabulary),
+            'postings': len(self.tfs),
+            'posting_bytes': int(len(self.doc_bytes)),
+            'index_bytes': int(sum(array.nbytes for array in arrays))
+        }
+
+    def save(self, path):
+        """Write the built index and its entries to an .npz file, atomically."""
+        if not self._built:
+            self.build()
+        terms = [None] * len(self.vocabulary)
+        for token, term in self.vocabulary.items():
+            terms[term] = token
+        documents = json.dumps(self.documents, default=str).encode('utf-8')
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, params=np.array([self.k1, self.b]), terms=np.array(terms, dtype=str),
+                     documents=np.frombuffer(documents, dtype=np.uint8), doc_bytes=self.doc_bytes,
+                     tfs=self.tfs, df=self.df, block_ptr=self.block_ptr, block_offsets=self.block_offsets,
+                     block_start=self.block_start, block_base=self.block_base, block_last=self.block_last,
+                     doc_lengths=self.doc_lengths, max_impact=self.max_impact)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Load an index written by save(); no rebuild is needed before searching."""
+        with np.load(path) as data:
+            k1, b = data['params'].tolist()
+            index = cls(k1, b)
+            index.documents = json.loads(data['documents'].tobytes().decode('utf-8'))
+            index.vocabulary = {token: term for term, token in enumerate(data['terms'].tolist())}
+            for name in ('doc_bytes', 'tfs', 'df', 'block_ptr', 'block_offsets', 'block_start',
+                         'block_base', 'block_last', 'doc_lengths', 'max_impact'):
+                setattr(index, name, data[name])
+        index._finish()
+        return index
+
+    def _finish(self):
+        """Derive idf, average length and entry kind codes from the stored arrays."""
+        n_docs = len(self.documents)
+        self.avg_length = float(self.doc_lengths.mean()) if n_docs else 0.0
+        self.idf = np.log(1.0 + (n_docs - self.df + 0.5) / (self.df + 0.5))
+        self.kinds = sorted({document['kind'] for document in self.documents})
+        self._kind_codes = np.array([self.kinds.index(document['kind']) for document in self.documents],
+                                    dtype=np.uint8)
+        self._built = True
+
+
+def _ranges(starts, lengths):
+    """Concatenation of arange(start, start + length) for each pair."""
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    return np.repeat(starts - offsets, lengths) + np.arange(int(lengths.sum()))
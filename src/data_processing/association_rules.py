@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Association-rule mining over categorical columns.
+Items are (column, value) pairs. Single items and pairs are counted with
+np.bincount over factorized column codes; longer itemsets are counted by
+AND-ing packed row bitsets and popcounting, a whole batch of candidates at a
+time.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_MIN_SUPPORT = 0.01
+DEFAULT_MIN_CONFIDENCE = 0.6
+DEFAULT_MIN_LIFT = 1.0
+DEFAULT_MAX_LENGTH = 3
+
+# Number of set bits in every byte value
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def categorical_columns(df):
+    """Names of the non-numeric (string, categorical and boolean) columns of a DataFrame."""
+    return [col for col in df.columns
+            if not pd.api.types.is_numeric_dtype(df[col].dtype) or df[col].dtype == bool]
+
+
+def _popcount_rows(bits):
+    """Count the set bits in every row of a 2D uint8 array."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    return _POPCOUNT[bits].sum(axis=1, dtype=np.int64)
+
+
+class _ItemTable:
+    """Frequent items of a DataFrame, with per-column local codes."""
+
+    def __init__(self, df, columns, min_count):
+        self.n_rows = len(df)
+        self.items = []
+        self.item_column = []
+        self.item_count = []
+        self.local_codes = []
+        self.column_offsets = []
+
+        for col_idx, col in enumerate(columns):
+            codes, uniques = pd.factorize(df[col], sort=False)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            frequent = np.flatnonzero(counts >= min_count)
+            # Map every code to its position among the column's frequent values, or -1
+            remap = np.full(len(uniques) + 1, -1, dtype=np.int64)
+            remap[frequent] = np.arange(len(frequent))
+            self.local_codes.append(remap[codes])
+            self.column_offsets.append(len(self.items))
+            for code in frequent:
+                value = uniques[code]
+                self.items.append((col, value.item() if hasattr(value, 'item') else value))
+                self.item_column.append(col_idx)
+                self.item_count.append(int(counts[code]))
+
+        self.item_column = np.array(self.item_column, dtype=np.int64)
+        self.item_count = np.array(self.item_count, dtype=np.int64)
+        self._bits = None
+
+    def bitsets(self):
+        """Packed row-membership bitsets of every frequent item (items x ceil(rows / 8))."""
+        if self._bits is None:
+            self._bits = np.zeros((len(self.items), (self.n_rows + 7) // 8), dtype=np.uint8)
+            for col_idx, codes in enumerate(self.local_codes):
+                offset = self.column_offsets[col_idx]
+                n_values = np.count_nonzero(self.item_column == col_idx)
+                for local in range(n_values):
+                    self._bits[offset + local] = np.packbits(codes == local)
+        return self._bits
+
+
+def _frequent_pairs(table, min_count):
+    """Count all cross-column item pairs with bincount; return {(a, b): count} for a < b."""
+    pairs = {}
+    n_columns = len(table.local_codes)
+    for c1 in range(n_columns):
+        codes1 = table.local_codes[c1]
+        card1 = np.count_nonzero(table.item_column == c1)
+        if not card1:
+            continue
+        for c2 in range(c1 + 1, n_columns):
+            codes2 = table.local_codes[c2]
+            card2 = np.count_nonzero(table.item_column == c2)
+            if not card2:
+                continue
+            valid = (codes1 >= 0) & (codes2 >= 0)
+            joint = np.bincount(codes1[valid] * card2 + codes2[valid], minlength=card1 * card2)
+            for flat in np.flatnonzero(joint >= min_count):
+                a = table.column_offsets[c1] + flat // card2
+                b = table.column_offsets[c2] + flat % card2
+                pairs[(int(a), int(b))] = int(joint[flat])
+    return pairs
+
+
+def _extend_itemsets(table, frontier, frequent, min_count):
+    """Count (k+1)-itemsets extending the frequent k-itemsets in frontier with bitset ANDs."""
+    bits = table.bitsets()
+    n_items = len(table.items)
+    extended = {}
+    for itemset in frontier:
+        used_columns = set(table.item_column[list(itemset)].tolist())
+        candidates = [c for c in range(itemset[-1] + 1, n_items)
+                      if table.item_column[c] not in used_columns
+                      # Apriori pruning: every k-subset of the candidate must be frequent
+                      and all(tuple(sorted(set(itemset) - {item} | {c})) in frequent
+                              for item in itemset)]
+        if not candidates:
+            continue
+        itemset_bits = np.bitwise_and.reduce(bits[list(itemset)], axis=0)
+        counts = _popcount_rows(bits[candidates] & itemset_bits)
+        for c, count in zip(candidates, counts.tolist()):
+            if count >= min_count:
+                extended[itemset + (c,)] = count
+    return extended
+
+
+def mine_association_rules(df, columns=None, min_support=DEFAULT_MIN_SUPPORT,
+                           min_confidence=DEFAULT_MIN_CONFIDENCE, min_lift=DEFAULT_MIN_LIFT,
+                           max_length=DEFAULT_MAX_LENGTH):
+    """
+    Mine association rules X -> y between (column, value) items.
+
+    Args:
+        df: DataFrame (typically cleaned); missing values never form items
+        columns: Columns to mine (default: the categorical columns)
+        min_support: Minimum fraction of rows containing the whole itemset
+        min_confidence: Minimum P(y | X)
+        min_lift: Minimum confidence / P(y)
+        max_length: Maximum number of items in a rule (antecedent + consequent)
+
+    Returns:
+        List of rule dictionaries with 'antecedent' (list of (column, value)),
+        'consequent' ((column, value)), 'support', 'confidence' and 'lift',
+        sorted by descending confidence then support
+    """
+    columns = categorical_columns(df) if columns is None else list(columns)
+    n_rows = len(df)
+    if n_rows == 0 or len(columns) < 2 or max_length < 2:
+        return []
+
+    min_count = max(1, int(np.ceil(min_support * n_rows)))
+    table = _ItemTable(df, columns, min_count)
+    frequent = {(item,): count for item, count in enumerate(table.item_count.tolist())}
+    frontier = _frequent_pairs(table, min_count)
+    frequent.update(frontier)
+    for _ in range(3, max_length + 1):
+        frontier = _extend_itemsets(table, frontier, frequent, min_count)
+        if not frontier:
+            break
+        frequent.update(frontier)
+
+    rules = []
+    for itemset, count in frequent.items():
+        if len(itemset) < 2:
+            continue
+        for consequent in itemset:
+            antecedent = tuple(item for item in itemset if item != consequent)
+            confidence = count / frequent[antecedent]
+            lift = confidence * n_rows / table.item_count[consequent]
+            if confidence >= min_confidence and lift >= min_lift:
+                rules.append({
+                    'antecedent': [table.items[item] for item in antecedent],
+                    'consequent': table.items[consequent],
+                    'support': count / n_rows,
+                    'confidence': confidence,
+                    'lift': float(lift)
+                })
+
+    rules.sort(key=lambda rule: (-rule['confidence'], -rule['support']))
+    return rules
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Block-wise correlation mining.
+Finds column pairs whose Pearson correlation exceeds a threshold without
+materializing the full correlation matrix: columns are standardized once and
+correlations are computed one tile of column blocks at a time with matmul.
+CorrelationStatistics keeps mergeable streaming statistics for data that
+does not fit in memory.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+
+# Columns per block; a tile of correlations is block x block float64 values (8 MB)
+DEFAULT_BLOCK_COLUMNS = 1024
+
+
+def standardize(values):
+    """
+    Center every column on its mean and scale it to unit norm, in place.
+
+    Missing values (NaN) are excluded from the mean and norm and then set to 0.
+    For complete columns the correlation of two columns is then simply their
+    dot product.
+
+    Args:
+        values: 2D float64 array (rows x columns), modified in place
+
+    Returns:
+        Tuple of (values, missing_columns, missing_mask) where missing_columns
+        lists the columns that had NaNs and missing_mask holds their presence
+        masks (rows x len(missing_columns))
+    """
+    missing = np.isnan(values)
+    missing_columns = np.flatnonzero(missing.any(axis=0))
+    present_mask = ~missing[:, missing_columns]
+    del missing
+
+    if len(missing_columns):
+        means = np.nanmean(values, axis=0)
+        means[np.isnan(means)] = 0.0
+        values -= means
+        np.nan_to_num(values, copy=False, nan=0.0)
+    else:
+        values -= values.mean(axis=0)
+
+    norms = np.sqrt(np.einsum('ij,ij->j', values, values))
+    norms[norms == 0] = 1.0
+    values /= norms
+    return values, missing_columns, present_mask
+
+
+def _complete_tile(z_i, z_j):
+    """Correlations between two blocks of complete, standardized columns."""
+    return z_i.T @ z_j
+
+
+def _masked_tile(z_i, m_i, z_j, m_j):
+    """Pairwise-complete correlations between two blocks with presence masks."""
+    n = m_i.T @ m_j
+    sum_x = z_i.T @ m_j
+    sum_y = m_i.T @ z_j
+    sum_xx = (z_i * z_i).T @ m_j
+    sum_yy = m_i.T @ (z_j * z_j)
+    sum_xy = z_i.T @ z_j
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n * sum_xy - sum_x * sum_y
+        return cov / np.sqrt((n * sum_xx - sum_x * sum_x) * (n * sum_yy - sum_y * sum_y))
+
+
+def threshold_pairs(corr, threshold, row_offset=0, col_offset=0, diagonal=False):
+    """
+    Return (rows, cols, values) of the entries of a correlation tile with |r| > threshold.
+
+    With diagonal=True the tile lies on the diagonal of the full matrix and only
+    its strict upper triangle is considered.
+    """
+    mask = np.abs(corr) > threshold
+    if diagonal:
+        mask &= np.triu(np.ones(mask.shape, dtype=bool), k=1)
+    rows, cols = np.nonzero(mask)
+    return rows + row_offset, cols + col_offset, corr[rows, cols]
+
+
+class _TileComputer:
+    """Computes above-threshold pairs for tiles of standardized data."""
+
+    def __init__(self, z, missing_columns, present_mask, block_size):
+        self.z = z
+        self.present_mask = present_mask
+        self.block_size = block_size
+        self.n_rows, self.n_cols = z.shape
+        self.has_missing = np.zeros(self.n_cols, dtype=bool)
+        self.has_missing[missing_columns] = True
+        self.mask_position = np.full(self.n_cols, -1)
+        self.mask_position[missing_columns] = np.arange(len(missing_columns))
+
+    def tiles(self):
+        """All (i_start, j_start) tiles of the upper triangle of the block grid."""
+        starts = range(0, self.n_cols, self.block_size)
+        return [(i_start, j_start) for i_start in starts for j_start in starts if j_start >= i_start]
+
+    def _block_mask(self, start, stop):
+        mask = np.ones((self.n_rows, stop - start))
+        local = np.flatnonzero(self.has_missing[start:stop])
+        if len(local):
+            mask[:, local] = self.present_mask[:, self.mask_position[start + local]]
+        return mask
+
+    def pairs(self, i_start, j_start, threshold):
+        """Above-threshold (rows, cols, values) of one tile."""
+        i_stop = min(i_start + self.block_size, self.n_cols)
+        j_stop = min(j_start + self.block_size, self.n_cols)
+        z_i = self.z[:, i_start:i_stop]
+        z_j = self.z[:, j_start:j_stop]
+        if self.has_missing[i_start:i_stop].any() or self.has_missing[j_start:j_stop].any():
+            corr = _masked_tile(z_i, self._block_mask(i_start, i_stop),
+                                z_j, self._block_mask(j_start, j_stop))
+        else:
+            corr = _complete_tile(z_i, z_j)
+        return threshold_pairs(corr, threshold, i_start, j_start, diagonal=i_start == j_start)
+
+
+def iter_correlated_pairs(values, threshold, block_size=DEFAULT_BLOCK_COLUMNS):
+    """
+    Yield (rows, cols, values) arrays of above-threshold column pairs, one tile at a time.
+
+    Args:
+        values: 2D float64 array (rows x columns); standardized in place
+        threshold: Absolute correlation a pair must exceed
+        block_size: Columns per block
+    """
+    computer = _TileComputer(*standardize(values), block_size)
+    for i_start, j_start in computer.tiles():
+        yield computer.pairs(i_start, j_start, threshold)
+
+
+# Per-process state of parallel correlation workers
+_worker_computer = None
+
+
+def _init_correlation_worker(z_path, mask_path, missing_columns, block_size):
+    """Open the memory-mapped standardized data once per worker process."""
+    global _worker_computer
+    if threadpool_limits is not None:
+        # One BLAS thread per worker, or processes and BLAS threads oversubscribe the cores
+        threadpool_limits(1)
+    z = np.load(z_path, mmap_mode='r')
+    present_mask = np.load(mask_path, mmap_mode='r')
+    _worker_computer = _TileComputer(z, missing_columns, present_mask, block_size)
+
+
+def _correlation_worker(tiles, threshold):
+    """Compute a batch of tiles and return only their above-threshold pairs."""
+    return _sorted_pairs(_worker_computer.pairs(i_start, j_start, threshold)
+                         for i_start, j_start in tiles)
+
+
+def parallel_correlated_pairs(data, threshold, block_size=DEFAULT_BLOCK_COLUMNS,
+                              workers=None, temp_dir=None):
+    """
+    Find above-threshold column pairs with the block grid split across processes.
+
+    The data is standardized into a memory-mapped file that workers open
+    read-only, so it is never pickled; workers send back only the pairs.
+
+    Args:
+        data: DataFrame or 2D array (rows x columns); not modified
+        threshold: Absolute correlation a pair must exceed
+        block_size: Columns per block
+        workers: Number of worker processes (default: CPU count)
+        temp_dir: Directory for the memory-mapped data (default: system temp)
+
+    Returns:
+        Tuple of (rows, cols, values) arrays sorted by (row, col)
+    """
+    workers = workers or os.cpu_count() or 1
+    n_rows, n_cols = data.shape
+    with tempfile.TemporaryDirectory(prefix="correlation_", dir=temp_dir) as work_dir:
+        z_path = os.path.join(work_dir, "standardized.npy")
+        mask_path = os.path.join(work_dir, "present.npy")
+
+        # Column-major, so each column block is one contiguous slice of the file
+        z = np.lib.format.open_memmap(z_path, mode='w+', dtype=np.float64,
+                                      shape=(n_rows, n_cols), fortran_order=True)
+        for col in range(n_cols):
+            if hasattr(data, 'iloc'):
+                z[:, col] = data.iloc[:, col].to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                z[:, col] = data[:, col]
+        _, missing_columns, present_mask = standardize(z)
+        z.flush()
+        del z
+        np.save(mask_path, present_mask)
+        del present_mask
+
+        computer = _TileComputer(np.empty((0, n_cols)), missing_columns, None, block_size)
+        tiles = computer.tiles()
+        # Interleave tiles so every batch mixes cheap and expensive (masked) tiles
+        batches = [tiles[start::workers * 4] for start in range(min(len(tiles), workers * 4))]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_correlation_worker,
+                                 initargs=(z_path, mask_path, missing_columns, block_size)) as executor:
+            parts = list(executor.map(_correlation_worker, batches,
+                                      [threshold] * len(batches)))
+    return _sorted_pairs(parts)
+
+
+def correlated_pairs(values, threshold, block_size=DEFAULT_BLOCK_COLUMNS):
+    """
+    Find all column pairs (i < j) whose absolute Pearson correlation exceeds threshold.
+
+    Missing values are handled pairwise, as in DataFrame.corr().
+
+    Returns:
+        Tuple of (rows, cols, values) arrays sorted by (row, col)
+    """
+    return _sorted_pairs(iter_correlated_pairs(values, threshold, block_size))
+
+
+def _sorted_pairs(parts):
+    parts = list(parts)
+    if not parts:
+        empty = np.array([], dtype=np.intp)
+        return empty, empty, np.array([], dtype=np.float64)
+    rows = np.concatenate([part[0] for part in parts])
+    cols = np.concatenate([part[1] for part in parts])
+    corrs = np.concatenate([part[2] for part in parts])
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order], corrs[order]
+
+
+class CorrelationStatistics:
+    """
+    Streaming sufficient statistics for pairwise-complete Pearson correlations.
+
+    For every column pair (i, j) the statistics hold the number of rows where
+    both are present, the mean and sum of squared deviations of column i over
+    those rows, and the co-moment of i and j. Chunks are folded in with
+    Welford/Chan updates, two instances computed on different data (e.g. by
+    different worker processes or on different days) can be merged, and the
+    state can be saved to and loaded from an .npz file, so correlations over
+    the full history never require rescanning it.
+    """
+
+    def __init__(self, columns):
+        """Create empty statistics for the given column names."""
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = np.zeros((k, k))
+        self.mean = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+
+    def _check_columns(self, other):
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge correlation statistics over different columns")
+
+    def _combine(self, count, mean, m2, comoment):
+        """Chan et al. pairwise merge of another set of statistics into this one."""
+        total = self.count + count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(total > 0, count / total, 0.0)
+            cross = np.where(total > 0, self.count * count / total, 0.0)
+        delta = mean - self.mean
+        self.mean += delta * weight
+        self.m2 += m2 + delta * delta * cross
+        self.comoment += comoment + delta * delta.T * cross
+        self.count = total
+
+    def update(self, data):
+        """
+        Fold a chunk of rows into the statistics.
+
+        Args:
+            data: DataFrame (columns are matched by name; extra columns are
+                ignored) or 2D array with columns in self.columns order
+
+        Returns:
+            self
+        """
+        if hasattr(data, 'reindex'):
+            data = data.reindex(columns=self.columns)
+        values = np.array(data, dtype=np.float64)
+        if not len(values):
+            return self
+        k = len(self.columns)
+
+        missing = np.isnan(values)
+        if missing.any():
+            # Center on the chunk's column means first, for numerical stability
+            shift = np.nanmean(np.where(missing.all(axis=0), 0.0, values), axis=0)
+            values -= shift
+            values[missing] = 0.0
+            present = (~missing).astype(np.float64)
+            count = present.T @ present
+            sums = values.T @ present
+            squares = (values * values).T @ present
+            products = values.T @ values
+        else:
+            shift = values.mean(axis=0)
+            values -= shift
+            count = np.full((k, k), float(len(values)))
+            sums = np.zeros((k, k))
+            squares = np.broadcast_to(np.einsum('ij,ij->j', values, values)[:, None], (k, k))
+            products = values.T @ values
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(count > 0, sums / count, 0.0)
+            m2 = np.where(count > 0, squares - sums * mean, 0.0)
+            comoment = np.where(count > 0, products - sums * mean.T, 0.0)
+        self._combine(count, mean + shift[:, None], m2, comoment)
+        return self
+
+    def merge(self, other):
+        """Merge statistics computed on other data over the same columns into this one."""
+        self._check_columns(other)
+        self._combine(other.count, other.mean, other.m2, other.comoment)
+        return self
+
+    @classmethod
+    def from_chunks(cls, chunks, columns=None):
+        """Build statistics from an iterable of DataFrames (default columns: the first chunk's numeric ones)."""
+        stats = None
+        for chunk in chunks:
+            if stats is None:
+                if columns is None:
+                    columns = chunk.select_dtypes(include=[np.number]).columns
+                stats = cls(columns)
+            stats.update(chunk)
+        return stats if stats is not None else cls(columns or [])
+
+    def correlation(self, rows=slice(None), cols=slice(None)):
+        """Correlation matrix (or a tile of it); NaN where a pair has too little data."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            denominator = np.sqrt(self.m2[rows, cols] * self.m2[cols, rows].T)
+            return np.where(denominator > 0, self.comoment[rows, cols] / denominator, np.nan)
+
+    def correlated_pairs(self, threshold, block_size=DEFAULT_BLOCK_COLUMNS):
+        """Find column pairs (i < j) with absolute correlation above threshold, tile by tile."""
+        parts = []
+        k = len(self.columns)
+        for i_start in range(0, k, block_size):
+            i_stop = min(i_start + block_size, k)
+            for j_start in range(i_start, k, block_size):
+                j_stop = min(j_start + block_size, k)
+                corr = self.correlation(slice(i_start, i_stop), slice(j_start, j_stop))
+                parts.append(threshold_pairs(corr, threshold, i_start, j_start,
+                                             diagonal=i_start == j_start))
+        return _sorted_pairs(parts)
+
+    def save(self, path):
+        """Write the statistics to an .npz file, atomically."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, columns=np.array(self.columns, dtype=str), count=self.count,
+                     mean=self.mean, m2=self.m2, comoment=self.comoment)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load statistics written by save()."""
+        with np.load(path) as data:
+            stats = cls(data['columns'].tolist())
+            stats.count = data['count']
+            stats.mean = data['mean']
+            stats.m2 = data['m2']
+            stats.comoment = data['comoment']
+        return stats
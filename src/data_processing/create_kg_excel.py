@@ -1,7 +1,7 @@
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Font
 
-def create_knowledge_graph_excel():
+def create_knowledge_graph_excel(output_file="KnowledgeGraph_Research_Data.xlsx"):
     wb = Workbook()
     ws = wb.active
     ws.title = "KG_Research_Data"
@@ -82,7 +82,7 @@ def create_knowledge_graph_excel():
         row += max(len(entity['properties']), len(entity['relationships']))
 
     # Save the workbook
-    wb.save("KnowledgeGraph_Research_Data.xlsx")
+    wb.save(output_file)
 
 if __name__ == "__main__":
     create_knowledge_graph_excel()
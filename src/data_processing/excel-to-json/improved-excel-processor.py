@@ -14,7 +14,11 @@ import os
 import logging
 import hashlib
 import pickle
-from typing import Dict, List, Tuple, Optional, Any, Union
+import re
+import shutil
+import time
+import numpy as np
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Any, Union
 
 # Set up logging
 logging.basicConfig(
@@ -24,6 +28,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger("excel_processor")
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Bump whenever a change to the conversion logic alters the produced JSON,
+# so cached outputs from older versions are never served
+PROCESSOR_VERSION = "1.2.0"
+
+# Defaults for the processing options that affect the converted output
+DEFAULT_CONFIG = {
+    'metadata_max_rows': 6,
+    'header_detection_threshold': 3,
+    'sheet_name': None,
+    'include_empty_cells': False,
+    'output_format': 'json',
+}
+
+# Files written for each output format, as suffixes of the output path stem
+OUTPUT_SUFFIXES = {
+    'json': ['.json'],
+    'ndjson': ['.ndjson', '.meta.json'],
+    'parquet': ['.parquet', '.meta.json'],
+    'npz': ['.npz', '.meta.json'],
+}
+
 
 class ExcelProcessingError(Exception):
     """Base exception for Excel processing errors"""
@@ -65,8 +97,8 @@ def build_merge_map(sheet: openpyxl.worksheet.worksheet.Worksheet) -> Dict:
     try:
         merge_map = {}
         for merged_range in sheet.merged_cells.ranges:
-            # Find the value from the top-left cell
-            top_value = sheet.cell(merged_range.min_row, merged_range.min_col).value
+            # Find the typed value from the top-left cell
+            top_value = get_typed_cell_value(sheet.cell(merged_range.min_row, merged_range.min_col))
             
             # Record this merge in our map
             for row in range(merged_range.min_row, merged_range.max_row + 1):
@@ -183,23 +215,151 @@ def get_typed_cell_value(cell: openpyxl.cell.cell.Cell) -> Any:
     """
     Extract cell value with appropriate type information
     """
-    if cell.value is None:
+    return convert_typed_value(cell.value, cell.data_type)
+
+
+def convert_typed_value(value: Any, data_type: str) -> Any:
+    """
+    Convert a raw cell value according to its openpyxl data type
+    """
+    if value is None:
         return None
         
-    if cell.data_type == 'n':  # Number
-        return float(cell.value) if isinstance(cell.value, float) else int(cell.value)
-    elif cell.data_type == 'd':  # Date
-        return cell.value.isoformat() if hasattr(cell.value, 'isoformat') else str(cell.value)
-    elif cell.data_type == 'b':  # Boolean
-        return bool(cell.value)
+    if data_type == 'n':  # Number
+        return float(value) if isinstance(value, float) else int(value)
+    elif data_type == 'd':  # Date
+        return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+    elif data_type == 'b':  # Boolean
+        return bool(value)
     
     # Default to string for other types
-    return str(cell.value) if cell.value is not None else None
+    return str(value)
+
+
+# Python types that each data type's conversion leaves unchanged
+_IDENTITY_TYPES = {
+    'n': (int, float),
+    'b': (bool,),
+    's': (str,),
+}
+
+
+def convert_typed_column(values: List[Any], data_types: List[str]) -> List[Any]:
+    """
+    Convert a whole column of raw cell values at once
+    
+    The column type is inferred once from the data types and Python types of the
+    non-empty cells. Homogeneous numeric, boolean and string columns are already
+    in their output representation and are returned as-is, homogeneous date
+    columns are converted with a single isoformat pass, and mixed columns fall
+    back to convert_typed_value, so the result always equals per-cell typing.
+    """
+    column_types = set()
+    python_types = set()
+    for value, data_type in zip(values, data_types):
+        if value is not None:
+            column_types.add(data_type)
+            python_types.add(type(value))
+    
+    if not column_types:
+        return [None] * len(values)
+    
+    if len(column_types) == 1:
+        column_type = next(iter(column_types))
+        identity_types = _IDENTITY_TYPES.get(column_type)
+        if identity_types and python_types.issubset(identity_types):
+            return list(values)
+        if column_type == 'd' and all(hasattr(t, 'isoformat') for t in python_types):
+            return [None if value is None else value.isoformat() for value in values]
+    
+    return [convert_typed_value(value, data_type) for value, data_type in zip(values, data_types)]
+
+
+def extract_typed_block(sheet: openpyxl.worksheet.worksheet.Worksheet,
+                        min_row: int, max_row: int, max_col: int) -> List[List[Any]]:
+    """
+    Read a block of rows (1-based, inclusive) and return typed values column by column
+    """
+    cells = getattr(sheet, '_cells', None)
+    if cells is None:
+        # Read-only worksheets have no cell store - go through iter_rows instead
+        raw_cells = [[] for _ in range(max_col)]
+        for row in sheet.iter_rows(min_row=min_row, max_row=max_row, max_col=max_col):
+            for col_idx in range(max_col):
+                raw_cells[col_idx].append(row[col_idx] if col_idx < len(row) else None)
+    else:
+        # Look existing cells up directly instead of materializing empty ones
+        rows = range(min_row, max_row + 1)
+        raw_cells = [[cells.get((row, col)) for row in rows] for col in range(1, max_col + 1)]
+    
+    columns = []
+    for column_cells in raw_cells:
+        values = [None if cell is None else cell.value for cell in column_cells]
+        data_types = [None if cell is None else cell.data_type for cell in column_cells]
+        columns.append(convert_typed_column(values, data_types))
+    return columns
+
+
+class TypedBlockCache:
+    """
+    Column-oriented view of a sheet, converted one block of rows at a time
+    
+    Only the most recently used blocks are kept, since hierarchical extraction
+    only looks a merged region's height past the current row.
+    """
+    
+    def __init__(self, sheet: openpyxl.worksheet.worksheet.Worksheet,
+                 block_size: int = 1000, max_blocks: int = 2):
+        self.sheet = sheet
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.max_row = sheet.max_row
+        self.max_col = sheet.max_column
+        self._blocks = {}
+        self._current_start = 0
+        self._current_end = 0
+        self._current = None
+    
+    def _block(self, block_idx: int) -> List[List[Any]]:
+        block = self._blocks.get(block_idx)
+        if block is None:
+            if len(self._blocks) >= self.max_blocks:
+                del self._blocks[min(self._blocks)]
+            min_row = block_idx * self.block_size + 1
+            max_row = min(min_row + self.block_size - 1, self.max_row)
+            block = extract_typed_block(self.sheet, min_row, max_row, self.max_col)
+            self._blocks[block_idx] = block
+        return block
+    
+    def value(self, row: int, col: int) -> Any:
+        """
+        Return the typed value at a 0-based (row, col) position
+        """
+        if self._current_start <= row < self._current_end:
+            return self._current[col][row - self._current_start] if col < self.max_col else None
+        if row >= self.max_row or col >= self.max_col:
+            return None
+        block_idx = row // self.block_size
+        self._current = self._block(block_idx)
+        self._current_start = block_idx * self.block_size
+        self._current_end = min(self._current_start + self.block_size, self.max_row)
+        return self._current[col][row - self._current_start]
+    
+    def row(self, row: int) -> List[Any]:
+        """
+        Return the typed values of a whole 0-based row
+        """
+        if row >= self.max_row:
+            return [None] * self.max_col
+        self.value(row, 0)
+        offset = row - self._current_start
+        return [column[offset] for column in self._current]
 
 
 def get_cell_value(sheet: openpyxl.worksheet.worksheet.Worksheet, 
                   row: int, col: int, 
-                  merge_map: Dict) -> Any:
+                  merge_map: Dict,
+                  block_cache: Optional[TypedBlockCache] = None) -> Any:
     """
     Helper function to get cell value, considering merged cells
     """
@@ -207,23 +367,29 @@ def get_cell_value(sheet: openpyxl.worksheet.worksheet.Worksheet,
     excel_col = col + 1
     if (excel_row, excel_col) in merge_map:
         return merge_map[(excel_row, excel_col)]['value']
+    elif block_cache is not None:
+        return block_cache.value(row, col)
     else:
         return get_typed_cell_value(sheet.cell(excel_row, excel_col))
 
 
-def extract_hierarchical_data(sheet: openpyxl.worksheet.worksheet.Worksheet, 
-                             merge_map: Dict, 
-                             data_start_row: int,
-                             df_headers: List[str],
-                             chunk_size: int = 1000,
-                             include_empty: bool = False) -> List[Dict]:
+def iter_hierarchical_data(sheet: openpyxl.worksheet.worksheet.Worksheet, 
+                           merge_map: Dict, 
+                           data_start_row: int,
+                           df_headers: List[str],
+                           chunk_size: int = 1000,
+                           include_empty: bool = False,
+                           columnar: bool = True) -> Iterator[Dict]:
     """
-    Extract hierarchical data from the Excel sheet
+    Yield hierarchical records from the Excel sheet as they are extracted
+    
+    With columnar=True cell values are typed a block of chunk_size rows at a
+    time (see TypedBlockCache) instead of once per cell lookup.
     """
     try:
         max_row = sheet.max_row
         max_col = sheet.max_column
-        hierarchical_data = []
+        block_cache = TypedBlockCache(sheet, chunk_size) if columnar else None
         rows_processed = set()
         
         # Process in chunks to handle large files
@@ -240,10 +406,14 @@ def extract_hierarchical_data(sheet: openpyxl.worksheet.worksheet.Worksheet,
                     
                 row_data = {}
                 skip_rows = 1
+                typed_row = block_cache.row(row_idx) if block_cache else None
                 
                 # Process each column
                 for col_idx in range(max_col):
-                    value = get_cell_value(sheet, row_idx, col_idx, merge_map)
+                    if typed_row is not None and (row_idx + 1, col_idx + 1) not in merge_map:
+                        value = typed_row[col_idx]
+                    else:
+                        value = get_cell_value(sheet, row_idx, col_idx, merge_map, block_cache)
                     
                     # Skip empty values if configured
                     if value is None and not include_empty:
@@ -265,7 +435,7 @@ def extract_hierarchical_data(sheet: openpyxl.worksheet.worksheet.Worksheet,
                             sub_values = []
                             for sub_row in range(row_idx, row_idx + skip_rows):
                                 if col_idx + 1 < max_col:  # Check next column exists
-                                    sub_val = get_cell_value(sheet, sub_row, col_idx + 1, merge_map)
+                                    sub_val = get_cell_value(sheet, sub_row, col_idx + 1, merge_map, block_cache)
                                     if sub_val is not None or include_empty:
                                         sub_values.append(sub_val)
                             
@@ -286,21 +456,35 @@ def extract_hierarchical_data(sheet: openpyxl.worksheet.worksheet.Worksheet,
                 
                 # Add this row to our results if it has any non-None values
                 if any(v is not None for v in row_data.values()):
-                    hierarchical_data.append(row_data)
+                    yield row_data
                 
                 # Mark rows as processed
                 for i in range(skip_rows):
                     rows_processed.add(row_idx + i)
                 
                 row_idx += skip_rows
-        
-        logger.info(f"Processed {len(hierarchical_data)} hierarchical records")
-        return hierarchical_data
     except Exception as e:
         logger.error(f"Failed to extract hierarchical data: {str(e)}")
         raise DataExtractionError(f"Failed to extract hierarchical data: {str(e)}") from e
 
 
+def extract_hierarchical_data(sheet: openpyxl.worksheet.worksheet.Worksheet, 
+                             merge_map: Dict, 
+                             data_start_row: int,
+                             df_headers: List[str],
+                             chunk_size: int = 1000,
+                             include_empty: bool = False,
+                             columnar: bool = True) -> List[Dict]:
+    """
+    Extract hierarchical data from the Excel sheet
+    """
+    hierarchical_data = list(iter_hierarchical_data(
+        sheet, merge_map, data_start_row, df_headers, chunk_size, include_empty, columnar
+    ))
+    logger.info(f"Processed {len(hierarchical_data)} hierarchical records")
+    return hierarchical_data
+
+
 def create_result_structure(metadata: Dict, hierarchical_data: List[Dict]) -> Dict:
     """
     Create the final result structure with metadata and data
@@ -314,16 +498,196 @@ def create_result_structure(metadata: Dict, hierarchical_data: List[Dict]) -> Di
 def write_json_output(result: Dict, json_file: str) -> None:
     """
     Write the result structure to a JSON file
+    
+    The file is written to a temporary path and moved into place, so the output
+    always gets a fresh inode and never rewrites a file hard-linked from the cache.
     """
     try:
-        with open(json_file, 'w') as f:
+        tmp_file = f"{json_file}.tmp"
+        with open(tmp_file, 'w') as f:
             json.dump(result, f, indent=2)
+        os.replace(tmp_file, json_file)
         logger.info(f"Data written to {json_file}")
     except Exception as e:
         logger.error(f"Failed to write JSON output: {str(e)}")
         raise ExcelProcessingError(f"Failed to write JSON output: {str(e)}") from e
 
 
+def resolve_output_format(output_format: Optional[str]) -> str:
+    """
+    Resolve a configured output format, mapping 'columnar' to Parquet or NumPy .npz
+    """
+    output_format = (output_format or 'json').lower()
+    if output_format == 'columnar':
+        output_format = 'parquet' if pa is not None else 'npz'
+    if output_format not in OUTPUT_SUFFIXES:
+        raise ExcelProcessingError(f"Unsupported output format: {output_format}")
+    if output_format == 'parquet' and pa is None:
+        raise ExcelProcessingError("Parquet output requires pyarrow")
+    return output_format
+
+
+def output_files(output_file: str, output_format: str) -> List[str]:
+    """
+    Return the files written for an output path in the given format
+    """
+    stem = os.path.splitext(str(output_file))[0]
+    return [stem + suffix for suffix in OUTPUT_SUFFIXES[output_format]]
+
+
+def write_metadata_sidecar(sidecar_file: str, metadata: Dict, output_format: str,
+                           data_file: str, record_count: int, columns: List[Dict] = None) -> None:
+    """
+    Write the metadata section and a description of the data file to a small JSON sidecar
+    """
+    sidecar = {
+        "processor_version": PROCESSOR_VERSION,
+        "format": output_format,
+        "data_file": os.path.basename(data_file),
+        "record_count": record_count,
+        "metadata": metadata,
+    }
+    if columns is not None:
+        sidecar["columns"] = columns
+    tmp_file = f"{sidecar_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(sidecar, f, indent=2, default=str)
+    os.replace(tmp_file, sidecar_file)
+
+
+def write_ndjson_output(records: Iterable[Dict], metadata: Dict, output_file: str) -> int:
+    """
+    Stream records to an NDJSON file, one record per line, as they are produced
+    
+    Returns the number of records written. The metadata goes to a .meta.json sidecar.
+    """
+    data_file, sidecar_file = output_files(output_file, 'ndjson')
+    try:
+        record_count = 0
+        tmp_file = f"{data_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record, default=str))
+                f.write('\n')
+                record_count += 1
+        os.replace(tmp_file, data_file)
+        write_metadata_sidecar(sidecar_file, metadata, 'ndjson', data_file, record_count)
+        logger.info(f"Data written to {data_file}")
+        return record_count
+    except DataExtractionError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to write NDJSON output: {str(e)}")
+        raise ExcelProcessingError(f"Failed to write NDJSON output: {str(e)}") from e
+
+
+def flatten_records(records: Iterable[Dict]) -> Tuple[Dict[str, List[Any]], int]:
+    """
+    Collect records into columns
+    
+    Merged parents ({'value', 'sub_values'}) are split into a value column and a
+    '<column>.sub_values' column holding the sub values as a JSON string.
+    Returns the columns and the number of records.
+    """
+    columns = {}
+    record_count = 0
+    for record in records:
+        for key, value in record.items():
+            if isinstance(value, dict):
+                items = [(str(key), value.get('value')),
+                         (f"{key}.sub_values", json.dumps(value.get('sub_values', []), default=str))]
+            else:
+                items = [(str(key), value)]
+            for name, item in items:
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = [None] * record_count
+                column.append(item)
+        record_count += 1
+        for column in columns.values():
+            if len(column) < record_count:
+                column.append(None)
+    return columns, record_count
+
+
+def _column_kind(values: List[Any]) -> str:
+    """
+    Infer the storage kind of a flattened column: bool, int, float or str
+    """
+    types = {type(value) for value in values if value is not None}
+    if not types:
+        return 'str'
+    if types == {bool}:
+        return 'bool'
+    if types == {int}:
+        return 'int'
+    if types.issubset({int, float}):
+        return 'float'
+    return 'str'
+
+
+def _column_array(values: List[Any], kind: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Convert a column to a NumPy array plus a null mask (None when there are no nulls)
+    """
+    nulls = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+    has_nulls = bool(nulls.any())
+    fill = {'bool': False, 'int': 0, 'float': np.nan, 'str': ''}[kind]
+    if kind == 'str':
+        filled = ['' if value is None else str(value) for value in values]
+    else:
+        filled = [fill if value is None else value for value in values]
+    dtype = {'bool': np.bool_, 'int': np.int64, 'float': np.float64, 'str': np.str_}[kind]
+    return np.asarray(filled, dtype=dtype), (nulls if has_nulls else None)
+
+
+def write_columnar_output(records: Iterable[Dict], metadata: Dict, output_file: str,
+                          output_format: str = 'columnar') -> int:
+    """
+    Write the flat part of each record to a columnar file (Parquet or NumPy .npz)
+    
+    Returns the number of records written. The metadata and the column schema go
+    to a .meta.json sidecar, which is what lets readers load single columns.
+    """
+    output_format = resolve_output_format(output_format)
+    data_file, sidecar_file = output_files(output_file, output_format)
+    try:
+        columns, record_count = flatten_records(records)
+        schema = []
+        arrays = {}
+        for index, (name, values) in enumerate(columns.items()):
+            kind = _column_kind(values)
+            if output_format == 'parquet' and kind == 'str':
+                values = [None if value is None else str(value) for value in values]
+            schema.append({"name": name, "key": f"c{index}", "type": kind})
+            arrays[name] = values
+        
+        if output_format == 'parquet':
+            tmp_file = f"{data_file}.tmp"
+            pq.write_table(pa.table(arrays), tmp_file)
+        else:
+            npz_arrays = {}
+            for column in schema:
+                array, nulls = _column_array(arrays[column["name"]], column["type"])
+                npz_arrays[column["key"]] = array
+                if nulls is not None:
+                    npz_arrays[f"{column['key']}_null"] = nulls
+                    column["nullable"] = True
+            # np.savez appends .npz to names that lack it
+            tmp_file = f"{data_file}.tmp.npz"
+            np.savez_compressed(tmp_file, **npz_arrays)
+        os.replace(tmp_file, data_file)
+        
+        write_metadata_sidecar(sidecar_file, metadata, output_format, data_file, record_count, schema)
+        logger.info(f"Data written to {data_file}")
+        return record_count
+    except DataExtractionError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to write columnar output: {str(e)}")
+        raise ExcelProcessingError(f"Failed to write columnar output: {str(e)}") from e
+
+
 def convert_hierarchical_excel(excel_file: str, json_file: str, config: Dict = None) -> Dict:
     """
     Convert Excel with complex merged cells to properly structured JSON
@@ -339,16 +703,22 @@ def convert_hierarchical_excel(excel_file: str, json_file: str, config: Dict = N
             - sheet_name: Specific sheet to process (default: active sheet)
             - include_empty_cells: Whether to include null values (default: False)
             - chunk_size: Number of rows to process at once (default: 1000)
+            - output_format: 'json' (default), 'ndjson', or 'columnar'/'parquet'/'npz'
+    
+    With the 'json' format the result holds the full data list. The streaming
+    and columnar formats write records as they are extracted and do not keep
+    them, so the result holds 'data_rows' and 'output_files' instead of 'data'.
     """
     logger.info(f"Processing hierarchical data from {excel_file}")
     
     # Parse configuration
     config = config or {}
-    metadata_max_rows = config.get('metadata_max_rows', 6)
-    header_threshold = config.get('header_detection_threshold', 3)
+    metadata_max_rows = config.get('metadata_max_rows', DEFAULT_CONFIG['metadata_max_rows'])
+    header_threshold = config.get('header_detection_threshold', DEFAULT_CONFIG['header_detection_threshold'])
     sheet_name = config.get('sheet_name')
-    include_empty = config.get('include_empty_cells', False)
+    include_empty = config.get('include_empty_cells', DEFAULT_CONFIG['include_empty_cells'])
     chunk_size = config.get('chunk_size', 1000)
+    output_format = resolve_output_format(config.get('output_format', DEFAULT_CONFIG['output_format']))
     
     # Load workbook
     wb, sheet = load_workbook(excel_file)
@@ -365,7 +735,25 @@ def convert_hierarchical_excel(excel_file: str, json_file: str, config: Dict = N
     
     # Read column names with pandas - more reliable for complex headers
     df = pd.read_excel(excel_file, header=data_start_row-1, sheet_name=sheet.title if sheet_name else 0)
-    df_headers = list(df.columns)
+    # Header cells can hold dates or numbers, but record keys must be strings
+    df_headers = [str(header) for header in df.columns]
+    
+    if json_file and output_format != 'json':
+        # Stream records straight into the selected writer
+        records = iter_hierarchical_data(
+            sheet, merge_map, data_start_row, df_headers, chunk_size, include_empty
+        )
+        if output_format == 'ndjson':
+            record_count = write_ndjson_output(records, metadata, json_file)
+        else:
+            record_count = write_columnar_output(records, metadata, json_file, output_format)
+        
+        logger.info(f"Processed {record_count} hierarchical records with metadata")
+        return {
+            "metadata": metadata,
+            "data_rows": record_count,
+            "output_files": output_files(json_file, output_format)
+        }
     
     # Process hierarchical data
     hierarchical_data = extract_hierarchical_data(
@@ -382,6 +770,15 @@ def convert_hierarchical_excel(excel_file: str, json_file: str, config: Dict = N
     return result
 
 
+def count_data_rows(result: Dict) -> int:
+    """
+    Return the number of data records in a conversion result of any output format
+    """
+    if "data_rows" in result:
+        return result["data_rows"]
+    return len(result["data"])
+
+
 def get_file_hash(filepath: str) -> str:
     """
     Calculate MD5 hash of a file to detect changes
@@ -395,8 +792,224 @@ def get_file_hash(filepath: str) -> str:
     return hasher.hexdigest()
 
 
+def normalize_config(config: Optional[Dict] = None) -> Dict:
+    """
+    Return the output-affecting subset of a processing config with defaults filled in
+    
+    Options that only influence how the work is done (such as chunk_size) are
+    dropped, so equivalent configurations map to the same cache key.
+    """
+    config = config or {}
+    normalized = {key: config.get(key, default) for key, default in DEFAULT_CONFIG.items()}
+    normalized['output_format'] = resolve_output_format(normalized['output_format'])
+    return normalized
+
+
+class ConversionCache:
+    """
+    Content-addressed cache of converted JSON outputs
+    
+    Entries are keyed on (content hash, processor version, normalized config) and
+    point at a copy of the JSON that was written when the file was converted.
+    The index is kept in a single pickle file and records, per entry, the stored
+    output size, the summary counts and the last access time used for LRU
+    eviction. A (size, mtime) memo per source path lets unchanged files skip
+    hashing altogether; it keeps the most recently hashed max_fingerprints paths.
+    When an index from another processor version (or an unreadable one) is
+    discarded, the artifact files it pointed at are deleted with it.
+    """
+    
+    INDEX_FILE = "index.pkl"
+    # Artifact files are named <sha256 key><output suffix>, plus '.tmp' while being linked
+    ARTIFACT_RE = re.compile(r'^([0-9a-f]{64})(\..+)$')
+    
+    def __init__(self, cache_dir: str = '.cache', max_entries: int = 256,
+                 max_bytes: int = 512 * 1024 * 1024, max_fingerprints: int = 4096):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_fingerprints = max_fingerprints
+        os.makedirs(self.cache_dir, exist_ok=True)
+        
+        self.entries = {}
+        self.fingerprints = {}
+        self._load_index()
+    
+    def _load_index(self) -> None:
+        index_path = self.cache_dir / self.INDEX_FILE
+        if not index_path.exists():
+            return
+        try:
+            with open(index_path, 'rb') as f:
+                index = pickle.load(f)
+            if index.get('version') == PROCESSOR_VERSION:
+                self.entries = index['entries']
+                self.fingerprints = index['fingerprints']
+                return
+            logger.info(f"Discarding cache index from processor version {index.get('version')}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache index {index_path}: {str(e)}")
+        self._remove_orphans()
+    
+    def _remove_orphans(self) -> int:
+        """
+        Delete artifact files that no index entry points at
+        
+        Returns the number of files removed.
+        """
+        removed = 0
+        for path in self.cache_dir.iterdir():
+            match = self.ARTIFACT_RE.match(path.name)
+            if match is None or not path.is_file():
+                continue
+            entry = self.entries.get(match.group(1))
+            if entry is not None and match.group(2) in entry['suffixes']:
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+    
+    def save(self) -> None:
+        """
+        Persist the cache index
+        """
+        index = {
+            'version': PROCESSOR_VERSION,
+            'entries': self.entries,
+            'fingerprints': self.fingerprints,
+        }
+        index_path = self.cache_dir / self.INDEX_FILE
+        tmp_path = index_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, index_path)
+    
+    def content_hash(self, filepath: str) -> str:
+        """
+        Return the content hash of a file, reusing the memoized hash when its size and mtime are unchanged
+        """
+        stat = os.stat(filepath)
+        path_key = os.path.abspath(filepath)
+        # Re-inserting keeps the memo ordered from least to most recently used
+        memo = self.fingerprints.pop(path_key, None)
+        if memo and memo[0] == stat.st_size and memo[1] == stat.st_mtime_ns:
+            self.fingerprints[path_key] = memo
+            return memo[2]
+        
+        file_hash = get_file_hash(filepath)
+        self.fingerprints[path_key] = (stat.st_size, stat.st_mtime_ns, file_hash)
+        while len(self.fingerprints) > self.max_fingerprints:
+            del self.fingerprints[next(iter(self.fingerprints))]
+        return file_hash
+    
+    def key_for(self, filepath: str, config: Optional[Dict] = None) -> str:
+        """
+        Build the cache key for converting a file with the given config
+        """
+        key_source = json.dumps(
+            [self.content_hash(filepath), PROCESSOR_VERSION, normalize_config(config)],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+    
+    def _cached_path(self, key: str, suffix: str) -> Path:
+        return self.cache_dir / f"{key}{suffix}"
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up an entry, returning its summary record or None on a miss
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if not all(self._cached_path(key, suffix).exists() for suffix in entry['suffixes']):
+            self._remove(key)
+            return None
+        entry['last_used'] = time.time()
+        return entry
+    
+    def put(self, key: str, json_file: str, result: Dict,
+            output_format: str = 'json') -> None:
+        """
+        Store the already-written output files of a conversion under the given key
+        """
+        suffixes = OUTPUT_SUFFIXES[output_format]
+        size = 0
+        for suffix, output_file in zip(suffixes, output_files(json_file, output_format)):
+            cached_path = self._cached_path(key, suffix)
+            _link_or_copy(output_file, cached_path)
+            size += cached_path.stat().st_size
+        self.entries[key] = {
+            'size': size,
+            'suffixes': suffixes,
+            'metadata_rows': len(result["metadata"]),
+            'data_rows': count_data_rows(result),
+            'last_used': time.time(),
+        }
+        self.evict()
+    
+    def materialize(self, key: str, json_file: str) -> List[str]:
+        """
+        Place the cached output files for key next to json_file without re-serializing them
+        
+        Returns the paths of the materialized files.
+        """
+        stem = os.path.splitext(str(json_file))[0]
+        destinations = []
+        for suffix in self.entries[key]['suffixes']:
+            destination = stem + suffix
+            _link_or_copy(self._cached_path(key, suffix), destination)
+            destinations.append(destination)
+        return destinations
+    
+    def _remove(self, key: str) -> int:
+        entry = self.entries.pop(key)
+        for suffix in entry['suffixes']:
+            try:
+                os.remove(self._cached_path(key, suffix))
+            except FileNotFoundError:
+                pass
+        return entry['size']
+    
+    def evict(self) -> None:
+        """
+        Drop least recently used entries until the cache fits its entry and size limits
+        """
+        total_bytes = sum(entry['size'] for entry in self.entries.values())
+        by_age = sorted(self.entries, key=lambda k: self.entries[k]['last_used'])
+        for key in by_age:
+            if len(self.entries) <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            total_bytes -= self._remove(key)
+            logger.debug(f"Evicted cache entry {key}")
+
+
+def _link_or_copy(source, destination) -> None:
+    """
+    Hard-link source to destination, falling back to a copy across filesystems
+    
+    The link is created under a temporary name and moved into place, so an
+    existing destination is replaced rather than written through.
+    """
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        return
+    tmp_destination = f"{destination}.tmp"
+    if os.path.exists(tmp_destination):
+        os.remove(tmp_destination)
+    try:
+        os.link(source, tmp_destination)
+    except OSError:
+        shutil.copyfile(source, tmp_destination)
+    os.replace(tmp_destination, destination)
+
+
 def batch_process_excel_files(input_dir: str, output_dir: str, config: Dict = None, 
-                             use_cache: bool = True, cache_dir: str = '.cache') -> Dict:
+                             use_cache: bool = True, cache_dir: str = '.cache',
+                             cache_max_entries: int = 256,
+                             cache_max_bytes: int = 512 * 1024 * 1024) -> Dict:
     """
     Process all Excel files in a directory and convert them to JSON with metadata detection
     
@@ -406,13 +1019,16 @@ def batch_process_excel_files(input_dir: str, output_dir: str, config: Dict = No
         config: Configuration for Excel processing (see convert_hierarchical_excel)
         use_cache: Whether to use caching to avoid reprocessing unchanged files
         cache_dir: Directory to store cache files
+        cache_max_entries: Maximum number of cached outputs to keep
+        cache_max_bytes: Maximum total size of cached outputs in bytes
     """
     input_path = Path(input_dir)
     output_path = Path(output_dir)
     os.makedirs(output_path, exist_ok=True)
     
+    cache = None
     if use_cache:
-        os.makedirs(cache_dir, exist_ok=True)
+        cache = ConversionCache(cache_dir, cache_max_entries, cache_max_bytes)
     
     excel_files = list(input_path.glob("*.xlsx")) + list(input_path.glob("*.xls"))
     logger.info(f"Found {len(excel_files)} Excel files to process")
@@ -422,40 +1038,34 @@ def batch_process_excel_files(input_dir: str, output_dir: str, config: Dict = No
         json_file = output_path / f"{excel_file.stem}.json"
         
         try:
-            process_file = True
-            result = None
+            entry = None
+            output_format = resolve_output_format((config or {}).get('output_format'))
             
             # Check cache if enabled
-            if use_cache:
-                file_hash = get_file_hash(str(excel_file))
-                cache_file = os.path.join(cache_dir, f"{excel_file.stem}_{file_hash}.pkl")
-                
-                if os.path.exists(cache_file):
-                    logger.info(f"Using cached version for {excel_file.name}")
-                    with open(cache_file, 'rb') as f:
-                        result = pickle.load(f)
-                    process_file = False
+            if cache:
+                cache_key = cache.key_for(str(excel_file), config)
+                entry = cache.get(cache_key)
             
-            # Process the file if needed
-            if process_file:
+            if entry:
+                logger.info(f"Using cached version for {excel_file.name}")
+                written_files = cache.materialize(cache_key, str(json_file))
+                metadata_rows = entry['metadata_rows']
+                data_rows = entry['data_rows']
+            else:
                 result = convert_hierarchical_excel(str(excel_file), str(json_file), config)
+                written_files = output_files(json_file, output_format)
+                metadata_rows = len(result["metadata"])
+                data_rows = count_data_rows(result)
                 
-                # Cache the result if caching is enabled
-                if use_cache:
-                    file_hash = get_file_hash(str(excel_file))
-                    cache_file = os.path.join(cache_dir, f"{excel_file.stem}_{file_hash}.pkl")
-                    with open(cache_file, 'wb') as f:
-                        pickle.dump(result, f)
-            elif json_file:
-                # Write cached result to JSON
-                with open(json_file, 'w') as f:
-                    json.dump(result, f, indent=2)
+                # Cache the written output if caching is enabled
+                if cache:
+                    cache.put(cache_key, str(json_file), result, output_format)
             
             results[excel_file.name] = {
                 "status": "success",
-                "output_file": str(json_file),
-                "metadata_rows": len(result["metadata"]),
-                "data_rows": len(result["data"])
+                "output_file": written_files[0],
+                "metadata_rows": metadata_rows,
+                "data_rows": data_rows
             }
         except Exception as e:
             logger.error(f"Error processing {excel_file}: {str(e)}")
@@ -464,6 +1074,9 @@ def batch_process_excel_files(input_dir: str, output_dir: str, config: Dict = No
                 "error": str(e)
             }
     
+    if cache:
+        cache.save()
+    
     # Write summary report
     summary_file = output_path / "processing_summary.json"
     with open(summary_file, 'w') as f:
@@ -482,8 +1095,13 @@ def process_workbook(excel_file: str, json_file: str, sheet_names: List[str] = N
         json_file: Path for JSON output
         sheet_names: List of sheet names to process (None for all sheets)
         config: Configuration for Excel processing
+    
+    With a non-JSON output_format each sheet is written to its own
+    '<output stem>.<sheet name>' file set instead of one combined document.
     """
     wb = openpyxl.load_workbook(excel_file)
+    output_format = resolve_output_format((config or {}).get('output_format'))
+    stem = os.path.splitext(str(json_file))[0] if json_file else None
     
     # Process specified sheets or all sheets
     sheets_to_process = sheet_names or wb.sheetnames
@@ -496,16 +1114,20 @@ def process_workbook(excel_file: str, json_file: str, sheet_names: List[str] = N
             sheet_config = config.copy() if config else {}
             sheet_config['sheet_name'] = sheet_name
             
-            # Don't write individual JSON files for sheets
-            sheet_data = convert_hierarchical_excel(excel_file, None, sheet_config)
+            if json_file and output_format != 'json':
+                safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in sheet_name)
+                sheet_file = f"{stem}.{safe_name}{OUTPUT_SUFFIXES[output_format][0]}"
+                sheet_data = convert_hierarchical_excel(excel_file, sheet_file, sheet_config)
+            else:
+                # Don't write individual JSON files for sheets
+                sheet_data = convert_hierarchical_excel(excel_file, None, sheet_config)
             result["sheets"][sheet_name] = sheet_data
         else:
             logger.warning(f"Sheet not found: {sheet_name}")
     
     # Write combined result to JSON
-    if json_file:
-        with open(json_file, 'w') as f:
-            json.dump(result, f, indent=2)
+    if json_file and output_format == 'json':
+        write_json_output(result, json_file)
         logger.info(f"Multi-sheet data written to {json_file}")
     
     return result
@@ -516,6 +1138,7 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description='Convert Excel files with complex hierarchical data to JSON')
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
+    FORMAT_CHOICES = ['json', 'ndjson', 'columnar', 'parquet', 'npz']
     
     # Single file processing
     single_parser = subparsers.add_parser('single', help='Process a single Excel file')
@@ -526,26 +1149,37 @@ if __name__ == "__main__":
                               help='Maximum rows to check for metadata')
     single_parser.add_argument('-e', '--include-empty', action='store_true', 
                               help='Include empty cells in output')
+    single_parser.add_argument('-f', '--format', default='json', choices=FORMAT_CHOICES,
+                              help='Output format (default: json)')
     
     # Multi-sheet processing
     multi_parser = subparsers.add_parser('multi', help='Process multiple sheets in an Excel file')
     multi_parser.add_argument('-i', '--input', required=True, help='Input Excel file')
     multi_parser.add_argument('-o', '--output', required=True, help='Output JSON file')
     multi_parser.add_argument('-s', '--sheets', nargs='+', help='Sheets to process (default: all)')
+    multi_parser.add_argument('-f', '--format', default='json', choices=FORMAT_CHOICES,
+                              help='Output format (default: json)')
     
     # Batch processing
     batch_parser = subparsers.add_parser('batch', help='Process all Excel files in a directory')
     batch_parser.add_argument('-i', '--input-dir', required=True, help='Input directory')
     batch_parser.add_argument('-o', '--output-dir', required=True, help='Output directory')
     batch_parser.add_argument('-c', '--cache', action='store_true', help='Use caching for unchanged files')
+    batch_parser.add_argument('-f', '--format', default='json', choices=FORMAT_CHOICES,
+                              help='Output format (default: json)')
     batch_parser.add_argument('--cache-dir', default='.cache', help='Cache directory')
+    batch_parser.add_argument('--cache-max-entries', type=int, default=256,
+                              help='Maximum number of cached outputs to keep')
+    batch_parser.add_argument('--cache-max-mb', type=int, default=512,
+                              help='Maximum total size of cached outputs in MB')
     
     args = parser.parse_args()
     
     if args.command == 'single':
         config = {
             'metadata_max_rows': args.metadata_rows,
-            'include_empty_cells': args.include_empty
+            'include_empty_cells': args.include_empty,
+            'output_format': args.format
         }
         if args.sheet:
             config['sheet_name'] = args.sheet
@@ -553,11 +1187,14 @@ if __name__ == "__main__":
         convert_hierarchical_excel(args.input, args.output, config)
     
     elif args.command == 'multi':
-        process_workbook(args.input, args.output, args.sheets)
+        process_workbook(args.input, args.output, args.sheets, {'output_format': args.format})
     
     elif args.command == 'batch':
-        batch_process_excel_files(args.input_dir, args.output_dir, 
-                                 use_cache=args.cache, cache_dir=args.cache_dir)
+        batch_process_excel_files(args.input_dir, args.output_dir,
+                                 config={'output_format': args.format},
+                                 use_cache=args.cache, cache_dir=args.cache_dir,
+                                 cache_max_entries=args.cache_max_entries,
+                                 cache_max_bytes=args.cache_max_mb * 1024 * 1024)
     
     else:
         print("Excel metadata processor module. Use --help for usage information.")
@@ -13,6 +13,13 @@ from pathlib import Path
 import os
 
 
+def _json_default(value):
+    """Serialize date, time and datetime cell values."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def convert_hierarchical_excel(excel_file, json_file):
     """
     Convert Excel with complex merged cells to properly structured JSON
@@ -117,6 +124,7 @@ def convert_hierarchical_excel(excel_file, json_file):
     
     # Read data with pandas - we'll still use this for column names
     df = pd.read_excel(excel_file, header=data_start_row-1)  # Assuming header is just before data
+    df.columns = [str(column) for column in df.columns]
     
     # Helper function to get value, considering merged cells
     def get_cell_value(row, col):
@@ -192,9 +200,9 @@ def convert_hierarchical_excel(excel_file, json_file):
         "data": hierarchical_data
     }
     
-    # Write to JSON
+    # Write to JSON; date and time cells are written as ISO strings
     with open(json_file, 'w') as f:
-        json.dump(result, f, indent=2)
+        json.dump(result, f, indent=2, default=_json_default)
     
     print(f"Hierarchical data written to {json_file}")
     print(f"Processed {len(hierarchical_data)} hierarchical records with metadata")
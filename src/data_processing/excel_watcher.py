@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Incremental watch mode for Excel ingestion.
+Polls an input directory and converts only new or changed workbooks,
+keeping a manifest of what has already been processed.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from .excel_metadata_processor import convert_hierarchical_excel
+except ImportError:
+    from excel_metadata_processor import convert_hierarchical_excel
+
+
+EXCEL_PATTERNS = ("*.xlsx", "*.xls")
+
+
+def file_hash(filepath):
+    """Calculate the MD5 hash of a file in 64KB chunks."""
+    hasher = hashlib.md5()
+    with open(filepath, 'rb') as f:
+        for buf in iter(lambda: f.read(65536), b''):
+            hasher.update(buf)
+    return hasher.hexdigest()
+
+
+def _convert_workbook(convert_fn, excel_file, json_file):
+    """Convert one workbook in a worker and return only its summary counts."""
+    result = convert_fn(excel_file, json_file)
+    return {
+        "metadata_rows": len(result["metadata"]),
+        "data_rows": len(result["data"])
+    }
+
+
+def _write_json_atomic(data, path):
+    """Write JSON to a temporary file and move it into place."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class ExcelDirectoryWatcher:
+    """Poll a directory and convert new or changed Excel workbooks."""
+
+    MANIFEST_FILE = "processing_manifest.json"
+    SUMMARY_FILE = "processing_summary.json"
+
+    def __init__(self, input_dir, output_dir, poll_interval=1.0, settle_time=2.0,
+                 max_workers=2, convert_fn=convert_hierarchical_excel):
+        """
+        Initialize the watcher.
+
+        A workbook is only converted once its size and mtime have been unchanged
+        for settle_time seconds, so files still being copied onto the share are
+        not picked up half-written.
+        """
+        self.input_dir = Path(input_dir)
+        self.output_dir = Path(output_dir)
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.max_workers = max_workers
+        self.convert_fn = convert_fn
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self.manifest = self._load_json(self.output_dir / self.MANIFEST_FILE)
+        self.summary = self._load_json(self.output_dir / self.SUMMARY_FILE)
+        self._pending = {}
+        self._in_flight = {}
+        self._executor = None
+
+    @staticmethod
+    def _load_json(path):
+        if not path.exists():
+            return {}
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        _write_json_atomic(self.manifest, self.output_dir / self.MANIFEST_FILE)
+        _write_json_atomic(self.summary, self.output_dir / self.SUMMARY_FILE)
+
+    def _list_workbooks(self):
+        workbooks = {}
+        for pattern in EXCEL_PATTERNS:
+            for path in self.input_dir.glob(pattern):
+                # Skip Office lock files for workbooks that are open in Excel
+                if not path.name.startswith("~$"):
+                    workbooks[path.name] = path
+        return workbooks
+
+    def scan(self, now=None):
+        """
+        Return the workbooks that are new or changed and have settled.
+
+        Files whose size and mtime match the manifest are skipped without hashing.
+        """
+        now = time.monotonic() if now is None else now
+        ready = []
+        workbooks = self._list_workbooks()
+
+        for name in list(self.manifest):
+            if name not in workbooks and name not in self._in_flight:
+                del self.manifest[name]
+                self.summary.pop(name, None)
+
+        for name, path in workbooks.items():
+            if name in self._in_flight:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+
+            entry = self.manifest.get(name)
+            if entry and (entry["size"], entry["mtime_ns"]) == signature:
+                self._pending.pop(name, None)
+                continue
+
+            pending = self._pending.get(name)
+            if pending is None or pending[0] != signature:
+                # First sighting or still being written - restart the settle timer
+                self._pending[name] = (signature, now)
+                if self.settle_time > 0:
+                    continue
+                pending = self._pending[name]
+
+            if now - pending[1] >= self.settle_time:
+                ready.append((name, path, signature))
+
+        return ready
+
+    def _submit(self, name, path, signature):
+        content_hash = file_hash(path)
+        self._pending.pop(name, None)
+
+        entry = self.manifest.get(name)
+        if entry and entry.get("hash") == content_hash and entry.get("status") == "success":
+            # Touched but not modified - refresh the stat signature only
+            entry["size"], entry["mtime_ns"] = signature
+            return False
+
+        json_file = self.output_dir / f"{path.stem}.json"
+        future = self._executor.submit(_convert_workbook, self.convert_fn, str(path), str(json_file))
+        self._in_flight[name] = (future, signature, content_hash, json_file)
+        return True
+
+    def _collect(self, wait=False):
+        """Record finished conversions in the manifest and summary."""
+        completed = 0
+        for name, (future, signature, content_hash, json_file) in list(self._in_flight.items()):
+            if not wait and not future.done():
+                continue
+            del self._in_flight[name]
+            completed += 1
+
+            manifest_entry = {
+                "size": signature[0],
+                "mtime_ns": signature[1],
+                "hash": content_hash,
+                "output_file": str(json_file)
+            }
+            try:
+                counts = future.result()
+                manifest_entry["status"] = "success"
+                self.summary[name] = {
+                    "status": "success",
+                    "output_file": str(json_file),
+                    **counts
+                }
+                print(f"Converted {name} -> {json_file}")
+            except Exception as e:
+                manifest_entry["status"] = "error"
+                self.summary[name] = {
+                    "status": "error",
+                    "error": str(e)
+                }
+                print(f"Error processing {name}: {str(e)}")
+            self.manifest[name] = manifest_entry
+        return completed
+
+    def poll_once(self, wait=False, now=None):
+        """
+        Run one polling cycle and return the number of conversions completed.
+
+        With wait=True the cycle blocks until every submitted conversion finishes.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        changed = False
+        for name, path, signature in self.scan(now):
+            try:
+                self._submit(name, path, signature)
+            except OSError as e:
+                print(f"Could not read {name}: {str(e)}")
+            changed = True
+
+        completed = self._collect(wait)
+        if completed or changed:
+            self._save_state()
+        return completed
+
+    def run(self, max_polls=None):
+        """Poll until interrupted (or for max_polls cycles)."""
+        print(f"Watching {self.input_dir} (every {self.poll_interval}s, "
+              f"{self.max_workers} workers)")
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                self.poll_once()
+                polls += 1
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("Stopping watcher...")
+        finally:
+            self.close()
+
+    def close(self):
+        """Wait for in-flight conversions and shut down the worker pool."""
+        if self._executor is not None:
+            self._collect(wait=True)
+            self._save_state()
+            self._executor.shutdown()
+            self._executor = None
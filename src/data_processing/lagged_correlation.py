@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lagged cross-correlation mining for temporal cause -> effect candidates.
+Every series is transformed with one FFT; the cross-correlation of a pair over
+all lags is then a single inverse FFT of the product of their spectra, computed
+for whole batches of pairs at once.
+"""
+
+import numpy as np
+
+
+DEFAULT_MAX_LAG = 10
+DEFAULT_PAIR_BATCH = 2048
+
+
+def _fft_length(n):
+    """Smallest power of two >= n."""
+    return 1 << max(int(n) - 1, 0).bit_length()
+
+
+def _standardize_series(values):
+    """
+    Standardize every column of a (time x series) array to mean 0 and variance 1.
+
+    Missing values are replaced by the series mean (0 after standardizing).
+    Constant series become all zeros.
+    """
+    z = np.array(values, dtype=np.float64)
+    means = np.nanmean(z, axis=0)
+    means[np.isnan(means)] = 0.0
+    z -= means
+    np.nan_to_num(z, copy=False, nan=0.0)
+    stds = np.sqrt(np.mean(z * z, axis=0))
+    stds[stds == 0] = 1.0
+    z /= stds
+    return z
+
+
+def _iter_all_pairs(n_series, batch_size):
+    """Yield (a, b) index arrays covering every pair a < b, batch_size pairs at a time."""
+    pending_a, pending_b, pending = [], [], 0
+    for a in range(n_series - 1):
+        b = np.arange(a + 1, n_series)
+        pending_a.append(np.full(len(b), a))
+        pending_b.append(b)
+        pending += len(b)
+        if pending >= batch_size:
+            yield np.concatenate(pending_a), np.concatenate(pending_b)
+            pending_a, pending_b, pending = [], [], 0
+    if pending:
+        yield np.concatenate(pending_a), np.concatenate(pending_b)
+
+
+def lagged_cross_correlation(values, max_lag=DEFAULT_MAX_LAG, threshold=0.7, pairs=None,
+                             batch_size=DEFAULT_PAIR_BATCH):
+    """
+    Find directed lead/lag relationships between time series.
+
+    For every candidate pair the cross-correlation at lags -max_lag..max_lag is
+    computed (normalized by the series length) and the lag with the largest
+    absolute value is kept. Pairs whose peak is at lag 0 are symmetric and
+    are skipped; the others are returned as leader -> follower.
+
+    Args:
+        values: 2D array (time x series), rows in time order with a fixed sampling interval
+        max_lag: Largest lag considered, in rows
+        threshold: Absolute cross-correlation the peak must exceed
+        pairs: Optional (a, b) index arrays of candidate pairs (default: all pairs)
+        batch_size: Pairs transformed per inverse FFT batch
+
+    Returns:
+        Tuple of (leaders, followers, lags, strengths) arrays, with lags >= 1
+    """
+    z = _standardize_series(values)
+    n_rows, n_series = z.shape
+    max_lag = min(max_lag, n_rows - 1)
+    # Padding to n_rows + max_lag keeps circular wrap-around out of the lag window
+    n_fft = _fft_length(n_rows + max_lag)
+    spectra = np.fft.rfft(z.T, n=n_fft, axis=1)
+    del z
+    if np.iscomplexobj(spectra) and spectra.dtype == np.complex128:
+        spectra = spectra.astype(np.complex64)
+
+    lags = np.concatenate([np.arange(-max_lag, 0), np.arange(0, max_lag + 1)])
+    if pairs is None:
+        batches = _iter_all_pairs(n_series, batch_size)
+    else:
+        pair_a, pair_b = (np.asarray(p) for p in pairs)
+        batches = ((pair_a[start:start + batch_size], pair_b[start:start + batch_size])
+                   for start in range(0, len(pair_a), batch_size))
+
+    leaders, followers, best_lags, strengths = [], [], [], []
+    for a, b in batches:
+        # cc[:, l] = sum_t a[t] * b[t + l]; a positive peak lag means a leads b
+        cc = np.fft.irfft(np.conj(spectra[a]) * spectra[b], n=n_fft, axis=1)
+        window = np.concatenate([cc[:, n_fft - max_lag:], cc[:, :max_lag + 1]], axis=1) / n_rows
+        peak = np.argmax(np.abs(window), axis=1)
+        peak_value = window[np.arange(len(a)), peak]
+        peak_lag = lags[peak]
+
+        keep = (peak_lag != 0) & (np.abs(peak_value) > threshold)
+        a, b, peak_lag, peak_value = a[keep], b[keep], peak_lag[keep], peak_value[keep]
+        forward = peak_lag > 0
+        leaders.append(np.where(forward, a, b))
+        followers.append(np.where(forward, b, a))
+        best_lags.append(np.abs(peak_lag))
+        strengths.append(peak_value.astype(np.float64))
+
+    if not leaders:
+        empty = np.array([], dtype=np.intp)
+        return empty, empty, empty, np.array([], dtype=np.float64)
+    return (np.concatenate(leaders), np.concatenate(followers),
+            np.concatenate(best_lags), np.concatenate(strengths))
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mutual-information dependency scoring for mixed-type columns.
+Numeric columns are quantile-binned once and categorical columns factorized,
+so every column becomes small integer codes. Joint histograms for a column and
+a whole block of partner columns then come from a single np.bincount over
+combined codes.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_BINS = 16
+DEFAULT_MAX_CATEGORIES = 64
+DEFAULT_SAMPLE_ROWS = 100000
+DEFAULT_PRUNE_ROWS = 5000
+# Entropy (nats) below which a column is treated as constant and skipped
+MIN_ENTROPY = 1e-3
+
+
+def encode_columns(df, bins=DEFAULT_BINS, max_categories=DEFAULT_MAX_CATEGORIES):
+    """
+    Encode every column of a DataFrame as integer codes.
+
+    Numeric columns are split into (at most) bins quantile bins; categorical
+    columns keep their max_categories - 1 most frequent values and fold the
+    rest into one "other" code. Missing values get a code of their own.
+
+    Returns:
+        Tuple of (codes, cardinalities): an int64 array (columns x rows, so
+        each column's codes are contiguous) and the number of distinct codes
+        per column
+    """
+    codes = np.empty((len(df.columns), len(df)), dtype=np.int64)
+    cardinalities = np.empty(len(df.columns), dtype=np.int64)
+    for idx, col in enumerate(df.columns):
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series.dtype) and series.dtype != bool:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            present = ~np.isnan(values)
+            edges = np.unique(np.quantile(values[present], np.linspace(0, 1, bins + 1)[1:-1])) \
+                if present.any() else np.array([])
+            column_codes = np.searchsorted(edges, values, side='right')
+            n_codes = len(edges) + 1
+        else:
+            column_codes, uniques = pd.factorize(series, sort=False)
+            present = column_codes >= 0
+            n_codes = len(uniques)
+            if n_codes > max_categories:
+                counts = np.bincount(column_codes[present], minlength=n_codes)
+                keep = np.argsort(-counts, kind='stable')[:max_categories - 1]
+                remap = np.full(n_codes, max_categories - 1, dtype=np.int64)
+                remap[keep] = np.arange(len(keep))
+                column_codes = np.where(present, remap[np.maximum(column_codes, 0)], -1)
+                n_codes = max_categories
+        if not present.all():
+            column_codes = np.where(present, column_codes, n_codes)
+            n_codes += 1
+        codes[idx] = column_codes
+        cardinalities[idx] = max(n_codes, 1)
+    return codes, cardinalities
+
+
+def _entropy(codes, cardinality):
+    p = np.bincount(codes, minlength=cardinality) / len(codes)
+    p = p[p > 0]
+    return float(-(p * np.log(p)).sum())
+
+
+def _mutual_information_block(codes, cardinalities, entropies, i, partners):
+    """
+    Mutual information (nats) between column i and each partner column, from one bincount.
+
+    Every row has a code in every column (missing values included), so the
+    marginals of each joint histogram are the column distributions and
+    MI = H(i) + H(j) - H(i, j).
+    """
+    card_i = cardinalities[i]
+    card_j = cardinalities[partners]
+    stride = card_i * card_j
+    offsets = np.concatenate([[0], np.cumsum(stride)[:-1]])
+    # Joint code of (partner, i) for every row, shifted into the partner's own histogram range
+    combined = codes[partners]
+    combined *= card_i
+    combined += codes[i]
+    combined += offsets[:, None]
+    joint = np.bincount(combined.ravel(), minlength=int(stride.sum())) / codes.shape[1]
+
+    plogp = np.zeros_like(joint)
+    nonzero = joint > 0
+    plogp[nonzero] = joint[nonzero] * np.log(joint[nonzero])
+    joint_entropy = -np.add.reduceat(plogp, offsets)
+    return np.maximum(entropies[i] + entropies[partners] - joint_entropy, 0.0)
+
+
+def _score_pairs(codes, cardinalities, entropies, pairs_by_column, block_size):
+    """Normalized mutual information for the given {i: partner array} pairs."""
+    results = []
+    # Partners per bincount, so each combined block holds about block_size million codes
+    block_size = max(1, block_size * (1 << 20) // max(codes.shape[1], 1))
+    for i, partners in pairs_by_column.items():
+        for start in range(0, len(partners), block_size):
+            block = partners[start:start + block_size]
+            mi = _mutual_information_block(codes, cardinalities, entropies, i, block)
+            nmi = mi / np.sqrt(entropies[i] * entropies[block])
+            results.append((np.full(len(block), i), block, nmi, mi))
+    return results
+
+
+def mutual_information_pairs(df, threshold=0.3, bins=DEFAULT_BINS, sample_rows=DEFAULT_SAMPLE_ROWS,
+                             prune_rows=DEFAULT_PRUNE_ROWS, prune_margin=0.5,
+                             max_categories=DEFAULT_MAX_CATEGORIES, block_size=4, seed=0):
+    """
+    Find column pairs whose normalized mutual information exceeds threshold.
+
+    Normalized MI is MI / sqrt(H(X) H(Y)), in [0, 1] for any mix of numeric
+    and categorical columns.
+
+    To stay tractable at thousands of columns:
+    - at most sample_rows rows (a seeded random sample) are scored
+    - near-constant columns are skipped
+    - when there are more than prune_rows rows, all pairs are first scored
+      on prune_rows rows and only those above prune_margin * threshold are
+      rescored on the full sample
+
+    Returns:
+        List of (column_a, column_b, normalized_mi, mi) tuples, sorted by column position
+    """
+    rng = np.random.default_rng(seed)
+    if sample_rows and len(df) > sample_rows:
+        df = df.iloc[np.sort(rng.choice(len(df), sample_rows, replace=False))]
+    codes, cardinalities = encode_columns(df, bins, max_categories)
+    n_columns, n_rows = codes.shape
+    if n_rows == 0:
+        return []
+
+    entropies = np.array([_entropy(codes[idx], cardinalities[idx]) for idx in range(n_columns)])
+    active = np.flatnonzero(entropies > MIN_ENTROPY)
+    pairs_by_column = {int(i): active[active > i] for i in active[:-1]}
+
+    if prune_rows and n_rows > prune_rows:
+        sample = np.ascontiguousarray(codes[:, rng.choice(n_rows, prune_rows, replace=False)])
+        sample_entropies = np.array([_entropy(sample[idx], cardinalities[idx])
+                                     for idx in range(n_columns)])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scored = _score_pairs(sample, cardinalities, sample_entropies, pairs_by_column, block_size)
+        survivors = {}
+        for i_idx, j_idx, nmi, _ in scored:
+            keep = j_idx[nmi > prune_margin * threshold]
+            if len(keep):
+                survivors.setdefault(int(i_idx[0]), []).append(keep)
+        pairs_by_column = {i: np.concatenate(blocks) for i, blocks in survivors.items()}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scored = _score_pairs(codes, cardinalities, entropies, pairs_by_column, block_size)
+    results = []
+    columns = list(df.columns)
+    for i_idx, j_idx, nmi, mi in scored:
+        for i, j, score, info in zip(i_idx.tolist(), j_idx.tolist(), nmi.tolist(), mi.tolist()):
+            if score > threshold:
+                results.append((columns[i], columns[j], score, info))
+    return results
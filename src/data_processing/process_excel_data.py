@@ -12,6 +12,7 @@ from pathlib import Path
 import sys
 import json
 from excel_metadata_processor import convert_hierarchical_excel, batch_process_excel_files
+from excel_watcher import ExcelDirectoryWatcher
 
 
 def main():
@@ -33,6 +34,12 @@ def main():
         action='store_true'
     )
     
+    parser.add_argument(
+        '--watch', '-w',
+        help='Watch a directory and convert new or changed Excel files',
+        action='store_true'
+    )
+    
     # File/directory arguments
     parser.add_argument(
         '--input', '-i',
@@ -46,11 +53,33 @@ def main():
         required=True
     )
     
+    # Watch mode options
+    parser.add_argument(
+        '--interval',
+        help='Seconds between directory polls in watch mode (default: 1.0)',
+        type=float,
+        default=1.0
+    )
+    
+    parser.add_argument(
+        '--settle',
+        help='Seconds a file must stay unchanged before it is converted (default: 2.0)',
+        type=float,
+        default=2.0
+    )
+    
+    parser.add_argument(
+        '--workers',
+        help='Number of worker processes in watch mode (default: 2)',
+        type=int,
+        default=2
+    )
+    
     # Parse arguments
     args = parser.parse_args()
     
-    if not args.single and not args.batch:
-        parser.error("Please specify either --single or --batch mode")
+    if not args.single and not args.batch and not args.watch:
+        parser.error("Please specify either --single, --batch or --watch mode")
     
     # Execute based on mode
     if args.single:
@@ -100,6 +129,21 @@ def main():
         except Exception as e:
             print(f"Error in batch processing: {str(e)}")
             return 1
+    
+    elif args.watch:
+        if not os.path.isdir(args.input):
+            parser.error(f"Input directory not found: {args.input}")
+        
+        watcher = ExcelDirectoryWatcher(
+            args.input,
+            args.output,
+            poll_interval=args.interval,
+            settle_time=args.settle,
+            max_workers=args.workers
+        )
+        watcher.run()
+        print(f"Manifest saved to: {os.path.join(args.output, ExcelDirectoryWatcher.MANIFEST_FILE)}")
+        return 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Direct Excel-to-relationship extraction.
+Turns free-text relationship cells such as "Collaborates with KG_002" or
+"Supervises KG_005, KG_006" in entity sheets into relationship records that
+can be streamed straight into KnowledgeGraphBuilder.build_graph.
+"""
+
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+
+import openpyxl
+
+
+# Verb phrases and the relationship type they map to. Longer phrases win, so
+# "Member of Lab KG_010" maps to MEMBER_OF rather than an unknown verb.
+DEFAULT_VERB_TYPES = {
+    "collaborates with": "COLLABORATES_WITH",
+    "supervises": "SUPERVISES",
+    "supervised by": "SUPERVISED_BY",
+    "member of": "MEMBER_OF",
+    "published with": "PUBLISHED_WITH",
+    "employs": "EMPLOYS",
+    "employed by": "EMPLOYED_BY",
+    "partners with": "PARTNERS_WITH",
+    "hosts": "HOSTS",
+    "funds": "FUNDS",
+    "contains": "CONTAINS",
+    "part of": "PART_OF",
+    "exhibits": "EXHIBITS",
+    "causes": "CAUSES",
+    "caused by": "CAUSED_BY",
+    "relates to": "RELATES_TO",
+}
+
+DEFAULT_ID_PATTERN = r"[A-Z][A-Z0-9]*[_-]\d+"
+
+
+class RelationshipPatternTable:
+    """Compiled verb and entity-ID patterns, built once per extraction run."""
+
+    def __init__(self, verb_types=None, id_pattern=DEFAULT_ID_PATTERN):
+        """Compile the verb table and the ID pattern."""
+        self.verb_types = {
+            " ".join(verb.lower().split()): rel_type
+            for verb, rel_type in (verb_types or DEFAULT_VERB_TYPES).items()
+        }
+        verbs = sorted(self.verb_types, key=len, reverse=True)
+        verb_alternatives = "|".join(re.escape(verb).replace(r"\ ", r"\s+") for verb in verbs)
+        self._verb_re = re.compile(rf"(?:{verb_alternatives})\b", re.IGNORECASE)
+        self._id_re = re.compile(id_pattern)
+        # One relationship statement per line: optional bullet, verb text, ID list
+        self._line_re = re.compile(
+            rf"^[ \t]*(?:[-*•][ \t]*)?(?P<verb>[^\n]*?)[ \t]*"
+            rf"(?P<ids>{id_pattern}(?:[ \t]*(?:,|;|&|\band\b)[ \t]*{id_pattern})*)[ \t]*\.?[ \t]*$",
+            re.MULTILINE
+        )
+        self._type_cache = {}
+
+    def relationship_type(self, verb_text):
+        """Map verb text to a relationship type, falling back to its upper-snake form."""
+        rel_type = self._type_cache.get(verb_text)
+        if rel_type is None:
+            match = self._verb_re.match(verb_text)
+            if match:
+                rel_type = self.verb_types[" ".join(match.group(0).lower().split())]
+            else:
+                words = re.findall(r"[A-Za-z0-9]+", verb_text)
+                rel_type = "_".join(words).upper() or "RELATES_TO"
+            self._type_cache[verb_text] = rel_type
+        return rel_type
+
+    def parse(self, source, text):
+        """Yield (source, target, type) tuples for every statement in a cell's text."""
+        for match in self._line_re.finditer(text):
+            rel_type = self.relationship_type(match.group("verb"))
+            for target in self._id_re.findall(match.group("ids")):
+                yield source, target, rel_type
+
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CELL_REF_RE = re.compile(r"[A-Z]+")
+
+
+def _column_index(cell_ref):
+    """Convert the column letters of a cell reference such as 'AB12' to a 0-based index."""
+    index = 0
+    for char in _CELL_REF_RE.match(cell_ref).group(0):
+        index = index * 26 + ord(char) - 64
+    return index - 1
+
+
+def _sheet_xml_path(zf, sheet_name):
+    """Resolve the archive path of a sheet (default: the active sheet)."""
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    sheets = workbook.findall(f"{_NS_MAIN}sheets/{_NS_MAIN}sheet")
+    if sheet_name is None:
+        view = workbook.find(f"{_NS_MAIN}bookViews/{_NS_MAIN}workbookView")
+        active = int(view.get("activeTab", 0)) if view is not None else 0
+        sheet = sheets[active]
+    else:
+        matching = [sheet for sheet in sheets if sheet.get("name") == sheet_name]
+        if not matching:
+            raise KeyError(f"Worksheet {sheet_name} does not exist.")
+        sheet = matching[0]
+
+    rel_id = sheet.get(f"{_NS_REL}id")
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(f"{_NS_PKG_REL}Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            return target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+    raise KeyError(f"No archive part for worksheet {sheet.get('name')}")
+
+
+def _shared_strings(zf):
+    """Read the shared string table, joining rich-text runs."""
+    try:
+        data = zf.read("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    root = ET.fromstring(data)
+    return ["".join(node.text or "" for node in item.iter(f"{_NS_MAIN}t"))
+            for item in root.iter(f"{_NS_MAIN}si")]
+
+
+def iter_xlsx_rows(excel_file, sheet_name=None):
+    """
+    Yield each row of an .xlsx sheet as a {column index: value} dictionary.
+
+    A lean streaming parse of the sheet XML that skips openpyxl's cell objects
+    and styles. Numbers are returned as int or float, booleans as bool and
+    everything else as strings; formulas yield their cached value. Cells
+    without the optional 'r' reference take the column after the previous cell.
+    """
+    with zipfile.ZipFile(excel_file) as zf:
+        strings = _shared_strings(zf)
+        row_tag = f"{_NS_MAIN}row"
+        with zf.open(_sheet_xml_path(zf, sheet_name)) as f:
+            for _, elem in ET.iterparse(f, events=("end",)):
+                if elem.tag != row_tag:
+                    continue
+                row = {}
+                column = -1
+                for cell in elem:
+                    cell_ref = cell.get("r")
+                    column = _column_index(cell_ref) if cell_ref else column + 1
+                    cell_type = cell.get("t")
+                    if cell_type == "inlineStr":
+                        value = "".join(node.text or "" for node in cell.iter(f"{_NS_MAIN}t"))
+                    else:
+                        node = cell.find(f"{_NS_MAIN}v")
+                        if node is None or node.text is None:
+                            continue
+                        value = node.text
+                        if cell_type == "s":
+                            value = strings[int(value)]
+                        elif cell_type == "b":
+                            value = value == "1"
+                        elif cell_type in (None, "n"):
+                            number = float(value)
+                            value = int(number) if number.is_integer() and "." not in value else number
+                    row[column] = value
+                elem.clear()
+                yield row
+
+
+def _iter_rows(excel_file, sheet_name):
+    """Yield rows as {column index: value} dictionaries, using the lean reader for .xlsx files."""
+    if str(excel_file).lower().endswith((".xlsx", ".xlsm")):
+        yield from iter_xlsx_rows(excel_file, sheet_name)
+        return
+    wb = openpyxl.load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        sheet = wb[sheet_name] if sheet_name else wb.active
+        for values in sheet.iter_rows(values_only=True):
+            yield {idx: value for idx, value in enumerate(values) if value is not None}
+    finally:
+        wb.close()
+
+
+def _find_columns(rows, id_column, relationship_column, max_header_rows):
+    """Locate the header row and return (id index, relationship index, type index, name index)."""
+    wanted_id = id_column.lower()
+    wanted_rel = relationship_column.lower()
+    for _, row in zip(range(max_header_rows), rows):
+        labels = {str(value).strip().lower(): idx for idx, value in row.items()}
+        if wanted_id in labels and wanted_rel in labels:
+            return (labels[wanted_id], labels[wanted_rel],
+                    labels.get("entity type"), labels.get("entity name"))
+    raise ValueError(f"No header row with '{id_column}' and '{relationship_column}' columns found")
+
+
+def iter_sheet_relationships(excel_file, sheet_name=None, id_column="Entity ID",
+                             relationship_column="Relationships", table=None,
+                             max_header_rows=20):
+    """
+    Stream relationship records from an entity/relationship sheet.
+
+    .xlsx files are read with a lean streaming XML parse (see iter_xlsx_rows).
+    Merged relationship cells only hold their text in the top-left cell, which
+    sits on the entity's own row, so no merge map is needed.
+
+    Args:
+        excel_file: Path to the Excel file
+        sheet_name: Sheet to read (default: active sheet)
+        id_column: Header of the entity ID column
+        relationship_column: Header of the free-text relationship column
+        table: RelationshipPatternTable to use (default: built from DEFAULT_VERB_TYPES)
+        max_header_rows: Number of rows searched for the header row
+
+    Yields:
+        Dictionaries with 'source', 'target' and 'type' keys, plus 'source_type'
+        when the sheet has an "Entity Type" column
+    """
+    table = table or RelationshipPatternTable()
+    rows = _iter_rows(excel_file, sheet_name)
+    id_idx, rel_idx, type_idx, _ = _find_columns(rows, id_column, relationship_column,
+                                                 max_header_rows)
+
+    for row in rows:
+        source = row.get(id_idx)
+        text = row.get(rel_idx)
+        if source is None or not text:
+            continue
+        source = str(source).strip()
+        source_type = row.get(type_idx) if type_idx is not None else None
+        for src, target, rel_type in table.parse(source, str(text)):
+            rel = {'source': src, 'target': target, 'type': rel_type}
+            if source_type:
+                rel['source_type'] = source_type
+            yield rel
+
+
+def extract_relationships(excel_file, **kwargs):
+    """Extract all relationship records from an entity/relationship sheet as a list."""
+    return list(iter_sheet_relationships(excel_file, **kwargs))
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from pathlib import Path
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from knowledge_graph.graph_builder import KnowledgeGraphBuilder
+
+    parser = argparse.ArgumentParser(description='Extract relationships from an entity sheet into a knowledge graph')
+    parser.add_argument('-i', '--input', required=True, help='Input Excel file')
+    parser.add_argument('-s', '--sheet', help='Sheet to read (default: active sheet)')
+    args = parser.parse_args()
+
+    builder = KnowledgeGraphBuilder()
+    graph = builder.build_graph(iter_sheet_relationships(args.input, sheet_name=args.sheet))
+    print(f"Built graph with {graph.number_of_nodes()} nodes and {graph.number_of_edges()} edges")
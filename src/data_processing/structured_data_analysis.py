@@ -10,81 +10,674 @@ before creating knowledge graph relationships.
 import pandas as pd
 import numpy as np
 import os
+import sys
 import json
 from pathlib import Path
 
+import openpyxl
+import yaml
+
+try:
+    from ..knowledge_graph.relationship_batch import RelationshipBatch
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from knowledge_graph.relationship_batch import RelationshipBatch
+
+try:
+    from .correlation_engine import (DEFAULT_BLOCK_COLUMNS, CorrelationStatistics,
+                                     correlated_pairs, parallel_correlated_pairs)
+except ImportError:
+    from correlation_engine import (DEFAULT_BLOCK_COLUMNS, CorrelationStatistics,
+                                    correlated_pairs, parallel_correlated_pairs)
+
+try:
+    from .association_rules import (DEFAULT_MAX_LENGTH, DEFAULT_MIN_CONFIDENCE, DEFAULT_MIN_LIFT,
+                                    DEFAULT_MIN_SUPPORT, mine_association_rules)
+except ImportError:
+    from association_rules import (DEFAULT_MAX_LENGTH, DEFAULT_MIN_CONFIDENCE, DEFAULT_MIN_LIFT,
+                                   DEFAULT_MIN_SUPPORT, mine_association_rules)
+
+try:
+    from .mutual_information import DEFAULT_BINS, DEFAULT_SAMPLE_ROWS, mutual_information_pairs
+except ImportError:
+    from mutual_information import DEFAULT_BINS, DEFAULT_SAMPLE_ROWS, mutual_information_pairs
+
+try:
+    from .lagged_correlation import DEFAULT_MAX_LAG, lagged_cross_correlation
+except ImportError:
+    from lagged_correlation import DEFAULT_MAX_LAG, lagged_cross_correlation
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pa_csv = None
+    pq = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / 'config' / 'config.yaml'
+DEFAULT_CORRELATION_THRESHOLD = 0.7
+DEFAULT_MI_THRESHOLD = 0.3
+DEFAULT_CHUNKSIZE = 100000
+DTYPE_SAMPLE_ROWS = 10000
+# String columns whose sampled distinct-value ratio is at or below this become categoricals
+CATEGORY_RATIO = 0.5
+
+
+def _load_npz_columns(file_path, columns=None):
+    """Load selected columns of a converter .npz output into a DataFrame.
+    
+    The column schema comes from the '.meta.json' sidecar written next to the
+    data file; only the requested arrays are decompressed.
+    """
+    sidecar_path = file_path.with_name(file_path.stem + '.meta.json')
+    with open(sidecar_path, 'r') as f:
+        schema = json.load(f)['columns']
+    
+    if columns is not None:
+        by_name = {column['name']: column for column in schema}
+        missing = [name for name in columns if name not in by_name]
+        if missing:
+            raise KeyError(f"Columns not found in {file_path.name}: {missing}")
+        schema = [by_name[name] for name in columns]
+    
+    data = {}
+    with np.load(file_path) as npz:
+        for column in schema:
+            values = npz[column['key']]
+            nulls = npz[column['key'] + '_null'] if column.get('nullable') else None
+            if column['type'] == 'str':
+                values = values.astype(object)
+                if nulls is not None:
+                    values[nulls] = None
+            elif nulls is not None and column['type'] in ('int', 'bool'):
+                dtype = 'Int64' if column['type'] == 'int' else 'boolean'
+                values = pd.array(values, dtype=dtype)
+                values[nulls] = pd.NA
+            data[column['name']] = values
+    
+    return pd.DataFrame(data)
+
+
+def infer_dtypes(sample, category_ratio=CATEGORY_RATIO):
+    """Pick categorical dtypes for the low-cardinality string columns of a sample."""
+    dtypes = {}
+    for col in sample.columns:
+        series = sample[col]
+        if pd.api.types.is_string_dtype(series.dtype) or series.dtype == object:
+            count = series.count()
+            if count and series.nunique() <= category_ratio * count:
+                dtypes[col] = 'category'
+    return dtypes
+
+
+def downcast_numeric(df):
+    """
+    Downcast numeric columns in place to the smallest dtype that holds their values.
+
+    Integers go to the narrowest integer type; floats only become float32 when
+    that round-trips every value exactly.
+    """
+    for col in df.columns:
+        dtype = df[col].dtype
+        if pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+        elif dtype == np.float64:
+            values = df[col].to_numpy()
+            narrowed = values.astype(np.float32)
+            if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+                df[col] = narrowed
+    return df
+
+
+# Integers up to this magnitude are exact in float64
+_FLOAT_EXACT_INT = 2 ** 53
+
+
+def _hash_rows(df):
+    """
+    64-bit hash of every row.
+
+    Numeric columns are hashed as float64, so the same value hashes equally
+    whether a chunk holds it as int16, int64, float32 or float64 (a chunk
+    with NaNs reads an integer column as floats). Integer columns with values
+    beyond float64's exact range keep 64-bit integers; no float column can
+    hold those values exactly anyway.
+    """
+    hashes = np.zeros(len(df), dtype=np.uint64)
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            if dtype.kind in 'iu' and len(series) and (series.max() >= _FLOAT_EXACT_INT
+                                                       or series.min() <= -_FLOAT_EXACT_INT):
+                series = series.astype(np.int64 if dtype.kind == 'i' else np.uint64)
+            else:
+                # Adding 0.0 turns -0.0 into 0.0, which compares equal to it
+                series = pd.Series(series.to_numpy(dtype=np.float64, na_value=np.nan) + 0.0)
+        col_hash = pd.util.hash_pandas_object(series, index=False).to_numpy()
+        hashes = (hashes * np.uint64(1000003)) ^ col_hash
+    return hashes
+
+
+class RowHashSet:
+    """
+    Persistent set of 64-bit row hashes, used to deduplicate across chunks.
+
+    Hashes are kept as a few sorted uint64 runs that are merged like a binary
+    counter, so each hash costs 8 bytes and lookups are vectorized binary
+    searches rather than per-row Python set operations.
+    """
+    
+    def __init__(self):
+        self._runs = []
+    
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+    
+    def _seen(self, hashes):
+        seen = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            idx = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            seen |= run[idx] == hashes
+        return seen
+    
+    def add_new(self, hashes):
+        """Add hashes and return a mask of those not seen before (first occurrence only)."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        _, first = np.unique(hashes, return_index=True)
+        new = np.zeros(len(hashes), dtype=bool)
+        new[first] = True
+        new &= ~self._seen(hashes)
+        
+        if new.any():
+            self._runs.append(np.sort(hashes[new]))
+            while len(self._runs) > 1 and len(self._runs[-2]) <= len(self._runs[-1]):
+                last = self._runs.pop()
+                self._runs[-1] = np.sort(np.concatenate([self._runs[-1], last]))
+        return new
+
+
+def _rechunk(frames, chunksize):
+    """Regroup an iterable of DataFrames into chunks of exactly chunksize rows (last may be short)."""
+    pending = []
+    pending_rows = 0
+    for frame in frames:
+        pending.append(frame)
+        pending_rows += len(frame)
+        while pending_rows >= chunksize:
+            combined = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+            yield combined.iloc[:chunksize].reset_index(drop=True)
+            rest = combined.iloc[chunksize:]
+            pending = [rest] if len(rest) else []
+            pending_rows = len(rest)
+    if pending_rows:
+        yield pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+
+
+def _slice_frame(df, chunksize):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize].reset_index(drop=True)
+
+
+def _json_default(value):
+    """Convert NumPy scalars and arrays, and dates, for json.dump."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 
 class StructuredDataProcessor:
     """Process structured data for root cause analysis."""
     
     def __init__(self, config_path=None):
-        """Initialize with optional configuration file."""
+        """Initialize with optional configuration file (YAML or JSON).
+        
+        Without a config_path the project's config/config.yaml is used when
+        it exists.
+        """
         self.config = {}
+        if config_path is None and DEFAULT_CONFIG_PATH.exists():
+            config_path = DEFAULT_CONFIG_PATH
         if config_path:
             with open(config_path, 'r') as f:
-                self.config = json.load(f)
+                if Path(config_path).suffix.lower() in ['.yaml', '.yml']:
+                    self.config = yaml.safe_load(f) or {}
+                else:
+                    self.config = json.load(f)
         
         # Default configuration
         self.data_dir = self.config.get('data_dir', 
                                        '../../../data/structured')
         self.output_dir = self.config.get('output_dir',
                                          '../../../data/processed')
+        self.chunksize = self.config.get('chunksize', DEFAULT_CHUNKSIZE)
+        self.cleaning_report = {}
+        
+        analysis = self.config.get('analysis') or {}
+        self.correlation_threshold = analysis.get('correlation_threshold',
+                                                  DEFAULT_CORRELATION_THRESHOLD)
+        self.correlation_block_size = analysis.get('correlation_block_size',
+                                                   DEFAULT_BLOCK_COLUMNS)
+        # Worker processes for correlation mining; 1 keeps it in-process
+        self.correlation_workers = analysis.get('correlation_workers', 1)
+        self.correlation_stats = None
+        self.max_lag = analysis.get('max_lag', DEFAULT_MAX_LAG)
+        self.lag_threshold = analysis.get('lag_threshold', self.correlation_threshold)
+        self.mi_threshold = analysis.get('mi_threshold', DEFAULT_MI_THRESHOLD)
+        self.mi_bins = analysis.get('mi_bins', DEFAULT_BINS)
+        self.mi_sample_rows = analysis.get('mi_sample_rows', DEFAULT_SAMPLE_ROWS)
+        self.min_support = analysis.get('min_support', DEFAULT_MIN_SUPPORT)
+        self.min_confidence = analysis.get('min_confidence', DEFAULT_MIN_CONFIDENCE)
+        self.min_lift = analysis.get('min_lift', DEFAULT_MIN_LIFT)
+        self.max_rule_length = analysis.get('max_rule_length', DEFAULT_MAX_LENGTH)
     
-    def load_data(self, filename):
-        """Load data from CSV, Excel, or JSON."""
+    def load_data(self, filename, columns=None):
+        """Load data from CSV, Excel, JSON, NDJSON, Parquet or NumPy .npz.
+        
+        If columns is given only those columns are returned; CSV, Excel,
+        Parquet and .npz sources skip reading the other columns entirely.
+        """
         file_path = Path(self.data_dir) / filename
+        suffix = file_path.suffix.lower()
         
-        if file_path.suffix.lower() == '.csv':
-            return pd.read_csv(file_path)
-        elif file_path.suffix.lower() in ['.xls', '.xlsx']:
-            return pd.read_excel(file_path)
-        elif file_path.suffix.lower() == '.json':
+        if suffix == '.csv':
+            return pd.read_csv(file_path, usecols=columns)
+        elif suffix in ['.xls', '.xlsx']:
+            return pd.read_excel(file_path, usecols=columns)
+        elif suffix == '.json':
             with open(file_path, 'r') as f:
-                return pd.json_normalize(json.load(f))
+                df = pd.json_normalize(json.load(f))
+        elif suffix in ['.ndjson', '.jsonl']:
+            df = pd.read_json(file_path, lines=True)
+        elif suffix == '.parquet':
+            return pd.read_parquet(file_path, columns=columns)
+        elif suffix == '.npz':
+            return _load_npz_columns(file_path, columns)
         else:
             raise ValueError(f"Unsupported file format: {file_path.suffix}")
+        
+        return df[columns] if columns is not None else df
     
-    def clean_data(self, df):
-        """Clean and preprocess data."""
+    def iter_data(self, filename, columns=None, chunksize=None, dtypes=None,
+                  sample_rows=DTYPE_SAMPLE_ROWS, engine=None):
+        """Stream data from a file as DataFrame chunks.
+        
+        Args:
+            filename: File name relative to data_dir (same formats as load_data)
+            columns: Columns to read; the others are skipped by the parser
+                where the format allows it
+            chunksize: Rows per chunk (default: the 'chunksize' config value)
+            dtypes: Explicit {column: dtype} mapping; if None, dtypes are
+                sampled from the first sample_rows rows (low-cardinality
+                strings become categoricals)
+            sample_rows: Rows read for dtype sampling
+            engine: 'pyarrow' or 'pandas' for CSV and Parquet; by default
+                pyarrow is used when it is installed
+        
+        Yields:
+            DataFrames of at most chunksize rows, with integer columns and
+            exactly representable float columns downcast
+        """
+        file_path = Path(self.data_dir) / filename
+        suffix = file_path.suffix.lower()
+        chunksize = chunksize or self.chunksize
+        use_pyarrow = pa is not None if engine is None else engine == 'pyarrow'
+        if use_pyarrow and pa is None:
+            raise ImportError("pyarrow is required for engine='pyarrow'")
+        
+        if suffix == '.csv':
+            if dtypes is None:
+                dtypes = infer_dtypes(pd.read_csv(file_path, usecols=columns, nrows=sample_rows))
+            if use_pyarrow:
+                chunks = self._iter_csv_pyarrow(file_path, columns, chunksize)
+            else:
+                chunks = pd.read_csv(file_path, usecols=columns, dtype=dtypes or None,
+                                     chunksize=chunksize)
+                # Already applied by the parser
+                dtypes = {}
+        elif suffix in ['.xls', '.xlsx']:
+            chunks = self._iter_excel(file_path, columns, chunksize)
+        elif suffix == '.json':
+            chunks = self._iter_json(file_path, columns, chunksize)
+        elif suffix in ['.ndjson', '.jsonl']:
+            chunks = (chunk[columns] if columns is not None else chunk
+                      for chunk in pd.read_json(file_path, lines=True, chunksize=chunksize))
+        elif suffix == '.parquet':
+            if use_pyarrow:
+                parquet_file = pq.ParquetFile(file_path)
+                chunks = (batch.to_pandas() for batch in
+                          parquet_file.iter_batches(batch_size=chunksize, columns=columns))
+            else:
+                chunks = _slice_frame(pd.read_parquet(file_path, columns=columns), chunksize)
+        elif suffix == '.npz':
+            chunks = _slice_frame(_load_npz_columns(file_path, columns), chunksize)
+        else:
+            raise ValueError(f"Unsupported file format: {file_path.suffix}")
+        
+        for chunk in chunks:
+            if dtypes is None:
+                dtypes = infer_dtypes(chunk.head(sample_rows))
+            if dtypes:
+                chunk = chunk.astype({col: dtype for col, dtype in dtypes.items()
+                                      if col in chunk.columns})
+            yield downcast_numeric(chunk)
+    
+    def _iter_csv_pyarrow(self, file_path, columns, chunksize):
+        """Read a CSV with pyarrow's multithreaded streaming reader."""
+        convert_options = pa_csv.ConvertOptions(include_columns=columns) if columns else None
+        reader = pa_csv.open_csv(file_path, convert_options=convert_options)
+        return _rechunk((batch.to_pandas() for batch in reader), chunksize)
+    
+    def _iter_excel(self, file_path, columns, chunksize):
+        """Read the first sheet of a workbook row by row; the first row is the header."""
+        if file_path.suffix.lower() == '.xls':
+            # openpyxl cannot stream legacy .xls files
+            yield from _slice_frame(pd.read_excel(file_path, usecols=columns), chunksize)
+            return
+        
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = [str(value) if value is not None else f"Unnamed: {idx}"
+                      for idx, value in enumerate(next(rows, ()))]
+            names = columns if columns is not None else header
+            indices = [header.index(name) for name in names]
+            batch = []
+            for row in rows:
+                batch.append([row[idx] if idx < len(row) else None for idx in indices])
+                if len(batch) == chunksize:
+                    yield pd.DataFrame(batch, columns=names)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=names)
+        finally:
+            wb.close()
+    
+    def _iter_json(self, file_path, columns, chunksize):
+        """Stream the records of a top-level JSON array (incrementally when ijson is installed)."""
+        def normalize(records):
+            df = pd.json_normalize(records)
+            return df.reindex(columns=columns) if columns is not None else df
+        
+        if ijson is None:
+            with open(file_path, 'r') as f:
+                records = json.load(f)
+            for start in range(0, len(records), chunksize):
+                yield normalize(records[start:start + chunksize])
+            return
+        
+        with open(file_path, 'rb') as f:
+            batch = []
+            for record in ijson.items(f, 'item', use_float=True):
+                batch.append(record)
+                if len(batch) == chunksize:
+                    yield normalize(batch)
+                    batch = []
+            if batch:
+                yield normalize(batch)
+    
+    def clean_data(self, df, seen_hashes=None):
+        """Clean and preprocess data with as few full-frame copies as possible.
+        
+        Duplicate rows are dropped by 64-bit row hash, low-cardinality string
+        columns become categoricals, missing values are filled column by
+        column (numeric: 0, other: "unknown", overridden per column by the
+        'fill_values' config) and numeric columns are downcast. The bytes
+        used before and after are recorded in self.cleaning_report.
+        
+        df may be a DataFrame or an iterable of DataFrame chunks (as produced
+        by iter_data); for chunks a generator of cleaned chunks is returned,
+        deduplicated against every earlier chunk.
+        
+        Args:
+            df: DataFrame or iterable of DataFrames
+            seen_hashes: RowHashSet shared across calls, to deduplicate
+                against previously cleaned data
+        """
+        self.cleaning_report = {
+            'rows_before': 0,
+            'rows_after': 0,
+            'bytes_before': 0,
+            'bytes_after': 0
+        }
+        if not isinstance(df, pd.DataFrame):
+            seen_hashes = seen_hashes if seen_hashes is not None else RowHashSet()
+            return (self._clean_frame(chunk, seen_hashes) for chunk in df)
+        return self._clean_frame(df, seen_hashes)
+    
+    def _clean_frame(self, df, seen_hashes=None):
+        report = self.cleaning_report
+        report['rows_before'] += len(df)
+        report['bytes_before'] += int(df.memory_usage(deep=True).sum())
+        
         # Remove duplicates
-        df = df.drop_duplicates()
+        hashes = _hash_rows(df)
+        if seen_hashes is not None:
+            keep = seen_hashes.add_new(hashes)
+        else:
+            keep = ~pd.Series(hashes).duplicated().to_numpy()
+        # Shallow copy: columns are replaced one at a time below, never the caller's
+        df = (df[keep] if not keep.all() else df).copy(deep=False)
+        
+        for col, dtype in infer_dtypes(df).items():
+            df[col] = df[col].astype(dtype)
         
-        # Handle missing values
-        df = df.fillna({
-            col: 0 if np.issubdtype(df[col].dtype, np.number) else "unknown"
-            for col in df.columns
-        })
+        # Handle missing values, only touching columns that have any
+        fill_values = self.config.get('fill_values', {})
+        for col in df.columns:
+            series = df[col]
+            if not series.hasnans:
+                continue
+            value = fill_values.get(col, 0 if pd.api.types.is_numeric_dtype(series.dtype) else "unknown")
+            if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+                series = series.cat.add_categories(value)
+            df[col] = series.fillna(value)
         
+        downcast_numeric(df)
+        
+        report['rows_after'] += len(df)
+        report['bytes_after'] += int(df.memory_usage(deep=True).sum())
         return df
     
-    def identify_relationships(self, df):
-        """Identify potential causal relationships."""
-        # This is a placeholder for correlation or association rule mining
-        # In a real implementation, this would use statistical methods
-        relationships = []
-        
-        # Example: Find highly correlated numerical columns
-        if len(df.select_dtypes(include=[np.number]).columns) > 1:
-            corr_matrix = df.select_dtypes(include=[np.number]).corr()
-            for i, col1 in enumerate(corr_matrix.columns):
-                for col2 in corr_matrix.columns[i+1:]:
-                    if abs(corr_matrix.loc[col1, col2]) > 0.7:  # Threshold
-                        relationships.append({
-                            'source': col1,
-                            'target': col2,
-                            'type': 'correlated',
-                            'strength': corr_matrix.loc[col1, col2]
-                        })
-        
-        return relationships
+    def update_statistics(self, data):
+        """Fold a DataFrame or chunk stream into the running correlation statistics.
+        
+        The statistics start from the numeric columns of the first data seen
+        and can be persisted with save_statistics, so later runs only need to
+        process new data.
+        
+        Returns:
+            The updated CorrelationStatistics
+        """
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+        for chunk in chunks:
+            if self.correlation_stats is None:
+                self.correlation_stats = CorrelationStatistics(
+                    chunk.select_dtypes(include=[np.number]).columns)
+            self.correlation_stats.update(chunk)
+        return self.correlation_stats
+    
+    def save_statistics(self, path):
+        """Persist the running correlation statistics to an .npz file."""
+        self.correlation_stats.save(path)
+    
+    def load_statistics(self, path):
+        """Load correlation statistics saved by an earlier run; new data is merged into them."""
+        self.correlation_stats = CorrelationStatistics.load(path)
+        return self.correlation_stats
+    
+    def identify_relationships(self, df, method='correlation', as_batch=False):
+        """Identify potential causal relationships.
+        
+        With method='correlation', numeric column pairs whose absolute
+        correlation exceeds the analysis.correlation_threshold config value
+        are returned. The full correlation matrix is never built; see
+        correlation_engine. With analysis.correlation_workers > 1 the block
+        grid is split across that many processes.
+        
+        Returns a list of relationship dictionaries, or with as_batch=True a
+        RelationshipBatch, which skips building the dictionaries and can be
+        passed straight to KnowledgeGraphBuilder.build_graph.
+        
+        df may be a DataFrame, an iterable of DataFrame chunks or a
+        CorrelationStatistics instance. Chunks are reduced to mergeable
+        statistics so the full data is never held in memory, and statistics
+        (e.g. self.correlation_stats) are used as-is without rescanning data.
+        
+        With method='mutual_information', every pair of columns (numeric or
+        categorical) is scored by normalized mutual information, which also
+        catches non-linear dependencies; pairs above analysis.mi_threshold
+        become 'dependent' relationships. This mode needs a DataFrame.
+        """
+        if method == 'mutual_information':
+            return self._as_output(self._mutual_information_relationships(df), as_batch)
+        if method != 'correlation':
+            raise ValueError(f"Unknown relationship method: {method}")
+        
+        if isinstance(df, CorrelationStatistics):
+            rows, cols, strengths = df.correlated_pairs(self.correlation_threshold,
+                                                        self.correlation_block_size)
+            return self._as_output(self._correlation_relationships(df.columns, rows, cols, strengths),
+                                   as_batch)
+        if not isinstance(df, pd.DataFrame):
+            return self.identify_relationships(CorrelationStatistics.from_chunks(df), as_batch=as_batch)
+        
+        numeric = df.select_dtypes(include=[np.number])
+        if len(numeric.columns) < 2:
+            return self._as_output(RelationshipBatch.empty(), as_batch)
+        
+        # Pairs of highly correlated numerical columns, found block by block
+        if self.correlation_workers > 1 and len(numeric.columns) > self.correlation_block_size:
+            rows, cols, strengths = parallel_correlated_pairs(numeric, self.correlation_threshold,
+                                                              self.correlation_block_size,
+                                                              self.correlation_workers)
+        else:
+            # correlated_pairs standardizes in place, so it must get its own copy
+            rows, cols, strengths = correlated_pairs(numeric.to_numpy(dtype=np.float64, copy=True),
+                                                     self.correlation_threshold,
+                                                     self.correlation_block_size)
+        return self._as_output(self._correlation_relationships(numeric.columns, rows, cols, strengths),
+                               as_batch)
+    
+    def _mutual_information_relationships(self, df):
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Mutual information scoring needs a DataFrame, not a chunk stream")
+        pairs = mutual_information_pairs(df, self.mi_threshold, self.mi_bins, self.mi_sample_rows)
+        return RelationshipBatch.from_arrays(
+            [pair[0] for pair in pairs],
+            [pair[1] for pair in pairs],
+            'dependent',
+            [pair[2] for pair in pairs],
+            {'mutual_information': [pair[3] for pair in pairs]}
+        )
+    
+    def identify_association_relationships(self, df, columns=None, as_batch=False):
+        """Identify directed relationships from association rules over categorical columns.
+        
+        Items are "column=value" strings; a rule such as
+        component=pump & shift=night -> failure=bearing becomes a relationship
+        from the antecedent to the consequent with strength = confidence.
+        Thresholds come from analysis.min_support, min_confidence, min_lift
+        and max_rule_length.
+        
+        Args:
+            df: DataFrame, typically the output of clean_data
+            columns: Columns to mine (default: all non-numeric columns)
+            as_batch: Return a RelationshipBatch instead of a list
+        
+        Returns:
+            List of relationship dictionaries (or a RelationshipBatch)
+        """
+        rules = mine_association_rules(df, columns, self.min_support, self.min_confidence,
+                                       self.min_lift, self.max_rule_length)
+        batch = RelationshipBatch.from_arrays(
+            [" & ".join(f"{col}={value}" for col, value in rule['antecedent']) for rule in rules],
+            [f"{rule['consequent'][0]}={rule['consequent'][1]}" for rule in rules],
+            'implies',
+            [rule['confidence'] for rule in rules],
+            {
+                'support': [rule['support'] for rule in rules],
+                'lift': [rule['lift'] for rule in rules]
+            }
+        )
+        return self._as_output(batch, as_batch)
+    
+    def identify_temporal_relationships(self, df, time_column=None, max_lag=None, pairs=None, as_batch=False):
+        """Identify directed 'leads' relationships from lagged cross-correlation.
+        
+        Every numeric column is treated as a time series sampled at a fixed
+        interval (rows sorted by time_column if given). A pair whose
+        cross-correlation peaks at a non-zero lag with an absolute value above
+        analysis.lag_threshold yields leader -> follower, with the lag (in
+        rows) in the relationship metadata.
+        
+        Args:
+            df: DataFrame with one row per time step
+            time_column: Column to sort rows by (excluded from the series)
+            max_lag: Largest lag considered (default: analysis.max_lag)
+            pairs: Optional (a, b) arrays of candidate column index pairs
+                (positions among the numeric columns); default: all pairs
+            as_batch: Return a RelationshipBatch instead of a list
+        
+        Returns:
+            List of relationship dictionaries (or a RelationshipBatch)
+        """
+        if time_column is not None:
+            df = df.sort_values(time_column)
+        numeric = df.select_dtypes(include=[np.number])
+        if time_column in numeric.columns:
+            numeric = numeric.drop(columns=[time_column])
+        if len(numeric.columns) < 2 or len(numeric) < 2:
+            return self._as_output(RelationshipBatch.empty(), as_batch)
+        
+        leaders, followers, lags, strengths = lagged_cross_correlation(
+            numeric.to_numpy(dtype=np.float64),
+            self.max_lag if max_lag is None else max_lag,
+            self.lag_threshold,
+            pairs
+        )
+        batch = RelationshipBatch.from_codes(numeric.columns, leaders, followers, 'leads',
+                                             strengths, {'lag': lags})
+        return self._as_output(batch, as_batch)
+    
+    @staticmethod
+    def _as_output(batch, as_batch):
+        return batch if as_batch else batch.to_records()
+    
+    @staticmethod
+    def _correlation_relationships(columns, rows, cols, strengths):
+        return RelationshipBatch.from_codes(columns, rows, cols, 'correlated', strengths)
     
     def export_for_knowledge_graph(self, relationships, filename):
-        """Export relationships for knowledge graph construction."""
+        """Export relationships for knowledge graph construction.
+        
+        relationships may be a RelationshipBatch or a list of relationship
+        dictionaries. A '.npz' filename spills them in the compact columnar
+        form (read back by KnowledgeGraphBuilder.load_relationships); any
+        other filename is written as JSON. Lists are written as given, every
+        key included, with NumPy values converted to plain Python ones.
+        """
         output_path = Path(self.output_dir) / filename
         os.makedirs(output_path.parent, exist_ok=True)
         
+        if output_path.suffix.lower() == '.npz':
+            return RelationshipBatch.from_records(relationships).save(output_path)
+        
+        if isinstance(relationships, RelationshipBatch):
+            relationships = relationships.to_records()
         with open(output_path, 'w') as f:
-            json.dump(relationships, f, indent=2)
+            json.dump(relationships, f, indent=2, default=_json_default)
         
         return output_path
 
@@ -96,5 +689,20 @@ if __name__ == "__main__":
     # df = processor.load_data("data.csv")
     # df = processor.clean_data(df)
     # relationships = processor.identify_relationships(df)
-    # processor.export_for_knowledge_graph(relationships, "relationships.json")
+    # For files too large for memory, stream chunks instead:
+    # chunks = processor.clean_data(processor.iter_data("data.csv", chunksize=50000))
+    # relationships = processor.identify_relationships(chunks)
+    # Rules between categorical values (failure codes, components, vendors):
+    # relationships += processor.identify_association_relationships(df)
+    # Directed lead/lag candidates from time-ordered sensor data:
+    # relationships += processor.identify_temporal_relationships(df, time_column="timestamp")
+    # Or keep statistics across runs and only process new data:
+    # processor.load_statistics("correlation_stats.npz")
+    # processor.update_statistics(processor.iter_data("today.csv"))
+    # processor.save_statistics("correlation_stats.npz")
+    # relationships = processor.identify_relationships(processor.correlation_stats)
+    # For large results, skip the per-relationship dictionaries and hand a batch
+    # straight to KnowledgeGraphBuilder().build_graph(...), or spill it in compact binary form:
+    # relationships = processor.identify_relationships(df, as_batch=True)
+    # processor.export_for_knowledge_graph(relationships, "relationships.npz")
     print("Structured data analysis module ready.")
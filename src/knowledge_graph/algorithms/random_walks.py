@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Random-walk corpus generation for DeepWalk/node2vec-style graph embeddings.
+The graph is flattened to CSR arrays with one alias table per node, weighted
+by edge strength, so each step of every walk is an O(1) sample. All walks of
+a shard advance in lock-step as NumPy array operations, shards are spread
+over worker processes with seeds derived from the shard number (so the
+corpus does not depend on the worker count), and walks are written straight
+into a memory-mapped int32 .npy file.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+DEFAULT_WALK_LENGTH = 40
+DEFAULT_SHARD_WALKS = 65536
+
+# CSR arrays memory-mapped once per worker process by _init_walk_worker
+_worker_graph = None
+
+
+def _build_alias_tables(indptr, weights):
+    """
+    Alias tables for every node's out-edges at once.
+
+    Uses the sweeping construction: per node, light edges (scaled weight
+    below 1) are paired in order with the current heavy edge, whose residual
+    weight is carried forward. Every iteration advances all unfinished nodes
+    by one pairing, so the number of NumPy passes is bounded by the largest
+    degree, not the number of nodes.
+
+    Returns:
+        Tuple of (prob, alias): float64 acceptance probabilities and int64
+        alias edge positions, both indexed by edge position
+    """
+    n_edges = len(weights)
+    degree = np.diff(indptr)
+    owner = np.repeat(np.arange(len(degree)), degree)
+    totals = np.add.reduceat(weights, indptr[:-1][degree > 0]) if n_edges else np.array([])
+    row_total = np.zeros(len(degree))
+    row_total[degree > 0] = totals
+    # Rows with no positive weight are sampled uniformly
+    uniform = row_total[owner] <= 0
+    scaled = np.where(uniform, 1.0, weights * degree[owner] / np.where(uniform, 1.0, row_total[owner]))
+
+    prob = np.ones(n_edges)
+    alias = np.arange(n_edges)
+    # Edge positions grouped by node, light edges first within each node
+    heavy = scaled >= 1.0
+    order = np.lexsort((heavy, owner))
+    n_light = np.bincount(owner, weights=~heavy, minlength=len(degree)).astype(np.int64)
+    light_ptr = indptr[:-1].copy()
+    light_end = indptr[:-1] + n_light
+    heavy_ptr = light_end.copy()
+    heavy_end = indptr[1:].copy()
+
+    active = np.flatnonzero((n_light > 0) & (heavy_ptr < heavy_end))
+    residual = np.zeros(len(degree))
+    residual[active] = scaled[order[heavy_ptr[active]]]
+    while len(active):
+        current = order[heavy_ptr[active]]
+        # A heavy edge whose residual fell below 1 becomes light: alias it to the next heavy edge
+        spent = residual[active] < 1.0
+        has_next = heavy_ptr[active] + 1 < heavy_end[active]
+        move = spent & has_next
+        nodes = active[move]
+        if len(nodes):
+            following = order[heavy_ptr[nodes] + 1]
+            prob[current[move]] = residual[nodes]
+            alias[current[move]] = following
+            residual[nodes] = scaled[following] - (1.0 - residual[nodes])
+            heavy_ptr[nodes] += 1
+
+        # Otherwise pair the next light edge with the current heavy edge
+        pair = ~spent & (light_ptr[active] < light_end[active])
+        nodes = active[pair]
+        if len(nodes):
+            light = order[light_ptr[nodes]]
+            prob[light] = scaled[light]
+            alias[light] = current[pair]
+            residual[nodes] -= 1.0 - scaled[light]
+            light_ptr[nodes] += 1
+
+        # Done once there is neither a light edge nor a spent heavy edge to place
+        # (a spent heavy edge with no successor only happens through round-off)
+        pending = ((light_ptr[active] < light_end[active])
+                   | ((residual[active] < 1.0) & (heavy_ptr[active] + 1 < heavy_end[active])))
+        active = active[pending & (move | pair)]
+    return prob, alias
+
+
+class CSRGraph:
+    """Compressed sparse row view of a graph with per-node alias tables."""
+
+    def __init__(self, nodes, indptr, indices, weights):
+        """Create a CSR graph from arrays (see from_graph) and build its alias tables."""
+        self.nodes = np.asarray(nodes, dtype=object)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.prob, self.alias = _build_alias_tables(self.indptr, self.weights)
+
+    @classmethod
+    def from_graph(cls, graph, weight='strength', directed=False):
+        """
+        Flatten a NetworkX graph (e.g. KnowledgeGraphBuilder.graph).
+
+        Args:
+            graph: NetworkX graph
+            weight: Edge attribute used as the transition weight (missing: 1.0;
+                negative weights count as 0)
+            directed: Follow edges only in their direction; by default walks
+                treat the graph as undirected, as DeepWalk does, so they do
+                not stop at nodes without out-edges
+        """
+        nodes = list(graph.nodes)
+        index = {node: idx for idx, node in enumerate(nodes)}
+        edges = [(index[u], index[v], max(float(data.get(weight, 1.0)), 0.0))
+                 for u, v, data in graph.edges(data=True)]
+        sources = np.array([edge[0] for edge in edges], dtype=np.int64)
+        targets = np.array([edge[1] for edge in edges], dtype=np.int64)
+        weights = np.array([edge[2] for edge in edges], dtype=np.float64)
+        if not directed or not graph.is_directed():
+            loops = sources == targets
+            sources, targets = np.r_[sources, targets[~loops]], np.r_[targets, sources[~loops]]
+            weights = np.r_[weights, weights[~loops]]
+        order = np.lexsort((targets, sources))
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(sources, minlength=len(nodes)))])
+        return cls(nodes, indptr, targets[order], weights[order])
+
+    def save_arrays(self, directory):
+        """Save the CSR and alias arrays as .npy files, for memory-mapping by workers."""
+        for name in ('indptr', 'indices', 'prob', 'alias'):
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+
+    @classmethod
+    def load_arrays(cls, directory, mmap_mode='r'):
+        """Memory-map arrays written by save_arrays (node names are not needed to walk)."""
+        graph = cls.__new__(cls)
+        graph.nodes = None
+        graph.weights = None
+        for name in ('indptr', 'indices', 'prob', 'alias'):
+            setattr(graph, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode))
+        return graph
+
+    def walk(self, starts, walk_length, rng):
+        """
+        Advance one walk from every start node in lock-step.
+
+        Walks that reach a node without out-edges stop there; their remaining
+        steps are -1.
+
+        Returns:
+            int32 array (len(starts) x walk_length)
+        """
+        walks = np.full((len(starts), walk_length), -1, dtype=np.int32)
+        current = np.asarray(starts, dtype=np.int64)
+        walks[:, 0] = current
+        alive = np.arange(len(current))
+        indptr, indices, prob, alias = self.indptr, self.indices, self.prob, self.alias
+        for step in range(1, walk_length):
+            start = indptr[current]
+            degree = indptr[current + 1] - start
+            moving = degree > 0
+            if not moving.all():
+                alive, current, start, degree = alive[moving], current[moving], start[moving], degree[moving]
+                if not len(alive):
+                    break
+            # One uniform draw picks the column, the second accepts it or takes its alias
+            draws = rng.random((2, len(alive)))
+            edge = start + (draws[0] * degree).astype(np.int64)
+            edge = np.where(draws[1] < prob[edge], edge, alias[edge])
+            current = indices[edge].astype(np.int64)
+            walks[alive, step] = current
+        return walks
+
+    def node_names(self, walks):
+        """Translate a walk array to lists of node names (dropping -1 padding)."""
+        return [[self.nodes[node] for node in walk if node >= 0] for walk in np.asarray(walks).tolist()]
+
+
+def _shard_bounds(n_walks, shard_walks):
+    return [(start, min(start + shard_walks, n_walks)) for start in range(0, n_walks, shard_walks)]
+
+
+def _write_shard(graph, out_path, shard, start, stop, n_nodes, walk_length, seed):
+    """Generate walks [start, stop) and write them into the output memmap."""
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard,)))
+    # Walk i starts at node i mod n_nodes, so every pass over the nodes covers each node once
+    starts = np.arange(start, stop) % n_nodes
+    shard_walks = graph.walk(starts, walk_length, rng)
+    walks = np.load(out_path, mmap_mode='r+')
+    walks[start:stop] = shard_walks
+    walks.flush()
+    del walks
+    # Steps actually taken: walks that hit a dead end stop early and are padded with -1
+    return int(np.count_nonzero(shard_walks >= 0)) - (stop - start)
+
+
+def _init_walk_worker(array_dir):
+    global _worker_graph
+    _worker_graph = CSRGraph.load_arrays(array_dir)
+
+
+def _walk_worker(*args):
+    return _write_shard(_worker_graph, *args)
+
+
+def generate_walks(graph, out_path, walks_per_node=10, walk_length=DEFAULT_WALK_LENGTH,
+                   workers=1, seed=0, shard_walks=DEFAULT_SHARD_WALKS, temp_dir=None):
+    """
+    Write a random-walk corpus to a memory-mapped int32 .npy file.
+
+    Args:
+        graph: CSRGraph (or a NetworkX graph, flattened with CSRGraph.from_graph)
+        out_path: Output .npy file (walks x walk_length node indices, -1 after a dead end)
+        walks_per_node: Walks started from every node
+        walk_length: Nodes per walk, the start node included
+        workers: Worker processes; shards are assigned to whichever worker is free
+        seed: Base seed; shard i always uses the seed (seed, i), so the corpus is
+            identical for any worker count
+        shard_walks: Walks advanced together in one lock-step batch
+        temp_dir: Where the CSR arrays are staged for workers (default: system temp)
+
+    Returns:
+        Dictionary with the output path, walk count and number of steps taken
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_graph(graph)
+    n_nodes = len(graph.indptr) - 1
+    n_walks = n_nodes * walks_per_node
+    walks = np.lib.format.open_memmap(out_path, mode='w+', dtype=np.int32,
+                                      shape=(n_walks, walk_length))
+    del walks
+    shards = _shard_bounds(n_walks, shard_walks)
+
+    if workers <= 1 or len(shards) <= 1:
+        steps = sum(_write_shard(graph, out_path, shard, start, stop, n_nodes, walk_length, seed)
+                    for shard, (start, stop) in enumerate(shards))
+    else:
+        with tempfile.TemporaryDirectory(prefix="walks_", dir=temp_dir) as array_dir:
+            graph.save_arrays(array_dir)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_walk_worker,
+                                     initargs=(array_dir,)) as executor:
+                futures = [executor.submit(_walk_worker, str(out_path), shard, start, stop, n_nodes,
+                                           walk_length, seed)
+                           for shard, (start, stop) in enumerate(shards)]
+                steps = sum(future.result() for future in futures)
+    return {'path': str(out_path), 'walks': n_walks, 'steps': steps}
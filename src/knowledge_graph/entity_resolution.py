@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Entity resolution for knowledge graph node names.
+Names are normalized (case, punctuation, token order), exact duplicates are
+collapsed, and the remaining distinct forms get MinHash signatures over
+character shingles. LSH banding over the signatures proposes candidate pairs
+without comparing all pairs. Candidates are verified token by token: their
+identifier tokens must be equal, and every other token one name does not
+share must be a one-edit typo of, or split/joined from, a token of the
+other, so "High oil pressure" and "Low oil pressure" stay apart. Verified
+pairs of the same (or no) entity type are merged into clusters, each
+represented by one canonical name.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from itertools import permutations
+
+import numpy as np
+
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def normalize_name(name):
+    """
+    Normalize a node name for matching.
+
+    Lowercases, drops punctuation inside tokens (so "P-101" and "p101" agree)
+    and sorts the tokens (so "P-101 pump" and "Pump P-101" agree).
+    """
+    text = unicodedata.normalize("NFKC", str(name)).lower()
+    tokens = (_NON_ALNUM.sub("", token) for token in text.split())
+    return " ".join(sorted(token for token in tokens if token))
+
+
+def identifier_key(normalized):
+    """
+    The tokens of a normalized name that contain digits ("p101" in "p101 pump").
+
+    Equipment tags differ from each other by a digit or two, which barely
+    changes shingle similarity, so names are only merged when these agree.
+    """
+    return " ".join(token for token in normalized.split() if any(char.isdigit() for char in token))
+
+
+def _one_edit_apart(a, b):
+    """
+    Whether two different tokens are a typo of each other: one insertion,
+    deletion, substitution or adjacent transposition.
+
+    Tokens shorter than four characters and tokens with different first
+    letters are never typos of each other; those are nearly always different
+    words ("fan"/"pan", "pump"/"dump", "high"/"nigh").
+    """
+    if min(len(a), len(b)) < 4 or a[0] != b[0] or abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [idx for idx, (x, y) in enumerate(zip(a, b)) if x != y]
+        return len(diffs) == 1 or (len(diffs) == 2 and diffs[1] == diffs[0] + 1
+                                   and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]])
+    if len(a) < len(b):
+        a, b = b, a
+    idx = next((idx for idx, (x, y) in enumerate(zip(a, b)) if x != y), len(b))
+    return a[idx + 1:] == b[idx:]
+
+
+def _split_match(joined, parts):
+    """Remove from parts two tokens that concatenate to joined ("bearingfailure"); True if found."""
+    for first, second in permutations(range(len(parts)), 2):
+        if parts[first] + parts[second] == joined:
+            for idx in sorted((first, second), reverse=True):
+                del parts[idx]
+            return True
+    return False
+
+
+def token_similarity(a, b):
+    """
+    Share of characters two normalized names agree on once their tokens are aligned.
+
+    Shared tokens align exactly, a token written as one word in one name and
+    as two in the other aligns exactly, and one-edit typos (see
+    _one_edit_apart) cost one character each.
+
+    Returns:
+        Similarity in [0, 1], or 0.0 if a token of either name has no such
+        counterpart in the other (a different word, not a variant)
+    """
+    tokens_a, tokens_b = Counter(a.split()), Counter(b.split())
+    common = tokens_a & tokens_b
+    rest_a = sorted((tokens_a - common).elements(), key=len, reverse=True)
+    rest_b = sorted((tokens_b - common).elements(), key=len, reverse=True)
+    for joined, parts in ((rest_a, rest_b), (rest_b, rest_a)):
+        for token in list(joined):
+            if len(parts) >= 2 and _split_match(token, parts):
+                joined.remove(token)
+    edits = 0
+    for token in list(rest_a):
+        match = next((other for other in rest_b if _one_edit_apart(token, other)), None)
+        if match is None:
+            return 0.0
+        rest_a.remove(token)
+        rest_b.remove(match)
+        edits += 1
+    if rest_a or rest_b:
+        return 0.0
+    length = max(len(a.replace(" ", "")), len(b.replace(" ", "")))
+    return 1.0 - edits / length if length else 0.0
+
+
+def _shingle_hashes(names, shingle_size=SHINGLE_SIZE):
+    """
+    Hash the character shingles of every name, vectorized over all names.
+
+    Every name is padded with a space on each side, so names shorter than a
+    shingle still get one and word starts/ends are represented.
+
+    Returns:
+        Tuple of (hashes, owners): uint64 shingle values and the index of the
+        name each belongs to (non-decreasing)
+    """
+    encoded = [f" {name} ".encode("utf-8") for name in names]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    owner = np.repeat(np.arange(len(encoded)), lengths)
+
+    n_positions = len(buffer) - shingle_size + 1
+    if n_positions <= 0:
+        return np.array([], dtype=np.uint64), np.array([], dtype=np.int64)
+    # Keep the positions whose whole shingle lies inside one name
+    valid = owner[:n_positions] == owner[shingle_size - 1:]
+    hashes = np.zeros(n_positions, dtype=np.uint64)
+    for offset in range(shingle_size):
+        hashes = (hashes << np.uint64(8)) | buffer[offset:offset + n_positions]
+    return hashes[valid], owner[:n_positions][valid]
+
+
+def minhash_signatures(names, num_perm=DEFAULT_NUM_PERM, shingle_size=SHINGLE_SIZE, seed=0):
+    """
+    MinHash signatures of the character-shingle sets of names.
+
+    Every hash function is h(x) = (a * x + b) mod p for a Mersenne prime p;
+    the minimum per name is taken with one np.minimum.reduceat over all
+    shingles.
+
+    Returns:
+        uint32 array (names x num_perm)
+    """
+    hashes, owners = _shingle_hashes(names, shingle_size)
+    signatures = np.full((len(names), num_perm), _MERSENNE_PRIME, dtype=np.uint32)
+    if not len(hashes):
+        return signatures
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    # Reduced shingles and a are below 2^31, so a * x + b fits in 64 bits before the modulo
+    hashes %= np.uint64(_MERSENNE_PRIME)
+    starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    present = owners[starts]
+    for k in range(num_perm):
+        values = (a[k] * hashes + b[k]) % np.uint64(_MERSENNE_PRIME)
+        signatures[present, k] = np.minimum.reduceat(values, starts)
+    return signatures
+
+
+def lsh_candidate_pairs(signatures, bands=DEFAULT_BANDS, seed=0):
+    """
+    Candidate pairs of rows that agree on all rows of at least one LSH band.
+
+    Each band is hashed to one 64-bit key; rows sharing a key are linked to
+    the first row with that key and to their neighbour in sort order, which
+    connects every bucket with a linear number of pairs.
+
+    Returns:
+        Tuple of (a, b) index arrays with a < b, without duplicates
+    """
+    n, num_perm = signatures.shape
+    rows_per_band = num_perm // bands
+    if n < 2 or rows_per_band == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, 1 << 63, rows_per_band, dtype=np.uint64) | np.uint64(1)
+
+    pairs = []
+    for band in range(bands):
+        block = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        keys = (block * multipliers).sum(axis=1, dtype=np.uint64)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        same_as_previous = np.r_[False, sorted_keys[1:] == sorted_keys[:-1]]
+        if not same_as_previous.any():
+            continue
+        group_first = order[np.maximum.accumulate(np.where(same_as_previous, 0, np.arange(n)))]
+        members = np.flatnonzero(same_as_previous)
+        pairs.append((group_first[members], order[members]))
+        pairs.append((order[members - 1], order[members]))
+
+    if not pairs:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty
+    a = np.concatenate([pair[0] for pair in pairs]).astype(np.int64)
+    b = np.concatenate([pair[1] for pair in pairs]).astype(np.int64)
+    a, b = np.minimum(a, b), np.maximum(a, b)
+    keep = a != b
+    unique = np.unique(a[keep] * n + b[keep])
+    return unique // n, unique % n
+
+
+def _connected_labels(n, a, b):
+    """Label every node with the smallest index of its connected component."""
+    labels = np.arange(n)
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        previous = labels.copy()
+        np.minimum.at(labels, a, low)
+        np.minimum.at(labels, b, low)
+        # Pointer jumping until every label is a root
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def resolve_names(names, threshold=DEFAULT_THRESHOLD, weights=None, num_perm=DEFAULT_NUM_PERM,
+                  bands=DEFAULT_BANDS, seed=0, types=None):
+    """
+    Cluster names that refer to the same entity.
+
+    Args:
+        names: Node names (any hashable values; they are matched by str())
+        threshold: Minimum token_similarity of two normalized names for them
+            to be merged; their identifier tokens (see identifier_key) must
+            also be equal
+        weights: Optional weight per name; the heaviest name of a cluster is
+            its canonical name (default: the most frequent, then first seen)
+        types: Optional entity type per name (None if unknown); names with
+            different types are never merged, untyped names may join a typed
+            cluster
+        num_perm: MinHash functions per signature
+        bands: LSH bands (num_perm / bands rows each); more bands find
+            lower-similarity candidates at the cost of more verification
+
+    Returns:
+        Dictionary mapping every name that is merged into another to its canonical name
+    """
+    names = list(names)
+    if not names:
+        return {}
+    types = [None] * len(names) if types is None else list(types)
+    # A form is a normalized name with its type, so equal names of different types stay apart
+    form_ids = {}
+    form_of = np.array([form_ids.setdefault((normalize_name(name), node_type), len(form_ids))
+                        for name, node_type in zip(names, types)], dtype=np.int64)
+    forms = np.empty(len(form_ids), dtype=object)
+    forms[:] = [key for key, _ in form_ids]
+    type_ids = {None: -1}
+    form_types = np.array([type_ids.setdefault(node_type, len(type_ids)) for _, node_type in form_ids],
+                          dtype=np.int64)
+    n_forms = len(forms)
+
+    signatures = minhash_signatures(forms.tolist(), num_perm, seed=seed)
+    a, b = lsh_candidate_pairs(signatures, bands, seed)
+    # Equal forms of an untyped and a typed name are candidates too, whatever the LSH found
+    first_of_form, extra = {}, []
+    for idx, key in enumerate(forms.tolist()):
+        first = first_of_form.setdefault(key, idx)
+        if first != idx:
+            extra.append((first, idx))
+    if extra:
+        a = np.concatenate([a, np.array([pair[0] for pair in extra], dtype=np.int64)])
+        b = np.concatenate([b, np.array([pair[1] for pair in extra], dtype=np.int64)])
+    # Empty normalized names (pure punctuation) never match anything, tags must agree
+    # exactly and typed names only join names of the same type or untyped ones
+    _, identifier_codes = np.unique(np.array([identifier_key(form) for form in forms], dtype=object),
+                                    return_inverse=True)
+    identifier_codes = identifier_codes.ravel()
+    valid = ((forms[a] != "") & (forms[b] != "") & (identifier_codes[a] == identifier_codes[b])
+             & ((form_types[a] == form_types[b]) | (form_types[a] < 0) | (form_types[b] < 0)))
+    a, b = a[valid], b[valid]
+    if len(a):
+        keep = np.array([token_similarity(forms[i], forms[j]) >= threshold
+                         for i, j in zip(a.tolist(), b.tolist())], dtype=bool)
+        a, b = a[keep], b[keep]
+    cluster_of_form = _connected_labels(n_forms, a, b)
+    # An untyped name can link clusters of two types; such clusters are split
+    # again using only the links between names of the same type
+    typed = form_types >= 0
+    mixed = np.zeros(n_forms, dtype=bool)
+    if typed.any():
+        order = np.lexsort((form_types[typed], cluster_of_form[typed]))
+        clusters, kinds = cluster_of_form[typed][order], form_types[typed][order]
+        changes = np.flatnonzero((clusters[1:] == clusters[:-1]) & (kinds[1:] != kinds[:-1]))
+        mixed[np.isin(cluster_of_form, clusters[changes])] = True
+    if mixed.any():
+        strict = ~(mixed[a] & (form_types[a] != form_types[b]))
+        cluster_of_form = _connected_labels(n_forms, a[strict], b[strict])
+    cluster = cluster_of_form[form_of]
+
+    if weights is None:
+        counts = Counter(names)
+        weights = np.array([counts[name] for name in names], dtype=np.float64)
+    else:
+        weights = np.asarray(weights, dtype=np.float64)
+
+    # Heaviest (then first) name per cluster: sort by (cluster, -weight, position), take the first of each
+    order = np.lexsort((np.arange(len(names)), -weights, cluster))
+    first = np.r_[True, cluster[order][1:] != cluster[order][:-1]]
+    canonical = {}
+    for idx in order[first].tolist():
+        canonical[cluster[idx]] = names[idx]
+    mapping = {}
+    for name, label in zip(names, cluster.tolist()):
+        target = canonical[label]
+        if name != target:
+            mapping[name] = target
+    return mapping
+
+
+def merge_graph_nodes(graph, mapping):
+    """
+    Build a copy of graph with nodes merged according to mapping.
+
+    Merged nodes keep the canonical node's attributes plus an 'aliases'
+    list. Edges are remapped in bulk; parallel edges that end up between the
+    same pair keep the strongest one, and edges between two aliases of one
+    entity are dropped.
+    """
+    merged = graph.__class__()
+    aliases = {}
+    for name, target in mapping.items():
+        aliases.setdefault(target, []).append(name)
+    merged.add_nodes_from(
+        (node, dict(data, aliases=sorted(aliases[node], key=str)) if node in aliases else data)
+        for node, data in graph.nodes(data=True) if node not in mapping
+    )
+
+    edges = {}
+    for source, target, data in graph.edges(data=True):
+        new_source = mapping.get(source, source)
+        new_target = mapping.get(target, target)
+        if new_source == new_target and source != target:
+            continue
+        key = (new_source, new_target)
+        current = edges.get(key)
+        if current is None or data.get('strength', 1.0) > current.get('strength', 1.0):
+            edges[key] = data
+    merged.add_edges_from((source, target, data) for (source, target), data in edges.items())
+    return merged
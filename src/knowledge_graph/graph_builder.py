@@ -7,17 +7,33 @@ This module constructs the knowledge graph from processed data.
 """
 
 import networkx as nx
+import numpy as np
 import json
 import matplotlib.pyplot as plt
 from pathlib import Path
 import os
 
+try:
+    from .relationship_batch import RelationshipBatch
+    from .entity_resolution import DEFAULT_THRESHOLD, merge_graph_nodes, resolve_names
+    from .schema.ontology import DEFAULT_ONTOLOGY
+    from .node_store import NodeStore
+except ImportError:
+    from relationship_batch import RelationshipBatch
+    from entity_resolution import DEFAULT_THRESHOLD, merge_graph_nodes, resolve_names
+    from schema.ontology import DEFAULT_ONTOLOGY
+    from node_store import NodeStore
+
 
 class KnowledgeGraphBuilder:
     """Build and analyze knowledge graphs for root cause analysis."""
     
-    def __init__(self, config_path=None):
-        """Initialize with optional configuration file."""
+    def __init__(self, config_path=None, ontology=None):
+        """Initialize with optional configuration file.
+        
+        ontology is an Ontology (or True for DEFAULT_ONTOLOGY) that
+        build_graph validates relationships against; None disables checks.
+        """
         self.config = {}
         if config_path:
             with open(config_path, 'r') as f:
@@ -29,15 +45,68 @@ class KnowledgeGraphBuilder:
         self.output_dir = self.config.get('output_dir',
                                          '../../../data/knowledge_graph')
         self.graph = nx.DiGraph()
+        # Columnar node types and properties with secondary indexes (see find_nodes)
+        self.nodes = NodeStore(self.config.get('indexed_properties', []))
+        self.ontology = DEFAULT_ONTOLOGY if ontology is True else ontology
+        self.validation_report = None
     
     def load_relationships(self, filename):
-        """Load relationship data from processed files."""
+        """Load relationship data from processed files.
+        
+        '.npz' files written by export_for_knowledge_graph load as a
+        RelationshipBatch; JSON files load as a list of dictionaries.
+        """
         file_path = Path(self.data_dir) / filename
+        if file_path.suffix.lower() == '.npz':
+            return RelationshipBatch.load(file_path)
         with open(file_path, 'r') as f:
             return json.load(f)
     
-    def build_graph(self, relationships):
-        """Build the knowledge graph from relationships."""
+    def build_graph(self, relationships, node_types=None, node_properties=None):
+        """Build the knowledge graph from relationships.
+        
+        relationships may be a list of relationship dictionaries or a
+        RelationshipBatch, whose edges are added in one bulk call.
+        node_types optionally maps node names to entity types (also stored
+        as the nodes' 'type' attribute) and node_properties node names to
+        property dictionaries; both go to the indexed node store
+        (self.nodes). If the builder has an ontology, the relationships are
+        validated against it first, using the types of new and existing
+        nodes: violating relationships are skipped and listed in
+        self.validation_report. Property values the node store rejects (a
+        non-number for a range-indexed property) raise ValueError before the
+        graph is changed.
+        """
+        if node_properties:
+            properties = {}
+            for values in node_properties.values():
+                for prop, value in values.items():
+                    properties.setdefault(prop, []).append(value)
+            self.nodes.check_properties(properties)
+        
+        if isinstance(relationships, RelationshipBatch):
+            used = np.unique(np.concatenate([relationships.source, relationships.target]))
+            names = relationships.nodes[used].tolist()
+        else:
+            relationships = list(relationships)
+            names = list(dict.fromkeys(node for rel in relationships for node in (rel['source'], rel['target'])))
+        
+        if self.ontology is not None:
+            types = self.nodes.types_of(names)
+            types.update(node_types or {})
+            self.validation_report = self.ontology.validate(relationships, types)
+            if len(self.validation_report):
+                if isinstance(relationships, RelationshipBatch):
+                    relationships = self.validation_report.valid_batch()
+                else:
+                    relationships = [rel for rel, valid in
+                                     zip(relationships, self.validation_report.valid.tolist()) if valid]
+        
+        if isinstance(relationships, RelationshipBatch):
+            self.graph.add_edges_from(relationships.iter_edges())
+            self._update_nodes(names, node_types, node_properties)
+            return self.graph
+        
         for rel in relationships:
             source = rel['source']
             target = rel['target']
@@ -57,10 +126,66 @@ class KnowledgeGraphBuilder:
                 metadata=rel.get('metadata', {})
             )
         
+        self._update_nodes(names, node_types, node_properties)
         return self.graph
     
-    def analyze_graph(self):
-        """Perform graph analysis for root cause identification."""
+    def _update_nodes(self, names, node_types, node_properties):
+        """Add the nodes in the graph to the node store, with their types and properties.
+        
+        Types and properties are also set as graph node attributes, so
+        export_graph writes them out.
+        """
+        node_types = {node: node_type for node, node_type in (node_types or {}).items() if node in self.graph}
+        node_properties = {node: values for node, values in (node_properties or {}).items()
+                           if node in self.graph}
+        for node, node_type in node_types.items():
+            self.graph.nodes[node]['type'] = node_type
+        for node, values in node_properties.items():
+            self.graph.nodes[node].update((prop, value) for prop, value in values.items() if value is not None)
+        names = [node for node in dict.fromkeys([*names, *node_types, *node_properties]) if node in self.graph]
+        properties = sorted({prop for values in node_properties.values() for prop in values})
+        self.nodes.upsert(names, [node_types.get(node) for node in names], {
+            prop: [node_properties.get(node, {}).get(prop) for node in names] for prop in properties
+        })
+    
+    def find_nodes(self, node_type=None, prefix=None, ranges=None):
+        """Names of the nodes with an entity type, a name prefix and/or property ranges.
+        
+        Answered from the node store's secondary indexes, e.g.
+        find_nodes('Symptom', prefix='bearing', ranges={'mtbf_hours': (0, 500)})
+        (ranges need the property in the 'indexed_properties' configuration).
+        """
+        return self.nodes.select(node_type, prefix, ranges)
+    
+    def resolve_entities(self, threshold=DEFAULT_THRESHOLD):
+        """
+        Merge nodes whose names refer to the same entity ("Pump P-101", "pump p101", "P-101 pump").
+        
+        Candidates come from MinHash/LSH over the node names and are verified
+        token by token (see entity_resolution); nodes whose stored entity
+        types differ are never merged. Within each cluster the node with the
+        highest degree keeps its name and the others become its 'aliases'.
+        
+        Returns:
+            Dictionary mapping every merged node name to its canonical name
+        """
+        nodes = list(self.graph.nodes)
+        degrees = [self.graph.degree(node) for node in nodes]
+        types = self.nodes.types_of(nodes)
+        mapping = resolve_names(nodes, threshold, weights=degrees,
+                                types=[types.get(node) for node in nodes])
+        if mapping:
+            self.graph = merge_graph_nodes(self.graph, mapping)
+            self.nodes.remove(mapping)
+        return mapping
+    
+    def analyze_graph(self, candidate_type=None, candidate_ranges=None):
+        """Perform graph analysis for root cause identification.
+        
+        candidate_type and candidate_ranges restrict the root cause
+        candidates to the nodes find_nodes returns for them, e.g.
+        analyze_graph('RootCause', {'mtbf_hours': (0, 500)}).
+        """
         analysis = {}
         
         # Centrality measures
@@ -80,8 +205,12 @@ class KnowledgeGraphBuilder:
             analysis['communities'] = []
         
         # Potential root cause candidates (nodes with high out-degree)
+        scores = analysis['out_degree_centrality']
+        if candidate_type is not None or candidate_ranges:
+            allowed = self.find_nodes(candidate_type, ranges=candidate_ranges)
+            scores = {node: scores[node] for node in allowed if node in scores}
         sorted_nodes = sorted(
-            analysis['out_degree_centrality'].items(), 
+            scores.items(), 
             key=lambda x: x[1], 
             reverse=True
         )
@@ -139,8 +268,11 @@ class KnowledgeGraphBuilder:
         # Convert NetworkX graph to dictionary
         data = nx.node_link_data(self.graph)
         
-        with open(output_path, 'w') as f:
+        # Write then rename, so readers watching the file never see it half-written
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_path, output_path)
         
         return output_path
 
@@ -148,8 +280,9 @@ class KnowledgeGraphBuilder:
 if __name__ == "__main__":
     # Example usage
     builder = KnowledgeGraphBuilder()
-    # relationships = builder.load_relationships("relationships.json")
+    # relationships = builder.load_relationships("relationships.json")  # or .npz
     # graph = builder.build_graph(relationships)
+    # builder.resolve_entities()
     # analysis = builder.analyze_graph()
     # builder.visualize_graph()
     # builder.export_graph()
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Dictionary-based entity extraction for maintenance text.
+A vocabulary of equipment, component and symptom terms (with synonyms) is
+compiled once into an Aho-Corasick automaton over word tokens. Text is then
+tagged in a single left-to-right pass, keeping the leftmost-longest
+non-overlapping matches. The compiled automaton is a set of flat integer
+arrays, saved as an .npz file so it does not have to be rebuilt for every
+run, and memory-mapped when loaded through the model registry.
+"""
+
+import csv
+import json
+import os
+import re
+import sys
+import unicodedata
+from bisect import bisect_left
+from collections import deque
+from itertools import accumulate
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from ..model_registry import load_npz
+except (ImportError, ValueError):
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from model_registry import load_npz
+
+
+# Terms and text are split into word tokens, so matches always start and end
+# on word boundaries and "O-ring", "o ring" and "O RING" are the same term.
+TOKEN_PATTERN = re.compile(r"\w+")
+_SPLIT_PATTERN = re.compile(r"(\w+)")
+
+# Automaton arrays scanned through memoryviews (see DictionaryEntityExtractor._set_tables)
+_SCAN_TABLES = ('root_next', 'child_ptr', 'child_token', 'child_state', 'fail', 'depth',
+                'state_entity', 'match', 'next_match')
+
+
+def normalize_term(term):
+    """Normalize a vocabulary term to its tuple of lowercase word tokens."""
+    return tuple(TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", term).lower()))
+
+
+def _pack_strings(strings):
+    """Encode strings as one UTF-8 byte buffer and an array of end offsets."""
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = np.cumsum([len(data) for data in encoded], dtype=np.int64)
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(buffer, offsets):
+    """Inverse of _pack_strings."""
+    data = buffer.tobytes()
+    ends = offsets.tolist()
+    return [data[start:end].decode('utf-8') for start, end in zip([0] + ends[:-1], ends)]
+
+
+def load_vocabulary(path):
+    """
+    Read vocabulary entries from a JSON or CSV file.
+
+    JSON files hold a list of {'term', 'type', 'canonical', 'synonyms'}
+    objects. CSV files have term, type, canonical and synonyms columns, with
+    synonyms separated by '|'. Only term is required.
+
+    Returns:
+        List of entry dictionaries
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        entries = []
+        for row in csv.DictReader(f):
+            synonyms = row.get('synonyms') or ''
+            row['synonyms'] = [s.strip() for s in synonyms.split('|') if s.strip()]
+            entries.append(row)
+        return entries
+
+
+class DictionaryEntityExtractor:
+    """
+    Tag known entities in text with a compiled Aho-Corasick automaton.
+
+    Typical use:
+        extractor = DictionaryEntityExtractor()
+        extractor.add_terms(load_vocabulary("vocabulary.csv"))
+        extractor.save("vocabulary.npz")
+        ...
+        extractor = DictionaryEntityExtractor.load("vocabulary.npz")
+        entities = extractor.extract("Replaced mech seal on centrifugal pump P-101")
+    """
+
+    # Layout of the saved arrays; checked on load and recorded by the model registry
+    FORMAT_VERSION = 1
+
+    def __init__(self, entries=None):
+        """Create an extractor, optionally adding vocabulary entries right away."""
+        self._terms = {}
+        self.entity_names = []
+        self.entity_types = []
+        self._entity_index = {}
+        self._tables = None
+        self._compiled = False
+        if entries:
+            self.add_terms(entries)
+
+    def _ensure_vocabulary(self):
+        """Rebuild the term dictionary of a loaded extractor; only needed to add terms."""
+        if self._terms is not None:
+            return
+        tables = self._tables
+        tokens = np.array(_unpack_strings(tables['tokens_buffer'], tables['tokens_offsets']), dtype=object)
+        term_tokens = tokens[tables['term_tokens']].tolist()
+        term_ends = np.cumsum(tables['term_lengths']).tolist()
+        term_starts = [0] + term_ends[:-1]
+        self._terms = {tuple(term_tokens[start:end]): entity for start, end, entity
+                       in zip(term_starts, term_ends, tables['term_entity'].tolist())}
+        self._entity_index = {key: idx for idx, key in enumerate(zip(self.entity_names, self.entity_types))}
+
+    def add_term(self, term, entity_type='entity', canonical=None, synonyms=()):
+        """
+        Add a term, and any synonyms, for one entity.
+
+        All forms of the entity match as canonical (default: term). When two
+        entities claim the same normalized form, the first one keeps it.
+
+        Returns:
+            Entity id of the canonical name
+        """
+        self._ensure_vocabulary()
+        canonical = canonical or term
+        key = (canonical, entity_type)
+        entity = self._entity_index.get(key)
+        if entity is None:
+            entity = len(self.entity_names)
+            self._entity_index[key] = entity
+            self.entity_names.append(canonical)
+            self.entity_types.append(entity_type)
+        for form in (term, canonical, *synonyms):
+            tokens = normalize_term(form)
+            if tokens:
+                self._terms.setdefault(tokens, entity)
+        self._compiled = False
+        return entity
+
+    def add_terms(self, entries):
+        """Add vocabulary entries ({'term', 'type', 'canonical', 'synonyms'} dictionaries)."""
+        for entry in entries:
+            self.add_term(entry['term'], entry.get('type') or 'entity',
+                          entry.get('canonical') or None, entry.get('synonyms') or ())
+        return self
+
+    def __len__(self):
+        """Number of distinct normalized term forms in the vocabulary."""
+        if self._terms is None:
+            return len(self._tables['term_entity'])
+        return len(self._terms)
+
+    def compile(self):
+        """
+        Build the automaton from the vocabulary.
+
+        States are trie nodes over token ids. For every state the failure
+        link (longest proper suffix that is also a trie node), the entity of
+        the longest term ending there and a link to the next shorter term
+        ending there are precomputed, so scanning never walks the trie twice.
+        """
+        self._ensure_vocabulary()
+        token_ids = {}
+        goto = [{}]
+        depth = [0]
+        terminal = [-1]
+        for tokens, entity in self._terms.items():
+            state = 0
+            for token in tokens:
+                token_id = token_ids.setdefault(token, len(token_ids))
+                next_state = goto[state].get(token_id)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][token_id] = next_state
+                    goto.append({})
+                    depth.append(depth[state] + 1)
+                    terminal.append(-1)
+                state = next_state
+            terminal[state] = entity
+
+        n_states = len(goto)
+        fail = [0] * n_states
+        # Nearest state on the failure chain (itself included) that ends a term
+        match = [state if terminal[state] >= 0 else -1 for state in range(n_states)]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token_id, child in goto[state].items():
+                link = fail[state]
+                while link and token_id not in goto[link]:
+                    link = fail[link]
+                target = goto[link].get(token_id, 0)
+                fail[child] = target if target != child else 0
+                if match[child] < 0:
+                    match[child] = match[fail[child]]
+                queue.append(child)
+
+        # Children of each non-root state sorted by token id (CSR layout); the
+        # root, where most transitions start, gets a dense table indexed by token id
+        n_children = [0] + [len(edges) for edges in goto[1:]]
+        children = [sorted(edges.items()) for edges in goto[1:]]
+        root_next = np.zeros(max(len(token_ids), 1), dtype=np.int32)
+        root_next[list(goto[0].keys())] = list(goto[0].values())
+        tables = {
+            'root_next': root_next,
+            'child_ptr': np.concatenate([[0], np.cumsum(n_children)]).astype(np.int64),
+            'child_token': np.array([token for edges in children for token, _ in edges], dtype=np.int32),
+            'child_state': np.array([child for edges in children for _, child in edges], dtype=np.int32),
+            'fail': fail,
+            'depth': depth,
+            'state_entity': terminal,
+            'match': match,
+            'next_match': [match[fail[state]] if terminal[state] >= 0 else -1 for state in range(n_states)],
+            'term_tokens': np.fromiter((token_ids[token] for tokens in self._terms for token in tokens),
+                                       dtype=np.int32),
+            'term_lengths': np.fromiter(map(len, self._terms), dtype=np.int32, count=len(self._terms)),
+            'term_entity': np.fromiter(self._terms.values(), dtype=np.int32, count=len(self._terms))
+        }
+        for name in ('fail', 'depth', 'state_entity', 'match', 'next_match'):
+            tables[name] = np.array(tables[name], dtype=np.int32)
+        for name, strings in (('tokens', sorted(token_ids, key=token_ids.get)), ('entity_names', self.entity_names),
+                              ('entity_types', self.entity_types)):
+            tables[f'{name}_buffer'], tables[f'{name}_offsets'] = _pack_strings(strings)
+        self._token_ids = token_ids
+        self._set_tables(tables)
+        return self
+
+    def _set_tables(self, tables):
+        """
+        Install compiled (or loaded, possibly memory-mapped) automaton arrays.
+
+        Scanning indexes the arrays through memoryviews, which return plain
+        ints as fast as list indexing without copying the arrays.
+        """
+        self._tables = tables
+        for name in _SCAN_TABLES:
+            # Arrays read from .npy headers have explicit byte-order formats ('<i'),
+            # which memoryviews cannot index; recast to the native format
+            array = np.ascontiguousarray(tables[name])
+            setattr(self, f'_{name}', memoryview(array).cast('B').cast(array.dtype.char))
+        self._compiled = True
+
+    def _ensure_compiled(self):
+        if not self._compiled:
+            self.compile()
+
+    def _scan(self, token_ids):
+        """Run the automaton over token ids; return (end position, state) for every state ending a term."""
+        root_next, child_ptr, fail, match = self._root_next, self._child_ptr, self._fail, self._match
+        child_token, child_state = self._child_token, self._child_state
+        hits = []
+        state = 0
+        for pos, token_id in enumerate(token_ids):
+            if token_id is None:
+                # Unknown tokens never occur in a term, so every partial match is lost
+                state = 0
+                continue
+            while state:
+                low, high = child_ptr[state], child_ptr[state + 1]
+                idx = bisect_left(child_token, token_id, low, high)
+                if idx < high and child_token[idx] == token_id:
+                    state = child_state[idx]
+                    break
+                state = fail[state]
+            else:
+                state = root_next[token_id]
+            if match[state] >= 0:
+                hits.append((pos, state))
+        return hits
+
+    def _resolve(self, hits):
+        """Leftmost-longest, non-overlapping (start, end, entity) token spans from scan hits."""
+        match, next_match = self._match, self._next_match
+        depth, state_entity = self._depth, self._state_entity
+        candidates = []
+        for end, state in hits:
+            terminal = match[state]
+            while terminal >= 0:
+                candidates.append((end - depth[terminal] + 1, -depth[terminal], terminal))
+                terminal = next_match[terminal]
+        candidates.sort()
+        spans = []
+        last_end = -1
+        for start, neg_length, terminal in candidates:
+            if start > last_end:
+                last_end = start - neg_length - 1
+                spans.append((start, last_end, state_entity[terminal]))
+        return spans
+
+    def iter_spans(self, text):
+        """
+        Yield (start, end, entity_id) character spans of the entities in text.
+
+        Matching is case-insensitive on word tokens; among overlapping
+        matches the leftmost, then the longest, wins.
+        """
+        self._ensure_compiled()
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Rare characters whose lowercase form has a different length: keep offsets exact
+            lowered = "".join(char.lower()[0] if char.lower() else char for char in text)
+        # Alternating separator / token pieces, so offsets come from their lengths
+        pieces = _SPLIT_PATTERN.split(lowered)
+        lookup = self._token_ids.get
+        hits = self._scan([lookup(token) for token in pieces[1::2]])
+        if not hits:
+            return
+        offsets = list(accumulate(map(len, pieces)))
+        for start, end, entity in self._resolve(hits):
+            yield offsets[2 * start], offsets[2 * end + 1], entity
+
+    def extract(self, text):
+        """
+        Tag entities in text.
+
+        Returns:
+            List of dictionaries with 'text' (as written), 'start' and 'end'
+            character offsets, 'entity' (canonical name) and 'type'
+        """
+        return [
+            {
+                'text': text[start:end],
+                'start': start,
+                'end': end,
+                'entity': self.entity_names[entity],
+                'type': self.entity_types[entity]
+            }
+            for start, end, entity in self.iter_spans(text)
+        ]
+
+    def extract_documents(self, texts):
+        """Yield the extract() result for every text in an iterable."""
+        for text in texts:
+            yield self.extract(text)
+
+    def save(self, path):
+        """
+        Write the compiled automaton to an .npz file, atomically.
+
+        Everything is stored as flat integer arrays (strings as one UTF-8
+        buffer plus offsets), alongside the normalized vocabulary so more
+        terms can be added after loading.
+        """
+        self._ensure_compiled()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, format_version=np.array(self.FORMAT_VERSION), **self._tables)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap_mode=None):
+        """
+        Load an automaton written by save(); it scans without recompiling.
+
+        Args:
+            path: .npz file
+            mmap_mode: 'r' to memory-map the automaton arrays (shared between
+                processes) instead of reading them into memory
+
+        Raises:
+            ValueError: The file was written with a different array layout
+        """
+        tables = load_npz(path, mmap_mode)
+        version = int(tables.pop('format_version', 0))
+        if version != cls.FORMAT_VERSION:
+            raise ValueError(f"{path} has automaton format {version}, expected {cls.FORMAT_VERSION}; "
+                             f"recompile the vocabulary")
+        extractor = cls()
+        tokens = _unpack_strings(tables['tokens_buffer'], tables['tokens_offsets'])
+        extractor._token_ids = {token: idx for idx, token in enumerate(tokens)}
+        extractor.entity_names = _unpack_strings(tables['entity_names_buffer'], tables['entity_names_offsets'])
+        extractor.entity_types = _unpack_strings(tables['entity_types_buffer'], tables['entity_types_offsets'])
+        # The term dictionary is only rebuilt if terms are added (_ensure_vocabulary)
+        extractor._terms = None
+        extractor._set_tables(tables)
+        return extractor
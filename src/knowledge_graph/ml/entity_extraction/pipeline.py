@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Batch entity extraction over unstructured documents.
+Documents are streamed from disk in fixed-size batches and fanned out to a
+process pool; every worker memory-maps the compiled extractor once (so the
+automaton pages are shared) and writes the mentions of each batch to its own
+shard (NDJSON or columnar .npz). The extractor is a compiled .npz file or
+a model resolved by name through a ModelRegistry. A
+checkpoint records finished batches, so an interrupted run resumes where it
+left off instead of starting over.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .extractor import DictionaryEntityExtractor
+    from ..model_registry import ModelRegistry
+except (ImportError, ValueError):
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from extractor import DictionaryEntityExtractor
+    from model_registry import ModelRegistry
+
+
+TEXT_SUFFIXES = (".txt", ".md")
+RECORD_SUFFIXES = (".ndjson", ".jsonl")
+SHARD_FORMATS = ("ndjson", "npz")
+DEFAULT_BATCH_SIZE = 1000
+
+# Extractor loaded once per worker process by _init_extraction_worker
+_worker_extractor = None
+
+
+def _write_json_atomic(data, path):
+    """Write JSON to a temporary file and move it into place."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def list_input_files(inputs):
+    """Expand files and directories (searched recursively) into a sorted list of document files."""
+    files = []
+    for path in map(Path, inputs):
+        if path.is_dir():
+            files.extend(p for p in path.rglob("*")
+                         if p.is_file() and p.suffix.lower() in TEXT_SUFFIXES + RECORD_SUFFIXES)
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def iter_documents(inputs, line_documents=False, id_field='id', text_field='text'):
+    """
+    Stream (doc_id, text) pairs from text and NDJSON files.
+
+    Text files are one document each (document id: the file path), or one
+    document per non-empty line with line_documents=True (id: "path:line").
+    NDJSON/JSONL files hold one record per line; id_field and text_field
+    name the record keys (a missing id falls back to "path:line").
+    """
+    for path in list_input_files(inputs):
+        suffix = path.suffix.lower()
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            if suffix in RECORD_SUFFIXES:
+                for line_number, line in enumerate(f, 1):
+                    if line.strip():
+                        record = json.loads(line)
+                        doc_id = record.get(id_field, f"{path}:{line_number}")
+                        yield str(doc_id), record.get(text_field) or ""
+            elif line_documents:
+                for line_number, line in enumerate(f, 1):
+                    if line.strip():
+                        yield f"{path}:{line_number}", line.rstrip("\n")
+            else:
+                yield str(path), f.read()
+
+
+def iter_batches(documents, batch_size=DEFAULT_BATCH_SIZE):
+    """Group a document stream into (batch index, [(doc_id, text), ...]) batches."""
+    batch = []
+    index = 0
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield index, batch
+            batch = []
+            index += 1
+    if batch:
+        yield index, batch
+
+
+def shard_path(output_dir, index, shard_format):
+    """Path of the shard holding batch index."""
+    return Path(output_dir) / f"mentions-{index:06d}.{shard_format}"
+
+
+def extract_batch(extractor, index, documents, output_dir, shard_format='ndjson'):
+    """
+    Extract the mentions of one batch and write them to its shard, atomically.
+
+    Returns:
+        Dictionary with the batch index and its document and mention counts
+    """
+    path = shard_path(output_dir, index, shard_format)
+    tmp_path = f"{path}.tmp"
+    mentions = 0
+    if shard_format == 'ndjson':
+        names, types = extractor.entity_names, extractor.entity_types
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for doc_id, text in documents:
+                for start, end, entity in extractor.iter_spans(text):
+                    f.write(json.dumps({
+                        'doc_id': doc_id,
+                        'start': start,
+                        'end': end,
+                        'text': text[start:end],
+                        'entity': names[entity],
+                        'type': types[entity]
+                    }) + "\n")
+                    mentions += 1
+    else:
+        doc_ids, doc, starts, ends, entities = [], [], [], [], []
+        for doc_id, text in documents:
+            spans = list(extractor.iter_spans(text))
+            if spans:
+                doc.extend([len(doc_ids)] * len(spans))
+                doc_ids.append(doc_id)
+                for start, end, entity in spans:
+                    starts.append(start)
+                    ends.append(end)
+                    entities.append(entity)
+        mentions = len(entities)
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, doc_ids=np.array(doc_ids, dtype=str), doc=np.array(doc, dtype=np.int32),
+                     start=np.array(starts, dtype=np.int64), end=np.array(ends, dtype=np.int64),
+                     entity=np.array(entities, dtype=np.int32))
+    os.replace(tmp_path, path)
+    return {'batch': index, 'documents': len(documents), 'mentions': mentions}
+
+
+def _load_extractor(model, registry_root=None, version=None, mmap_mode=None):
+    """The extractor in a compiled .npz file, or registered as model in the registry at registry_root."""
+    if registry_root is None:
+        return DictionaryEntityExtractor.load(model, mmap_mode=mmap_mode)
+    registry = ModelRegistry(registry_root, mmap=mmap_mode is not None)
+    return registry.get(model, version, kind='entity_extractor')
+
+
+def _init_extraction_worker(model, registry_root=None, version=None):
+    global _worker_extractor
+    _worker_extractor = _load_extractor(model, registry_root, version, mmap_mode='r')
+
+
+def _extraction_worker(index, documents, output_dir, shard_format):
+    return extract_batch(_worker_extractor, index, documents, output_dir, shard_format)
+
+
+def read_mentions(output_dir):
+    """
+    Yield every mention record written by EntityExtractionPipeline, shard by shard.
+
+    Columnar shards are expanded to the same dictionaries as NDJSON shards,
+    without the 'text' field (it is not stored).
+    """
+    output_dir = Path(output_dir)
+    entity_table = None
+    for path in sorted(output_dir.glob("mentions-*")):
+        if path.suffix == '.ndjson':
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    yield json.loads(line)
+        elif path.suffix == '.npz':
+            if entity_table is None:
+                with open(output_dir / EntityExtractionPipeline.ENTITIES_FILE, 'r') as f:
+                    entity_table = json.load(f)
+            with np.load(path) as data:
+                doc_ids = data['doc_ids'].tolist()
+                for doc, start, end, entity in zip(data['doc'].tolist(), data['start'].tolist(),
+                                                   data['end'].tolist(), data['entity'].tolist()):
+                    yield {
+                        'doc_id': doc_ids[doc],
+                        'start': start,
+                        'end': end,
+                        'entity': entity_table['names'][entity],
+                        'type': entity_table['types'][entity]
+                    }
+
+
+class EntityExtractionPipeline:
+    """Run a compiled DictionaryEntityExtractor over document collections, resumably."""
+
+    CHECKPOINT_FILE = "extraction_checkpoint.json"
+    ENTITIES_FILE = "entities.json"
+
+    def __init__(self, model_path, output_dir, workers=1, batch_size=DEFAULT_BATCH_SIZE,
+                 shard_format='ndjson', registry=None, model_version=None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            model_path: Compiled extractor (.npz written by DictionaryEntityExtractor.save),
+                or the model name when a registry is given
+            output_dir: Directory for mention shards and the checkpoint
+            workers: Worker processes; 1 extracts in this process
+            batch_size: Documents per batch (and per shard)
+            shard_format: 'ndjson' (one JSON mention per line) or 'npz' (columnar)
+            registry: ModelRegistry (or its directory) to resolve model_path in
+            model_version: Registered version to require; default is the current
+                one, which is then pinned for the run and its checkpoint
+        """
+        if shard_format not in SHARD_FORMATS:
+            raise ValueError(f"Unknown shard format: {shard_format}")
+        self.model_path = str(model_path)
+        self.registry = None
+        self.model_version = None
+        if registry is not None:
+            self.registry = registry if isinstance(registry, ModelRegistry) else ModelRegistry(registry)
+            self.model_version = self.registry.entry(self.model_path, model_version,
+                                                     kind='entity_extractor')['version']
+        self.output_dir = Path(output_dir)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.shard_format = shard_format
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.checkpoint = self._load_checkpoint()
+
+    def _settings(self):
+        settings = {
+            'model_path': self.model_path,
+            'batch_size': self.batch_size,
+            'shard_format': self.shard_format
+        }
+        if self.registry is not None:
+            settings['model_version'] = self.model_version
+        return settings
+
+    def _extractor(self):
+        """The extractor used in this process."""
+        if self.registry is None:
+            return DictionaryEntityExtractor.load(self.model_path)
+        return self.registry.get(self.model_path, self.model_version, kind='entity_extractor')
+
+    def _load_checkpoint(self):
+        """
+        Load the checkpoint, or start a fresh one.
+
+        A checkpoint written with a different model, batch size or shard
+        format describes different batches, so it is rejected rather than
+        silently mixed with this run.
+        """
+        path = self.output_dir / self.CHECKPOINT_FILE
+        if not path.exists():
+            return {'settings': self._settings(), 'completed_through': -1, 'completed': [],
+                    'documents': 0, 'mentions': 0}
+        with open(path, 'r') as f:
+            checkpoint = json.load(f)
+        if checkpoint['settings'] != self._settings():
+            raise ValueError(f"{path} was written with different settings "
+                             f"{checkpoint['settings']}; use a new output directory")
+        return checkpoint
+
+    def _is_done(self, index):
+        return index <= self.checkpoint['completed_through'] or index in self._completed
+
+    def _record(self, result):
+        """Mark a batch as finished and persist the checkpoint."""
+        self._completed.add(result['batch'])
+        # Keep the checkpoint small: a contiguous prefix plus any batches finished out of order
+        while self.checkpoint['completed_through'] + 1 in self._completed:
+            self.checkpoint['completed_through'] += 1
+            self._completed.discard(self.checkpoint['completed_through'])
+        self.checkpoint['completed'] = sorted(self._completed)
+        self.checkpoint['documents'] += result['documents']
+        self.checkpoint['mentions'] += result['mentions']
+        _write_json_atomic(self.checkpoint, self.output_dir / self.CHECKPOINT_FILE)
+
+    def _write_entity_table(self, extractor):
+        _write_json_atomic({'names': extractor.entity_names, 'types': extractor.entity_types},
+                           self.output_dir / self.ENTITIES_FILE)
+
+    def run(self, inputs, line_documents=False, id_field='id', text_field='text'):
+        """
+        Extract mentions from every document under inputs (files or directories).
+
+        Batches finished by an earlier run with the same output directory are
+        skipped; their documents are still read to keep batch boundaries stable,
+        so the inputs must not change between a crash and the resumed run.
+
+        Returns:
+            Dictionary with the number of batches processed and skipped in this
+            run, and total document and mention counts
+        """
+        self._completed = set(self.checkpoint['completed'])
+        batches = iter_batches(iter_documents(inputs, line_documents, id_field, text_field),
+                               self.batch_size)
+        processed = skipped = 0
+
+        if self.workers <= 1:
+            extractor = self._extractor()
+            if self.shard_format == 'npz':
+                self._write_entity_table(extractor)
+            for index, documents in batches:
+                if self._is_done(index):
+                    skipped += 1
+                    continue
+                self._record(extract_batch(extractor, index, documents, self.output_dir,
+                                           self.shard_format))
+                processed += 1
+        else:
+            if self.shard_format == 'npz':
+                self._write_entity_table(self._extractor())
+            # Bound the batches held in memory to a couple per worker
+            max_in_flight = self.workers * 2
+            in_flight = set()
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_extraction_worker,
+                                     initargs=(self.model_path,
+                                               None if self.registry is None else str(self.registry.root),
+                                               self.model_version)) as executor:
+                for index, documents in batches:
+                    if self._is_done(index):
+                        skipped += 1
+                        continue
+                    if len(in_flight) >= max_in_flight:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._record(future.result())
+                            processed += 1
+                    in_flight.add(executor.submit(_extraction_worker, index, documents,
+                                                  str(self.output_dir), self.shard_format))
+                for future in wait(in_flight).done:
+                    self._record(future.result())
+                    processed += 1
+
+        return {
+            'processed_batches': processed,
+            'skipped_batches': skipped,
+            'documents': self.checkpoint['documents'],
+            'mentions': self.checkpoint['mentions']
+        }
+
+
+def main():
+    """Main entry point for batch entity extraction."""
+    parser = argparse.ArgumentParser(description='Extract dictionary entities from document collections')
+    parser.add_argument('inputs', nargs='+', help='Text/NDJSON files or directories to process')
+    parser.add_argument('--model', '-m', required=True,
+                        help='Compiled extractor (.npz from DictionaryEntityExtractor.save), '
+                             'or a model name with --registry')
+    parser.add_argument('--registry', help='Model registry directory to resolve --model in')
+    parser.add_argument('--model-version', help='Registered model version to require (with --registry)')
+    parser.add_argument('--output', '-o', required=True, help='Output directory for mention shards')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Documents per batch (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--format', choices=SHARD_FORMATS, default='ndjson', help='Shard format')
+    parser.add_argument('--lines', action='store_true',
+                        help='Treat every line of a text file as a separate document')
+    parser.add_argument('--id-field', default='id', help='Document id key in NDJSON records')
+    parser.add_argument('--text-field', default='text', help='Text key in NDJSON records')
+    args = parser.parse_args()
+
+    pipeline = EntityExtractionPipeline(args.model, args.output, args.workers, args.batch_size,
+                                        args.format, args.registry, args.model_version)
+    summary = pipeline.run(args.inputs, args.lines, args.id_field, args.text_field)
+    print(f"Processed {summary['processed_batches']} batches "
+          f"({summary['skipped_batches']} already done): "
+          f"{summary['documents']} documents, {summary['mentions']} mentions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lazy, memory-mapped model registry for the ML components.
+Trained models (entity-extraction automata, link predictors) are saved as
+uncompressed .npz artifacts under a models directory and listed in a JSON
+manifest with their kind, version and artifact format. Nothing is read until
+a model is first requested; its arrays are then memory-mapped straight out of
+the .npz file, so worker processes share the same pages instead of each
+holding a private copy. Loaded models are kept in an LRU cache bounded by a
+memory budget.
+"""
+
+import json
+import os
+import struct
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+
+MANIFEST_FILE = "manifest.json"
+DEFAULT_MEMORY_BUDGET = 2 << 30
+
+# Fixed part of a ZIP local file header; name and extra field lengths are its last two fields
+_ZIP_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+
+
+def load_npz(path, mmap_mode=None):
+    """
+    Load every array of an .npz file.
+
+    np.load cannot memory-map arrays inside an .npz, but np.savez stores them
+    uncompressed, so each member's data can be mapped at its offset in the
+    archive. Compressed members, object arrays, scalars and empty arrays are
+    read normally.
+
+    Args:
+        path: .npz file
+        mmap_mode: None to read everything into memory, or a np.memmap mode ('r')
+
+    Returns:
+        Dictionary of array name to array (np.memmap where mapped)
+    """
+    if mmap_mode is None:
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type == zipfile.ZIP_STORED:
+                f.seek(info.header_offset)
+                fields = _ZIP_LOCAL_HEADER.unpack(f.read(_ZIP_LOCAL_HEADER.size))
+                f.seek(info.header_offset + _ZIP_LOCAL_HEADER.size + fields[-2] + fields[-1])
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+                elif version == (2, 0):
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+                else:
+                    shape, dtype = (), np.dtype(object)
+                if shape and not dtype.hasobject and np.prod(shape) > 0:
+                    arrays[name] = np.memmap(path, dtype=dtype, mode=mmap_mode, offset=f.tell(),
+                                             shape=shape, order='F' if fortran_order else 'C')
+                    continue
+            with archive.open(info) as member:
+                arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+    return arrays
+
+
+def _model_classes():
+    """Model kinds known to the registry; imported on first use so unused ones cost nothing."""
+    try:
+        from .entity_extraction.extractor import DictionaryEntityExtractor
+        from .relationship_prediction.predictor import LinkPredictor
+    except ImportError:
+        from entity_extraction.extractor import DictionaryEntityExtractor
+        from relationship_prediction.predictor import LinkPredictor
+    return {
+        'entity_extractor': DictionaryEntityExtractor,
+        'link_predictor': LinkPredictor
+    }
+
+
+class ModelRegistry:
+    """
+    Registry of trained models under one directory.
+
+    Typical use:
+        registry = ModelRegistry("models")
+        registry.register("equipment_terms", extractor, version="2024.06")
+        ...
+        extractor = registry.get("equipment_terms")   # loaded and mapped on first use
+    """
+
+    def __init__(self, root='models', memory_budget=DEFAULT_MEMORY_BUDGET, mmap=True):
+        """
+        Create a registry; the manifest is not read until it is needed.
+
+        Args:
+            root: Directory holding the manifest and model artifacts
+            memory_budget: Bytes of artifacts kept loaded at once; least recently
+                used models are dropped beyond it (the last one loaded is always kept)
+            mmap: Memory-map artifact arrays instead of reading them into memory
+        """
+        self.root = Path(root)
+        self.memory_budget = memory_budget
+        self.mmap_mode = 'r' if mmap else None
+        self._manifest = None
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def manifest_path(self):
+        return self.root / MANIFEST_FILE
+
+    def manifest(self):
+        """The manifest ({'models': {name: entry}}), read once and then cached."""
+        with self._lock:
+            if self._manifest is None:
+                if self.manifest_path.exists():
+                    with open(self.manifest_path, 'r') as f:
+                        self._manifest = json.load(f)
+                else:
+                    self._manifest = {'models': {}}
+            return self._manifest
+
+    def reload(self):
+        """Re-read the manifest and drop every loaded model."""
+        with self._lock:
+            self._manifest = None
+            self.clear()
+
+    def names(self):
+        """Names of the registered models."""
+        return sorted(self.manifest()['models'])
+
+    def __contains__(self, name):
+        return name in self.manifest()['models']
+
+    def _write_manifest(self, manifest):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def register(self, name, model, version):
+        """
+        Save a model under name and record it in the manifest.
+
+        The artifact is written as <name>-<version>.npz, so a newer version
+        never overwrites a file that another process may still have mapped.
+
+        Returns:
+            Manifest entry for the model
+        """
+        kinds = {cls: kind for kind, cls in _model_classes().items()}
+        kind = kinds.get(type(model))
+        if kind is None:
+            raise ValueError(f"Unsupported model type: {type(model).__name__}")
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            filename = f"{name}-{version}.npz"
+            model.save(self.root / filename)
+            entry = {
+                'kind': kind,
+                'version': str(version),
+                'file': filename,
+                'format_version': type(model).FORMAT_VERSION,
+                'bytes': os.path.getsize(self.root / filename)
+            }
+            manifest = self.manifest()
+            manifest['models'][name] = entry
+            self._write_manifest(manifest)
+            self.evict(name)
+        return entry
+
+    def _entry(self, name, version=None, kind=None):
+        """Manifest entry of name, checked against the requested version and kind and the artifact on disk."""
+        entry = self.manifest()['models'].get(name)
+        if entry is None:
+            raise KeyError(f"Model not registered: {name}")
+        if version is not None and str(version) != entry['version']:
+            raise ValueError(f"Model {name} is version {entry['version']}, not {version}")
+        if kind is not None and kind != entry['kind']:
+            raise ValueError(f"Model {name} is a {entry['kind']}, not a {kind}")
+        cls = _model_classes().get(entry['kind'])
+        if cls is None:
+            raise ValueError(f"Model {name} has unknown kind: {entry['kind']}")
+        if entry['format_version'] != cls.FORMAT_VERSION:
+            raise ValueError(f"Model {name} uses artifact format {entry['format_version']}, "
+                             f"expected {cls.FORMAT_VERSION}; re-register it")
+        path = self.root / entry['file']
+        if os.path.getsize(path) != entry['bytes']:
+            raise ValueError(f"Artifact {path} changed since it was registered")
+        return entry, cls, path
+
+    def entry(self, name, version=None, kind=None):
+        """
+        Manifest entry of name ({'kind', 'version', 'file', ...}) without loading the model.
+
+        Raises:
+            KeyError: The model is not in the manifest
+            ValueError: Version, kind, artifact format or artifact size disagree with the manifest
+        """
+        with self._lock:
+            return dict(self._entry(name, version, kind)[0])
+
+    def get(self, name, version=None, kind=None):
+        """
+        The model registered under name, loaded on first use.
+
+        Args:
+            name: Registered model name
+            version: Optionally require this version
+            kind: Optionally require this kind ('entity_extractor', 'link_predictor')
+
+        Raises:
+            KeyError: The model is not in the manifest
+            ValueError: Version, kind, artifact format or artifact size disagree with the manifest
+        """
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is not None and (version is None or str(version) == cached[2]) \
+                    and (kind is None or kind == cached[3]):
+                self._cache.move_to_end(name)
+                return cached[0]
+            entry, cls, path = self._entry(name, version, kind)
+            model = cls.load(path, mmap_mode=self.mmap_mode)
+            self.evict(name)
+            self._cache[name] = (model, entry['bytes'], entry['version'], entry['kind'])
+            self._cached_bytes += entry['bytes']
+            while self._cached_bytes > self.memory_budget and len(self._cache) > 1:
+                _, (_, size, _, _) = self._cache.popitem(last=False)
+                self._cached_bytes -= size
+            return model
+
+    def loaded(self):
+        """Names of the models currently loaded, least recently used first."""
+        with self._lock:
+            return list(self._cache)
+
+    @property
+    def cached_bytes(self):
+        """Artifact bytes of the loaded models (what the memory budget is charged)."""
+        return self._cached_bytes
+
+    def evict(self, name):
+        """Drop a loaded model; its mapped pages are released once no one references it."""
+        with self._lock:
+            cached = self._cache.pop(name, None)
+            if cached is not None:
+                self._cached_bytes -= cached[1]
+
+    def clear(self):
+        """Drop every loaded model."""
+        with self._lock:
+            self._cache.clear()
+            self._cached_bytes = 0
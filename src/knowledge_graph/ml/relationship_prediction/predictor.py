@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Link prediction for missing relationships in the knowledge graph.
+Nodes are embedded with a randomized truncated SVD of the degree-normalized
+(weighted by strength) adjacency matrix: a node's source embedding describes
+its outgoing edges and its target embedding its incoming ones, so their
+inner product scores a directed edge. Target embeddings are indexed in an
+inverted-file (IVF) structure, and top-k candidate edges per node come from
+probing a few lists and scoring them in vectorized batches with argpartition
+instead of scoring every node pair.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from ...relationship_batch import RelationshipBatch
+    from ..model_registry import ModelRegistry, load_npz
+except (ImportError, ValueError):
+    sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from relationship_batch import RelationshipBatch
+    from model_registry import ModelRegistry, load_npz
+
+
+DEFAULT_DIMENSIONS = 64
+DEFAULT_PROBES = 8
+KMEANS_ITERATIONS = 10
+
+
+class _CSR:
+    """Minimal compressed sparse row matrix, enough for matrix-block products."""
+
+    def __init__(self, rows, cols, values, shape):
+        order = np.lexsort((cols, rows))
+        self.indices = cols[order]
+        self.data = values[order]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=shape[0]))])
+        self.shape = shape
+
+    def __matmul__(self, block):
+        """Dense (rows x k) product with a dense (cols x k) block."""
+        out = np.zeros((self.shape[0], block.shape[1]))
+        if not len(self.data):
+            return out
+        products = self.data[:, None] * block[self.indices]
+        nonempty = np.flatnonzero(np.diff(self.indptr))
+        out[nonempty] = np.add.reduceat(products, self.indptr[nonempty], axis=0)
+        return out
+
+
+def randomized_svd(matrix, transpose, rank, oversample=10, n_iter=4, seed=0):
+    """
+    Truncated SVD of a sparse matrix by randomized range finding (Halko et al.).
+
+    Args:
+        matrix, transpose: The matrix and its transpose, supporting @ with dense blocks
+        rank: Number of singular triplets to keep
+
+    Returns:
+        Tuple of (U, S, Vt) with rank columns / values / rows
+    """
+    rng = np.random.default_rng(seed)
+    n_cols = transpose.shape[0]
+    width = min(rank + oversample, min(matrix.shape[0], n_cols))
+    basis = matrix @ rng.normal(size=(n_cols, width))
+    for _ in range(n_iter):
+        basis, _ = np.linalg.qr(basis)
+        basis, _ = np.linalg.qr(transpose @ basis)
+        basis = matrix @ basis
+    basis, _ = np.linalg.qr(basis)
+    small = (transpose @ basis).T
+    u_small, singular_values, vt = np.linalg.svd(small, full_matrices=False)
+    return (basis @ u_small)[:, :rank], singular_values[:rank], vt[:rank]
+
+
+def _spherical_kmeans(vectors, n_clusters, n_iter=KMEANS_ITERATIONS, seed=0, batch_size=65536):
+    """Cluster L2-normalized vectors by inner product; return (centroids, assignment)."""
+    rng = np.random.default_rng(seed)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    unit = vectors / np.where(norms > 0, norms, 1.0)
+    centroids = unit[rng.choice(len(unit), n_clusters, replace=False)]
+    assignment = np.zeros(len(unit), dtype=np.int64)
+    for _ in range(n_iter):
+        for start in range(0, len(unit), batch_size):
+            assignment[start:start + batch_size] = np.argmax(
+                unit[start:start + batch_size] @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, unit)
+        lengths = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty clusters keep their previous centroid
+        centroids = np.where(lengths > 0, sums / np.where(lengths > 0, lengths, 1.0), centroids)
+    return centroids, assignment
+
+
+class LinkPredictor:
+    """
+    Predict missing directed edges from graph structure.
+
+    Typical use:
+        predictor = LinkPredictor().fit(builder.graph, edge_type='CAUSES')
+        builder.build_graph(predictor.predict(k=5))
+    """
+
+    # Layout of the saved arrays; checked on load and recorded by the model registry
+    FORMAT_VERSION = 1
+
+    def __init__(self, dimensions=DEFAULT_DIMENSIONS, n_lists=None, n_probe=DEFAULT_PROBES,
+                 oversample=10, n_iter=4, seed=0):
+        """
+        Initialize the predictor.
+
+        Args:
+            dimensions: Embedding dimensions (SVD rank)
+            n_lists: IVF lists (default: about sqrt(number of nodes))
+            n_probe: Lists searched per query; n_probe >= n_lists is exact search
+            oversample, n_iter: Randomized SVD accuracy parameters
+            seed: Random seed for the SVD and the IVF clustering
+        """
+        self.dimensions = dimensions
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.oversample = oversample
+        self.n_iter = n_iter
+        self.seed = seed
+        self.nodes = None
+        self.edge_type = None
+
+    def fit(self, graph, edge_type=None):
+        """
+        Embed the nodes of a graph and build the candidate index.
+
+        Args:
+            graph: NetworkX (Di)Graph, e.g. KnowledgeGraphBuilder.graph; edge
+                'strength' attributes are used as weights
+            edge_type: Only learn from edges of this 'type' (default: all edges);
+                also the type given to predicted edges
+        """
+        self.nodes = np.array(list(graph.nodes), dtype=object)
+        self.edge_type = edge_type
+        index = {node: idx for idx, node in enumerate(self.nodes.tolist())}
+        edges = [(index[u], index[v], float(data.get('strength', 1.0)))
+                 for u, v, data in graph.edges(data=True)
+                 if edge_type is None or data.get('type') == edge_type]
+        edges += [(v, u, w) for u, v, w in edges] if not graph.is_directed() else []
+        n = len(self.nodes)
+        sources = np.array([edge[0] for edge in edges], dtype=np.int64)
+        targets = np.array([edge[1] for edge in edges], dtype=np.int64)
+        weights = np.array([edge[2] for edge in edges], dtype=np.float64)
+
+        # D_out^-1/2 A D_in^-1/2, so hubs do not dominate the embedding
+        out_degree = np.bincount(sources, weights, minlength=n)
+        in_degree = np.bincount(targets, weights, minlength=n)
+        with np.errstate(divide='ignore'):
+            out_scale = np.where(out_degree > 0, out_degree ** -0.5, 0.0)
+            in_scale = np.where(in_degree > 0, in_degree ** -0.5, 0.0)
+        values = weights * out_scale[sources] * in_scale[targets]
+        matrix = _CSR(sources, targets, values, (n, n))
+        transpose = _CSR(targets, sources, values, (n, n))
+
+        rank = max(1, min(self.dimensions, n - 1))
+        u, singular_values, vt = randomized_svd(matrix, transpose, rank, self.oversample,
+                                                self.n_iter, self.seed)
+        root = np.sqrt(singular_values)
+        self.source_embeddings = (u * root).astype(np.float32)
+        self.target_embeddings = (vt.T * root).astype(np.float32)
+        self.edge_keys = np.unique(sources * n + targets)
+
+        # Scores of known edges calibrate predicted strengths to the [0, 1] range of build_graph
+        known_scores = np.einsum('ij,ij->i', self.source_embeddings[sources],
+                                 self.target_embeddings[targets]) if len(sources) else np.array([])
+        positive = known_scores[known_scores > 0]
+        self.score_scale = float(np.percentile(positive, 95)) if len(positive) else 1.0
+        # Nodes without outgoing (incoming) edges have no signal to predict from (to)
+        self.source_active = out_degree > 0
+        self._build_index(np.flatnonzero(in_degree > 0))
+        return self
+
+    def _build_index(self, candidates):
+        """Cluster the target embeddings of the candidate target nodes into IVF lists."""
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(candidates))))
+        n_lists = max(1, min(n_lists, len(candidates)))
+        if not len(candidates):
+            self.centroids = np.zeros((1, self.target_embeddings.shape[1]), dtype=np.float32)
+            self.list_members = candidates
+            self.list_offsets = np.zeros(2, dtype=np.int64)
+            return
+        self.centroids, assignment = _spherical_kmeans(self.target_embeddings[candidates], n_lists,
+                                                       seed=self.seed)
+        self.centroids = self.centroids.astype(np.float32)
+        self.list_members = candidates[np.argsort(assignment, kind='stable')]
+        self.list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=n_lists))])
+
+    def score(self, sources, targets):
+        """Raw scores (source . target embedding) of the given node index pairs."""
+        return np.einsum('ij,ij->i', self.source_embeddings[sources], self.target_embeddings[targets])
+
+    def _query_batch(self, queries, k, n_probe, allowed=None):
+        """Top-k (query, target, score) candidates for a batch of query node indices."""
+        n = len(self.nodes)
+        vectors = self.source_embeddings[queries]
+        n_lists = len(self.centroids)
+        if n_probe >= n_lists:
+            probes = np.broadcast_to(np.arange(n_lists), (len(queries), n_lists))
+        else:
+            probes = np.argpartition(-(vectors @ self.centroids.T), n_probe - 1, axis=1)[:, :n_probe]
+
+        # Existing out-edges are excluded after scoring, so keep enough extra per list
+        out_degree = np.searchsorted(self.edge_keys, (queries + 1) * n) - \
+            np.searchsorted(self.edge_keys, queries * n)
+        keep = k + int(out_degree.max(initial=0)) + 1
+
+        found_query, found_target, found_score = [], [], []
+        probe_query = np.repeat(np.arange(len(queries)), probes.shape[1])
+        probe_list = probes.ravel()
+        order = np.argsort(probe_list, kind='stable')
+        probe_query, probe_list = probe_query[order], probe_list[order]
+        boundaries = np.flatnonzero(np.r_[True, probe_list[1:] != probe_list[:-1], True])
+        for start, stop in zip(boundaries[:-1], boundaries[1:]):
+            list_id = probe_list[start]
+            members = self.list_members[self.list_offsets[list_id]:self.list_offsets[list_id + 1]]
+            if allowed is not None:
+                members = members[allowed[members]]
+            if not len(members):
+                continue
+            local_queries = probe_query[start:stop]
+            scores = vectors[local_queries] @ self.target_embeddings[members].T
+            if scores.shape[1] > keep:
+                top = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+                scores = np.take_along_axis(scores, top, axis=1)
+                targets = members[top]
+            else:
+                targets = np.broadcast_to(members, scores.shape)
+            found_query.append(np.repeat(local_queries, scores.shape[1]))
+            found_target.append(targets.ravel())
+            found_score.append(scores.ravel())
+
+        if not found_query:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, np.array([], dtype=np.float32)
+        query_pos = np.concatenate(found_query)
+        target = np.concatenate(found_target)
+        score = np.concatenate(found_score)
+        source = queries[query_pos]
+        # Drop self-loops and edges that already exist
+        keys = source * n + target
+        valid = (source != target) & ~np.isin(keys, self.edge_keys)
+        query_pos, source, target, score = query_pos[valid], source[valid], target[valid], score[valid]
+
+        # Top-k per query: sort by (query, -score) and keep the first k of each run
+        order = np.lexsort((-score, query_pos))
+        query_pos, source, target, score = query_pos[order], source[order], target[order], score[order]
+        run_start = np.flatnonzero(np.r_[True, query_pos[1:] != query_pos[:-1]])
+        rank = np.arange(len(query_pos)) - np.repeat(run_start, np.diff(np.r_[run_start, len(query_pos)]))
+        top = rank < k
+        return source[top], target[top], score[top]
+
+    def predict(self, k=10, sources=None, targets=None, n_probe=None, batch_size=1024,
+                min_strength=0.0):
+        """
+        Predict the top-k new outgoing edges for each source node.
+
+        Args:
+            k: Candidate edges per source node
+            sources: Node names to predict edges from (default: every node);
+                nodes without outgoing edges of the fit type are skipped
+            targets: Optional node names predicted edges must point to
+            n_probe: Lists searched per query (default: the n_probe setting)
+            batch_size: Source nodes scored per batch
+            min_strength: Drop predictions with a lower calibrated strength
+
+        Returns:
+            RelationshipBatch of predicted edges, typed as the fit edge_type
+            (or 'related'), with strength in [0, 1] (the raw score relative
+            to the 95th percentile score of known edges) and the raw score in metadata
+        """
+        if self.nodes is None:
+            raise ValueError("LinkPredictor must be fit (or loaded) before predicting")
+        index = {node: idx for idx, node in enumerate(self.nodes.tolist())}
+        queries = np.arange(len(self.nodes)) if sources is None else \
+            np.array([index[node] for node in sources], dtype=np.int64)
+        queries = queries[self.source_active[queries]]
+        allowed = None
+        if targets is not None:
+            allowed = np.zeros(len(self.nodes), dtype=bool)
+            allowed[[index[node] for node in targets]] = True
+        n_probe = n_probe or self.n_probe
+
+        found = [self._query_batch(queries[start:start + batch_size], k, n_probe, allowed)
+                 for start in range(0, len(queries), batch_size)]
+        source = np.concatenate([part[0] for part in found] + [np.array([], dtype=np.int64)])
+        target = np.concatenate([part[1] for part in found] + [np.array([], dtype=np.int64)])
+        score = np.concatenate([part[2] for part in found] + [np.array([])]).astype(np.float64)
+        strength = np.clip(score / self.score_scale, 0.0, 1.0)
+        keep = strength > min_strength
+        return RelationshipBatch.from_codes(self.nodes, source[keep], target[keep],
+                                            self.edge_type or 'related', strength[keep],
+                                            {'score': score[keep]})
+
+    def save(self, path):
+        """Save the embeddings and index to an .npz file, atomically."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, format_version=np.array(self.FORMAT_VERSION), nodes=self.nodes.astype(str),
+                     edge_type=np.array(self.edge_type or ''), source_embeddings=self.source_embeddings,
+                     target_embeddings=self.target_embeddings, edge_keys=self.edge_keys,
+                     score_scale=np.array(self.score_scale), centroids=self.centroids,
+                     list_members=self.list_members, list_offsets=self.list_offsets,
+                     source_active=self.source_active, n_probe=np.array(self.n_probe))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap_mode=None):
+        """
+        Load a predictor written by save(); it predicts without refitting.
+
+        Args:
+            path: .npz file
+            mmap_mode: 'r' to memory-map the embeddings and index (shared
+                between processes) instead of reading them into memory
+
+        Raises:
+            ValueError: The file was written with a different array layout
+        """
+        data = load_npz(path, mmap_mode)
+        version = int(data.get('format_version', 0))
+        if version != cls.FORMAT_VERSION:
+            raise ValueError(f"{path} has predictor format {version}, "
+                             f"expected {cls.FORMAT_VERSION}; refit it")
+        predictor = cls(dimensions=data['source_embeddings'].shape[1],
+                        n_lists=len(data['centroids']), n_probe=int(data['n_probe']))
+        predictor.nodes = data['nodes'].astype(object)
+        predictor.edge_type = str(data['edge_type']) or None
+        for name in ('source_embeddings', 'target_embeddings', 'edge_keys', 'centroids',
+                     'list_members', 'list_offsets', 'source_active'):
+            setattr(predictor, name, data[name])
+        predictor.score_scale = float(data['score_scale'])
+        return predictor
+
+    @classmethod
+    def from_registry(cls, registry, name, version=None):
+        """
+        The predictor registered under name, resolved through a ModelRegistry.
+
+        Args:
+            registry: ModelRegistry, or the directory of one
+            name: Registered model name
+            version: Optionally require this version
+
+        Raises:
+            KeyError: The model is not registered
+            ValueError: The model is not a link predictor, or disagrees with the manifest
+        """
+        if not isinstance(registry, ModelRegistry):
+            registry = ModelRegistry(registry)
+        return registry.get(name, version, kind='link_predictor')
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Columnar node attribute store with secondary indexes.
+Node names, entity types and properties are kept as growable NumPy columns
+indexed by a dense node id. Three kinds of secondary index answer the common
+lookups without scanning every node: a hash index from entity type to node
+ids, a sorted index over case-folded names for prefix queries, and sorted
+range indexes on chosen numeric properties. Ingest appends to the indexes;
+the sorted ones merge their pending entries on the next query.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .schema.ontology import type_key
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parent))
+    from schema.ontology import type_key
+
+
+# Sorts after every character, so [prefix, prefix + _MAX_CHAR) covers all names starting with prefix
+_MAX_CHAR = "\U0010ffff"
+
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool)
+
+
+class _Column:
+    """
+    A NumPy array that grows by doubling; data[:size] are the live rows.
+
+    Missing values are NaN in float columns and None in object columns;
+    integer columns have no such marker and keep a 'present' mask instead.
+    """
+
+    def __init__(self, dtype, fill):
+        self.fill = fill
+        self.data = np.full(16, fill, dtype=dtype)
+        self.present = np.zeros(16, dtype=bool) if self.data.dtype.kind == 'i' else None
+
+    def reserve(self, size):
+        if size > len(self.data):
+            grown = np.full(max(size, 2 * len(self.data)), self.fill, dtype=self.data.dtype)
+            grown[:len(self.data)] = self.data
+            self.data = grown
+            if self.present is not None:
+                present = np.zeros(len(grown), dtype=bool)
+                present[:len(self.present)] = self.present
+                self.present = present
+
+    def set(self, rows, values):
+        self.data[rows] = values
+        if self.present is not None:
+            self.present[rows] = True
+
+    def clear(self, row):
+        self.data[row] = self.fill
+        if self.present is not None:
+            self.present[row] = False
+
+    def has(self, row):
+        """Whether a row holds a value."""
+        if self.present is not None:
+            return bool(self.present[row])
+        value = self.data[row]
+        return value is not None and not (isinstance(value, float) and np.isnan(value))
+
+    def numbers(self, rows):
+        """float64 values of numeric rows, NaN where missing (what range indexes are keyed on)."""
+        values = self.data[rows].astype(np.float64)
+        if self.present is not None:
+            values[~self.present[rows]] = np.nan
+        return values
+
+    def as_floats(self):
+        """Switch an integer column to float64, missing values becoming NaN."""
+        self.data, self.fill, self.present = self.numbers(slice(None)), np.nan, None
+
+    def as_objects(self):
+        """Switch a numeric column to objects, missing values becoming None."""
+        missing = ~self.present if self.present is not None else np.isnan(self.data)
+        data = self.data.astype(object)
+        data[missing] = None
+        self.data, self.fill, self.present = data, None, None
+
+
+class _SortedIndex:
+    """
+    Sorted (key, node id) pairs answering range queries with searchsorted.
+
+    New entries wait in a pending buffer and are merged in with one
+    searchsorted/insert pass before the next query. Entries whose key no
+    longer matches the column (updated or removed nodes) are skipped at
+    query time and dropped at the next merge.
+    """
+
+    def __init__(self, dtype):
+        self.keys = np.array([], dtype=dtype)
+        self.ids = np.array([], dtype=np.int64)
+        self._pending = []
+        self.build_time = 0.0
+
+    def add(self, keys, ids):
+        if len(ids):
+            self._pending.append((np.asarray(keys, dtype=self.keys.dtype), np.asarray(ids, dtype=np.int64)))
+
+    def rebuild(self, keys, ids):
+        """Replace the index contents with (keys, ids), sorting them."""
+        start = time.perf_counter()
+        keys = np.asarray(keys, dtype=self.keys.dtype)
+        order = np.argsort(keys, kind='stable')
+        self.keys, self.ids = keys[order], np.asarray(ids, dtype=np.int64)[order]
+        self._pending = []
+        self.build_time += time.perf_counter() - start
+
+    def merge(self, current_keys=None):
+        """Fold pending entries in; current_keys(ids) drops entries that went stale."""
+        if not self._pending:
+            return
+        start = time.perf_counter()
+        keys = np.concatenate([keys for keys, _ in self._pending])
+        ids = np.concatenate([ids for _, ids in self._pending])
+        order = np.argsort(keys, kind='stable')
+        keys, ids = keys[order], ids[order]
+        main_keys, main_ids = self.keys, self.ids
+        if current_keys is not None:
+            fresh = current_keys(main_ids) == main_keys
+            main_keys, main_ids = main_keys[fresh], main_ids[fresh]
+        positions = np.searchsorted(main_keys, keys, side='right')
+        self.keys = np.insert(main_keys, positions, keys)
+        self.ids = np.insert(main_ids, positions, ids)
+        self._pending = []
+        self.build_time += time.perf_counter() - start
+
+    def range(self, low, high, include_high=True):
+        """(keys, ids) of the entries with low <= key <= high (or < high)."""
+        lo = 0 if low is None else np.searchsorted(self.keys, low, side='left')
+        hi = len(self.keys) if high is None else np.searchsorted(
+            self.keys, high, side='right' if include_high else 'left')
+        return self.keys[lo:hi], self.ids[lo:hi]
+
+    @property
+    def nbytes(self):
+        return self.keys.nbytes + self.ids.nbytes
+
+
+class NodeStore:
+    """
+    Typed, columnar node attributes with secondary indexes.
+
+    Typical use:
+        store = NodeStore(indexed_properties=['mtbf_hours'])
+        store.upsert(['Pump P-101', 'Seal leakage'], types=['Equipment', 'Symptom'],
+                     properties={'mtbf_hours': [8000, None]})
+        store.of_type('Symptom')            # ['Seal leakage']
+        store.with_prefix('pump')           # ['Pump P-101']
+        store.in_range('mtbf_hours', 5000)  # ['Pump P-101']
+    """
+
+    def __init__(self, indexed_properties=()):
+        """Create an empty store with range indexes on the given numeric properties."""
+        self._ids = {}
+        self._size = 0
+        self._names = _Column(object, None)
+        self._alive = _Column(bool, False)
+        self._types = _Column(np.int32, -1)
+        self.type_names = []
+        self._type_codes = {}
+        self._properties = {}
+
+        # Type code -> chunks of node ids (compacted, and cleaned of retyped or removed nodes, on query)
+        self._type_index = {}
+        self._type_build_time = 0.0
+        self._name_index = _SortedIndex(object)
+        self._range_indexes = {}
+        for name in indexed_properties:
+            self.index_property(name)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def _type_code(self, node_type):
+        key = type_key(node_type)
+        code = self._type_codes.get(key)
+        if code is None:
+            code = self._type_codes[key] = len(self.type_names)
+            self.type_names.append(node_type)
+            self._type_index[code] = []
+        return code
+
+    def upsert(self, names, types=None, properties=None):
+        """
+        Add nodes, or update the type and properties of existing ones.
+
+        Args:
+            names: Node names
+            types: Entity type per node (None entries leave the type unchanged)
+            properties: Dictionary of property name -> value per node (None
+                entries leave the value unchanged)
+
+        Returns:
+            int64 array of node ids
+
+        Raises:
+            ValueError: A range-indexed property got a non-numeric value; the
+                store is left unchanged
+        """
+        names = list(names)
+        properties = {prop: list(values) for prop, values in (properties or {}).items()}
+        self.check_properties(properties)
+        ids = np.empty(len(names), dtype=np.int64)
+        new_names = []
+        for idx, name in enumerate(names):
+            node_id = self._ids.get(name)
+            if node_id is None:
+                node_id = self._ids[name] = self._size + len(new_names)
+                new_names.append(name)
+            ids[idx] = node_id
+        if new_names:
+            start, self._size = self._size, self._size + len(new_names)
+            for column in (self._names, self._alive, self._types, *self._properties.values()):
+                column.reserve(self._size)
+            self._names.data[start:self._size] = new_names
+            self._alive.data[start:self._size] = True
+            self._name_index.add([name.casefold() for name in map(str, new_names)],
+                                 np.arange(start, self._size))
+
+        if types is not None:
+            given = [(node_id, node_type) for node_id, node_type in zip(ids.tolist(), types)
+                     if node_type is not None]
+            if given:
+                typed_ids = np.array([node_id for node_id, _ in given], dtype=np.int64)
+                codes = np.array([self._type_code(node_type) for _, node_type in given], dtype=np.int32)
+                changed = self._types.data[typed_ids] != codes
+                self._types.data[typed_ids] = codes
+                start = time.perf_counter()
+                typed_ids, codes = typed_ids[changed], codes[changed]
+                for code in np.unique(codes).tolist():
+                    self._type_index[code].append(typed_ids[codes == code])
+                self._type_build_time += time.perf_counter() - start
+
+        for prop, values in properties.items():
+            self._set_property(prop, ids, values)
+        return ids
+
+    def check_properties(self, properties):
+        """Raise ValueError if a range-indexed property in properties (name -> values) has a non-number."""
+        for prop, values in properties.items():
+            if prop in self._range_indexes:
+                for value in values:
+                    if value is not None and not _is_number(value):
+                        raise ValueError(f"Property {prop} has a range index and only takes numbers, "
+                                         f"got {value!r}")
+
+    def add(self, name, node_type=None, **properties):
+        """Add or update one node; returns its id."""
+        return int(self.upsert([name], [node_type],
+                               {prop: [value] for prop, value in properties.items()})[0])
+
+    def _set_property(self, prop, ids, values):
+        given = [(node_id, value) for node_id, value in zip(ids.tolist(), values) if value is not None]
+        if not given:
+            return
+        column = self._properties.get(prop)
+        numeric = all(_is_number(value) for _, value in given)
+        integral = numeric and all(isinstance(value, (int, np.integer)) for _, value in given)
+        if column is None:
+            if integral:
+                column = _Column(np.int64, 0)
+            else:
+                column = _Column(np.float64, np.nan) if numeric else _Column(object, None)
+            column.reserve(self._size)
+            self._properties[prop] = column
+        elif not numeric and column.data.dtype != object:
+            column.as_objects()
+        elif not integral and column.present is not None:
+            column.as_floats()
+        rows = np.array([node_id for node_id, _ in given], dtype=np.int64)
+        column.set(rows, [value for _, value in given])
+        index = self._range_indexes.get(prop)
+        if index is not None:
+            index.add(column.numbers(rows), rows)
+
+    def remove(self, names):
+        """Drop nodes; their ids are not reused and index entries are skipped from now on."""
+        for name in names:
+            node_id = self._ids.pop(name, None)
+            if node_id is not None:
+                self._alive.data[node_id] = False
+                self._types.data[node_id] = -1
+                for column in self._properties.values():
+                    column.clear(node_id)
+
+    def index_property(self, prop):
+        """Create (or rebuild) a range index on a numeric property."""
+        column = self._properties.get(prop)
+        if column is not None and column.data.dtype == object:
+            raise ValueError(f"Property {prop} is not numeric")
+        index = _SortedIndex(np.float64)
+        if column is not None:
+            values = column.numbers(slice(0, self._size))
+            present = np.flatnonzero(~np.isnan(values))
+            index.rebuild(values[present], present)
+        self._range_indexes[prop] = index
+
+    def rebuild_indexes(self):
+        """Rebuild every index from the columns (normally they are maintained incrementally)."""
+        start = time.perf_counter()
+        live = np.flatnonzero(self._alive.data[:self._size])
+        codes = self._types.data[live]
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(self.type_names) + 1))
+        self._type_index = {code: [live[order][bounds[code]:bounds[code + 1]]]
+                            for code in range(len(self.type_names))}
+        self._type_build_time = time.perf_counter() - start
+        self._name_index = _SortedIndex(object)
+        self._name_index.rebuild([str(name).casefold() for name in self._names.data[live].tolist()], live)
+        for prop in list(self._range_indexes):
+            self.index_property(prop)
+
+    def get(self, name):
+        """Dictionary of a node's name, type and properties (missing values left out)."""
+        node_id = self._ids[name]
+        code = self._types.data[node_id]
+        node = {'name': name, 'type': self.type_names[code] if code >= 0 else None}
+        for prop, column in self._properties.items():
+            if column.has(node_id):
+                value = column.data[node_id]
+                node[prop] = value.item() if isinstance(value, np.generic) else value
+        return node
+
+    def names(self, ids):
+        """Node names of an id array."""
+        return self._names.data[np.asarray(ids, dtype=np.int64)].tolist()
+
+    def types_of(self, names):
+        """Dictionary of node name -> entity type for the given names that have one."""
+        types = {}
+        for name in names:
+            node_id = self._ids.get(name)
+            if node_id is not None and self._types.data[node_id] >= 0:
+                types[name] = self.type_names[self._types.data[node_id]]
+        return types
+
+    def ids_of_type(self, node_type):
+        """Sorted ids of the nodes of one entity type (hash index lookup)."""
+        code = self._type_codes.get(type_key(node_type))
+        if code is None:
+            return np.array([], dtype=np.int64)
+        chunks = self._type_index[code]
+        if len(chunks) != 1:
+            ids = np.unique(np.concatenate(chunks)) if chunks else np.array([], dtype=np.int64)
+            chunks[:] = [ids[self._types.data[ids] == code]]
+        return chunks[0][self._types.data[chunks[0]] == code]
+
+    def ids_with_prefix(self, prefix):
+        """Ids of the nodes whose name starts with prefix, case-insensitively, in name order."""
+        index = self._name_index
+        index.merge()
+        prefix = prefix.casefold()
+        _, ids = index.range(prefix, prefix + _MAX_CHAR, include_high=False)
+        return ids[self._alive.data[ids]]
+
+    def ids_in_range(self, prop, low=None, high=None):
+        """Ids of the nodes with low <= prop <= high (either bound optional), in value order."""
+        index = self._range_indexes.get(prop)
+        if index is None:
+            raise KeyError(f"No range index on property: {prop}")
+        column = self._properties.get(prop)
+        if column is None:
+            return np.array([], dtype=np.int64)
+        index.merge(column.numbers)
+        keys, ids = index.range(low, high)
+        return ids[column.numbers(ids) == keys]
+
+    def of_type(self, node_type):
+        """Names of the nodes of one entity type."""
+        return self.names(self.ids_of_type(node_type))
+
+    def with_prefix(self, prefix):
+        """Names starting with prefix (case-insensitive), sorted."""
+        return self.names(self.ids_with_prefix(prefix))
+
+    def in_range(self, prop, low=None, high=None):
+        """Names of the nodes whose numeric property lies in [low, high]."""
+        return self.names(self.ids_in_range(prop, low, high))
+
+    def select(self, node_type=None, prefix=None, ranges=None):
+        """
+        Names of the nodes matching every given condition.
+
+        Args:
+            node_type: Entity type
+            prefix: Name prefix (case-insensitive)
+            ranges: Dictionary of indexed property -> (low, high)
+        """
+        selected = None
+        conditions = []
+        if node_type is not None:
+            conditions.append(self.ids_of_type(node_type))
+        if prefix is not None:
+            conditions.append(self.ids_with_prefix(prefix))
+        for prop, (low, high) in (ranges or {}).items():
+            conditions.append(self.ids_in_range(prop, low, high))
+        for ids in conditions:
+            selected = np.unique(ids) if selected is None else np.intersect1d(selected, ids)
+        if selected is None:
+            selected = np.flatnonzero(self._alive.data[:self._size])
+        return self.names(selected)
+
+    def stats(self):
+        """
+        Index build time and memory of the store.
+
+        Returns:
+            Dictionary with the node count, cumulative build/merge seconds per
+            index and bytes per column and index (object columns count their
+            pointers plus the string objects they hold)
+        """
+        self._name_index.merge()
+        for prop, index in self._range_indexes.items():
+            index.merge(lambda ids, column=self._properties.get(prop): column.numbers(ids))
+
+        def object_bytes(values):
+            return values.nbytes + sum(sys.getsizeof(value) for value in values.tolist() if value is not None)
+
+        size = self._size
+        memory = {
+            'names': object_bytes(self._names.data[:size]),
+            'types': self._types.data[:size].nbytes + self._alive.data[:size].nbytes
+        }
+        for prop, column in self._properties.items():
+            data = column.data[:size]
+            memory[f'property.{prop}'] = object_bytes(data) if data.dtype == object else data.nbytes
+            if column.present is not None:
+                memory[f'property.{prop}'] += column.present[:size].nbytes
+        memory['type_index'] = sum(chunk.nbytes for chunks in self._type_index.values() for chunk in chunks)
+        memory['name_index'] = object_bytes(self._name_index.keys) + self._name_index.ids.nbytes
+        for prop, index in self._range_indexes.items():
+            memory[f'range_index.{prop}'] = index.nbytes
+
+        build_time = {'type_index': self._type_build_time, 'name_index': self._name_index.build_time}
+        for prop, index in self._range_indexes.items():
+            build_time[f'range_index.{prop}'] = index.build_time
+        return {'nodes': len(self), 'build_time_s': build_time, 'memory_bytes': memory}
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Columnar relationship batches.
+A RelationshipBatch holds relationships as parallel arrays (node codes for
+source and target, type codes, strengths and optional metadata
+columns) so analysis results can be handed to KnowledgeGraphBuilder in
+memory, or spilled to a compact .npz file, without per-record dicts or a
+JSON round trip.
+"""
+
+import json
+import os
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def _intern(labels):
+    """Factorize labels into (codes, unique labels)."""
+    codes, uniques = pd.factorize(pd.Series(list(labels), dtype=object), sort=False)
+    return codes.astype(np.int32), np.asarray(uniques, dtype=object)
+
+
+def _metadata_column(values):
+    """
+    Store a metadata column as int64, float64 (NaN where missing), bool or
+    object (None where missing, for strings and other non-numeric values).
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        return values.astype(np.int64)
+    if values.dtype.kind in 'fb':
+        return values.astype(np.float64) if values.dtype.kind == 'f' else values
+    column = np.empty(len(values), dtype=object)
+    column[:] = list(values)
+    return column
+
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+
+class RelationshipBatch(Sequence):
+    """
+    A batch of relationships stored column-wise.
+
+    Iterating or indexing yields the same dictionaries the rest of the
+    pipeline uses ({'source', 'target', 'type', 'strength'} plus 'metadata'
+    when present), so a batch can be used wherever a list of relationship
+    records is expected.
+
+    Attributes:
+        nodes: Object array of node names; source and target are codes into it
+        types: Object array of relationship type names
+        source, target: int32 node codes
+        type: int32 type codes
+        strength: float64 strengths
+        metadata: Dictionary of metadata column name -> array: int64 when
+            every relationship has an integer value, float64 for other
+            numbers (NaN where a relationship has no value), object for
+            non-numeric values (None where missing)
+    """
+
+    def __init__(self, nodes, source, target, types, type_codes, strength, metadata=None):
+        """Create a batch from already-encoded columns (see the from_* constructors)."""
+        self.nodes = np.asarray(nodes, dtype=object)
+        self.source = np.asarray(source, dtype=np.int32)
+        self.target = np.asarray(target, dtype=np.int32)
+        self.types = np.asarray(types, dtype=object)
+        self.type = np.asarray(type_codes, dtype=np.int32)
+        self.strength = np.asarray(strength, dtype=np.float64)
+        self.metadata = {name: _metadata_column(values) for name, values in (metadata or {}).items()}
+
+    @classmethod
+    def empty(cls):
+        """An empty batch."""
+        return cls([], [], [], [], [], [])
+
+    @classmethod
+    def from_codes(cls, nodes, source, target, rel_type, strength, metadata=None):
+        """
+        Build a batch whose endpoints are positions in a list of node names.
+
+        This is what the analysis code produces: e.g. correlated column pairs
+        as (row, col) index arrays into the DataFrame's columns.
+
+        Args:
+            nodes: Node names (e.g. DataFrame columns)
+            source, target: Integer arrays of positions in nodes
+            rel_type: One relationship type for the whole batch
+            strength: Strength array
+            metadata: Optional dictionary of metadata arrays
+        """
+        source = np.asarray(source, dtype=np.int32)
+        return cls(list(nodes), source, target, [rel_type], np.zeros(len(source), dtype=np.int32),
+                   strength, metadata)
+
+    @classmethod
+    def from_arrays(cls, sources, targets, types, strength, metadata=None):
+        """
+        Build a batch from label sequences.
+
+        Args:
+            sources, targets: Node names per relationship
+            types: Type per relationship, or one type for the whole batch
+            strength: Strength per relationship
+            metadata: Optional dictionary of metadata arrays
+        """
+        sources = list(sources)
+        node_codes, nodes = _intern(sources + list(targets))
+        if isinstance(types, str):
+            type_codes, type_names = np.zeros(len(sources), dtype=np.int32), [types]
+        else:
+            type_codes, type_names = _intern(types)
+        return cls(nodes, node_codes[:len(sources)], node_codes[len(sources):],
+                   type_names, type_codes, strength, metadata)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Build a batch from relationship dictionaries.
+
+        Metadata values are kept: integer columns stay integers, other numeric
+        columns become float64 and anything else an object column. Keys
+        outside source, target, type, strength and metadata are not kept.
+        """
+        if isinstance(records, RelationshipBatch):
+            return records
+        records = list(records)
+        columns = {}
+        for idx, rel in enumerate(records):
+            for name, value in (rel.get('metadata') or {}).items():
+                columns.setdefault(name, [None] * len(records))[idx] = value
+        metadata = {}
+        for name, values in columns.items():
+            present = [value for value in values if value is not None]
+            if len(present) == len(values) and all(_is_number(value) and isinstance(value, (int, np.integer))
+                                                  for value in present):
+                metadata[name] = np.array(values, dtype=np.int64)
+            elif all(_is_number(value) for value in present):
+                metadata[name] = np.array([np.nan if value is None else float(value) for value in values])
+            else:
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+                metadata[name] = column
+        return cls.from_arrays(
+            [rel['source'] for rel in records],
+            [rel['target'] for rel in records],
+            [rel.get('type', 'related') for rel in records],
+            [rel.get('strength', 1.0) for rel in records],
+            metadata
+        )
+
+    @classmethod
+    def concat(cls, batches):
+        """Concatenate batches, re-interning their node and type tables."""
+        batches = [cls.from_records(batch) for batch in batches]
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        metadata_names = []
+        for batch in batches:
+            metadata_names += [name for name in batch.metadata if name not in metadata_names]
+        metadata = {}
+        for name in metadata_names:
+            # Missing columns are filled with None in object columns and NaN otherwise
+            is_object = any(batch.metadata[name].dtype == object for batch in batches if name in batch.metadata)
+            fill = None if is_object else np.nan
+            metadata[name] = np.concatenate([
+                batch.metadata[name] if name in batch.metadata
+                else np.full(len(batch), fill, dtype=object if is_object else np.float64)
+                for batch in batches
+            ])
+        return cls.from_arrays(
+            np.concatenate([batch.nodes[batch.source] for batch in batches]),
+            np.concatenate([batch.nodes[batch.target] for batch in batches]),
+            np.concatenate([batch.types[batch.type] for batch in batches]),
+            np.concatenate([batch.strength for batch in batches]),
+            metadata
+        )
+
+    def __add__(self, other):
+        return RelationshipBatch.concat([self, other])
+
+    def __len__(self):
+        return len(self.strength)
+
+    def _metadata_at(self, idx):
+        metadata = {}
+        for name, values in self.metadata.items():
+            value = values[idx]
+            if value is None or (values.dtype.kind == 'f' and np.isnan(value)):
+                continue
+            metadata[name] = value.item() if isinstance(value, np.generic) else value
+        return metadata
+
+    def __getitem__(self, idx):
+        # Slices, boolean masks and index arrays select a sub-batch
+        if isinstance(idx, (slice, np.ndarray)):
+            return RelationshipBatch(self.nodes, self.source[idx], self.target[idx], self.types,
+                                     self.type[idx], self.strength[idx],
+                                     {name: values[idx] for name, values in self.metadata.items()})
+        rel = {
+            'source': self.nodes[self.source[idx]],
+            'target': self.nodes[self.target[idx]],
+            'type': self.types[self.type[idx]],
+            'strength': self.strength[idx].item()
+        }
+        metadata = self._metadata_at(idx)
+        if metadata:
+            rel['metadata'] = metadata
+        return rel
+
+    def __iter__(self):
+        sources = self.nodes[self.source].tolist()
+        targets = self.nodes[self.target].tolist()
+        types = self.types[self.type].tolist()
+        strengths = self.strength.tolist()
+        for idx in range(len(self)):
+            rel = {
+                'source': sources[idx],
+                'target': targets[idx],
+                'type': types[idx],
+                'strength': strengths[idx]
+            }
+            if self.metadata:
+                metadata = self._metadata_at(idx)
+                if metadata:
+                    rel['metadata'] = metadata
+            yield rel
+
+    def __repr__(self):
+        return f"RelationshipBatch({len(self)} relationships, {len(self.nodes)} nodes)"
+
+    def to_records(self):
+        """Convert to a list of relationship dictionaries with plain Python values."""
+        return list(self)
+
+    def iter_edges(self):
+        """Yield (source, target, attributes) tuples in the form KnowledgeGraphBuilder stores edges."""
+        sources = self.nodes[self.source].tolist()
+        targets = self.nodes[self.target].tolist()
+        types = self.types[self.type].tolist()
+        strengths = self.strength.tolist()
+        for idx in range(len(self)):
+            yield sources[idx], targets[idx], {
+                'type': types[idx],
+                'strength': strengths[idx],
+                'metadata': self._metadata_at(idx) if self.metadata else {}
+            }
+
+    def save(self, path):
+        """
+        Spill the batch to an .npz file, atomically.
+
+        Node and type names are stored as strings, object metadata columns
+        as one JSON string per relationship.
+        """
+        arrays = {
+            'nodes': self.nodes.astype(str),
+            'types': self.types.astype(str),
+            'source': self.source,
+            'target': self.target,
+            'type': self.type,
+            'strength': self.strength
+        }
+        for name, values in self.metadata.items():
+            if values.dtype == object:
+                arrays[f'metadata_json.{name}'] = np.array([json.dumps(value, default=str) for value in values],
+                                                           dtype=str)
+            else:
+                arrays[f'metadata.{name}'] = values
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Load a batch written by save()."""
+        with np.load(path) as data:
+            metadata = {}
+            for key in data.files:
+                if key.startswith('metadata.'):
+                    metadata[key[len('metadata.'):]] = data[key]
+                elif key.startswith('metadata_json.'):
+                    column = np.empty(len(data[key]), dtype=object)
+                    column[:] = [json.loads(value) for value in data[key].tolist()]
+                    metadata[key[len('metadata_json.'):]] = column
+            return cls(data['nodes'].astype(object), data['source'], data['target'],
+                       data['types'].astype(object), data['type'], data['strength'], metadata)
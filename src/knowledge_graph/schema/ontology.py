@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Ontology of the root cause analysis knowledge graph.
+Defines the entity types (Equipment, Component, Symptom, RootCause) and the
+source/target type signatures each relationship type allows. The ontology is
+compiled into integer lookup tables, so a RelationshipBatch of any size is
+validated with a few array gathers: type names are looked up once per
+distinct node and relationship type, never once per edge.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from ..relationship_batch import RelationshipBatch
+except (ImportError, ValueError):
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from relationship_batch import RelationshipBatch
+
+
+ENTITY_TYPES = ('Equipment', 'Component', 'Symptom', 'RootCause')
+
+# Relationship type -> allowed (source type, target type) pairs; '*' is any entity type
+RELATIONSHIP_SIGNATURES = {
+    'CONTAINS': [('Equipment', 'Component')],
+    'EXHIBITS': [('Equipment', 'Symptom'), ('Component', 'Symptom')],
+    'CAUSES': [('RootCause', 'Symptom')],
+    'RELATES_TO': [('*', '*')]
+}
+
+# Violation codes of ValidationReport.codes (0 is a valid edge)
+VIOLATIONS = {
+    1: 'unknown relationship type',
+    2: 'untyped source',
+    3: 'untyped target',
+    4: 'signature not allowed'
+}
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def type_key(name):
+    """Case- and separator-insensitive key of a type name ("RootCause", "root_cause", "root cause")."""
+    return _NON_ALNUM.sub("", str(name)).lower()
+
+
+class Ontology:
+    """
+    Entity types and relationship signatures, compiled for batch validation.
+
+    The compiled table `allowed` is a flat boolean array indexed by
+    (relationship, source type, target type), where entity type index
+    len(entity_types) stands for an untyped node: for non-strict validation
+    it allows whatever some type would allow in that position.
+    """
+
+    def __init__(self, entity_types=ENTITY_TYPES, signatures=None):
+        """
+        Compile an ontology.
+
+        Args:
+            entity_types: Entity type names
+            signatures: Dictionary of relationship type -> list of allowed
+                (source type, target type) pairs, '*' matching any type
+                (default: RELATIONSHIP_SIGNATURES)
+        """
+        signatures = RELATIONSHIP_SIGNATURES if signatures is None else signatures
+        self.entity_types = list(entity_types)
+        self.relationship_types = list(signatures)
+        self.signatures = {rel_type: [tuple(pair) for pair in pairs] for rel_type, pairs in signatures.items()}
+        self._entity_index = {type_key(name): idx for idx, name in enumerate(self.entity_types)}
+        self._relationship_index = {type_key(name): idx for idx, name in enumerate(self.relationship_types)}
+
+        n_types = len(self.entity_types)
+        allowed = np.zeros((len(self.relationship_types), n_types + 1, n_types + 1), dtype=bool)
+        for rel, rel_type in enumerate(self.relationship_types):
+            for source_type, target_type in self.signatures[rel_type]:
+                allowed[rel, self._type_slice(source_type), self._type_slice(target_type)] = True
+            allowed[rel, n_types, :n_types] = allowed[rel, :n_types, :n_types].any(axis=0)
+            allowed[rel, :n_types, n_types] = allowed[rel, :n_types, :n_types].any(axis=1)
+            allowed[rel, n_types, n_types] = allowed[rel, :n_types, :n_types].any()
+        self.allowed = allowed.ravel()
+
+    def _type_slice(self, name):
+        if name == '*':
+            return slice(0, len(self.entity_types))
+        code = self.entity_code(name)
+        if code < 0:
+            raise ValueError(f"Unknown entity type in signature: {name}")
+        return code
+
+    def entity_code(self, name):
+        """Index of an entity type name, or -1."""
+        return self._entity_index.get(type_key(name), -1)
+
+    def relationship_code(self, name):
+        """Index of a relationship type name, or -1."""
+        return self._relationship_index.get(type_key(name), -1)
+
+    def allows(self, rel_type, source_type, target_type):
+        """Whether one relationship type is allowed between two entity types."""
+        rel = self.relationship_code(rel_type)
+        source, target = self.entity_code(source_type), self.entity_code(target_type)
+        if min(rel, source, target) < 0:
+            return False
+        n = len(self.entity_types) + 1
+        return bool(self.allowed[(rel * n + source) * n + target])
+
+    def validate(self, relationships, node_types=None, strict=False):
+        """
+        Check every relationship against the ontology in one vectorized pass.
+
+        Args:
+            relationships: RelationshipBatch or list of relationship dictionaries
+            node_types: Dictionary of node name -> entity type name
+            strict: If False, relationship types outside the ontology (e.g.
+                data-derived 'correlated' edges) are not checked, and nodes
+                without a type match any type the signature allows. If True,
+                both are violations.
+
+        Returns:
+            ValidationReport
+        """
+        batch = RelationshipBatch.from_records(relationships)
+        node_types = node_types or {}
+        n_types = len(self.entity_types)
+        # Per distinct node and type name, not per edge
+        node_codes = np.array([self.entity_code(node_types[node]) if node in node_types else -1
+                               for node in batch.nodes.tolist()], dtype=np.int64)
+        node_codes[node_codes < 0] = n_types
+        rel_codes = np.array([self.relationship_code(name) for name in batch.types.tolist()], dtype=np.int64)
+
+        rel = rel_codes[batch.type]
+        source = node_codes[batch.source]
+        target = node_codes[batch.target]
+        known = rel >= 0
+        index = (np.where(known, rel, 0) * (n_types + 1) + source) * (n_types + 1) + target
+        if not strict:
+            conditions = [~known, ~self.allowed[index]]
+            codes = np.select(conditions, [0, 4], 0).astype(np.int8)
+        else:
+            conditions = [~known, source == n_types, target == n_types, ~self.allowed[index]]
+            codes = np.select(conditions, [1, 2, 3, 4], 0).astype(np.int8)
+        return ValidationReport(self, batch, codes, source, target)
+
+
+class ValidationReport:
+    """
+    Result of Ontology.validate.
+
+    Attributes:
+        batch: The validated RelationshipBatch
+        codes: int8 violation code per relationship (0: valid, see VIOLATIONS)
+        source_types, target_types: Entity type index per relationship
+            (len(ontology.entity_types) for untyped nodes)
+    """
+
+    def __init__(self, ontology, batch, codes, source_types, target_types):
+        self.ontology = ontology
+        self.batch = batch
+        self.codes = codes
+        self.source_types = source_types
+        self.target_types = target_types
+
+    @property
+    def valid(self):
+        """Boolean mask of the relationships that passed."""
+        return self.codes == 0
+
+    @property
+    def violations(self):
+        """Row numbers of the relationships that failed."""
+        return np.flatnonzero(self.codes)
+
+    def __len__(self):
+        """Number of violations."""
+        return int(np.count_nonzero(self.codes))
+
+    def __repr__(self):
+        return f"ValidationReport({len(self)} violations in {len(self.batch)} relationships)"
+
+    def counts(self):
+        """Dictionary of violation reason -> number of relationships."""
+        counts = np.bincount(self.codes, minlength=len(VIOLATIONS) + 1)
+        return {reason: int(counts[code]) for code, reason in VIOLATIONS.items() if counts[code]}
+
+    def valid_batch(self):
+        """The relationships that passed, as a RelationshipBatch."""
+        return self.batch[self.valid]
+
+    def records(self, limit=None):
+        """
+        One dictionary per violation: 'row', 'source', 'target', 'type',
+        'source_type' and 'target_type' (None when untyped) and 'reason'.
+        """
+        names = self.ontology.entity_types + [None]
+        rows = self.violations[:limit].tolist()
+        return [
+            dict(self.batch[row], row=row, source_type=names[self.source_types[row]],
+                 target_type=names[self.target_types[row]], reason=VIOLATIONS[int(self.codes[row])])
+            for row in rows
+        ]
+
+
+DEFAULT_ONTOLOGY = Ontology()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for the dictionary entity extractor.
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+from pathlib import Path
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.knowledge_graph.ml.entity_extraction.extractor import (DictionaryEntityExtractor,
+                                                                 load_vocabulary)
+from src.knowledge_graph.ml.entity_extraction.pipeline import (EntityExtractionPipeline,
+                                                                read_mentions)
+from src.knowledge_graph.ml.model_registry import ModelRegistry
+
+
+class TestDictionaryEntityExtractor(unittest.TestCase):
+    """Test cases for the DictionaryEntityExtractor class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = Path(__file__).parent / "test_data"
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        
+        self.vocabulary = [
+            {"term": "centrifugal pump", "type": "equipment", "synonyms": ["CF pump"]},
+            {"term": "pump", "type": "equipment"},
+            {"term": "mechanical seal", "type": "component", "synonyms": ["mech seal"]},
+            {"term": "seal", "type": "component"},
+            {"term": "O-ring", "type": "component"},
+            {"term": "high vibration", "type": "symptom", "canonical": "vibration"}
+        ]
+        self.extractor = DictionaryEntityExtractor(self.vocabulary)
+    
+    def test_longest_match_and_synonyms(self):
+        """Test that the longest term wins and synonyms map to the canonical entity."""
+        text = "Replaced MECH SEAL on Centrifugal Pump P-101 after high vibration."
+        entities = self.extractor.extract(text)
+        
+        self.assertEqual([(e['text'], e['entity'], e['type']) for e in entities], [
+            ("MECH SEAL", "mechanical seal", "component"),
+            ("Centrifugal Pump", "centrifugal pump", "equipment"),
+            ("high vibration", "vibration", "symptom")
+        ])
+        for entity in entities:
+            self.assertEqual(text[entity['start']:entity['end']], entity['text'])
+    
+    def test_word_boundaries_and_normalized_forms(self):
+        """Test that terms only match whole words, across case and punctuation variants."""
+        entities = self.extractor.extract("Pumping unit: sealant OK, o ring and O RING swapped; cf-pump")
+        
+        self.assertEqual([(e['text'], e['entity']) for e in entities], [
+            ("o ring", "O-ring"),
+            ("O RING", "O-ring"),
+            ("cf-pump", "centrifugal pump")
+        ])
+    
+    def test_overlapping_terms(self):
+        """Test that a shorter term is still found when a longer overlapping one is not taken."""
+        extractor = DictionaryEntityExtractor([{"term": "a b c"}, {"term": "b"}, {"term": "c d"}])
+        
+        self.assertEqual([e['text'] for e in extractor.extract("a b c d")], ["a b c"])
+        self.assertEqual([e['text'] for e in extractor.extract("a b d c d")], ["b", "c d"])
+    
+    def test_save_and_load(self):
+        """Test that a saved automaton loads back with the same matches and can be extended."""
+        path = self.test_data_dir / "test_vocabulary.npz"
+        self.extractor.save(path)
+        loaded = DictionaryEntityExtractor.load(path)
+        text = "cf pump mech seal leaking, o-ring worn"
+        
+        self.assertEqual(loaded.extract(text), self.extractor.extract(text))
+        self.assertEqual(len(loaded), len(self.extractor))
+        
+        loaded.add_term("leaking", "symptom")
+        self.assertEqual([e['entity'] for e in loaded.extract(text)],
+                         ["centrifugal pump", "mechanical seal", "leaking", "O-ring"])
+    
+    def test_load_vocabulary_csv(self):
+        """Test reading vocabulary entries with synonyms from CSV."""
+        path = self.test_data_dir / "test_vocabulary.csv"
+        with open(path, "w") as f:
+            f.write("term,type,canonical,synonyms\n")
+            f.write("gearbox,equipment,,gear box|GBX\n")
+        extractor = DictionaryEntityExtractor(load_vocabulary(path))
+        
+        self.assertEqual([e['entity'] for e in extractor.extract("GBX and gear box")],
+                         ["gearbox", "gearbox"])
+
+
+class TestEntityExtractionPipeline(unittest.TestCase):
+    """Test cases for the batch extraction pipeline."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "extraction"
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+        self.input_dir = self.test_data_dir / "documents"
+        os.makedirs(self.input_dir)
+        
+        self.model_path = self.test_data_dir / "model.npz"
+        DictionaryEntityExtractor([
+            {"term": "pump", "type": "equipment"},
+            {"term": "mechanical seal", "type": "component", "synonyms": ["mech seal"]},
+            {"term": "high vibration", "type": "symptom"}
+        ]).save(self.model_path)
+        
+        with open(self.input_dir / "report.txt", "w") as f:
+            f.write("Pump tripped on high vibration.\nMech seal replaced.\n")
+        self.notes = [{"id": f"WO-{i:03d}", "text": f"Pump {i} mech seal leak"} for i in range(10)]
+        self._write_notes(self.notes)
+    
+    def _write_notes(self, notes, bad_line_at=None):
+        with open(self.input_dir / "notes.ndjson", "w") as f:
+            for i, note in enumerate(notes):
+                f.write("{not json\n" if i == bad_line_at else json.dumps(note) + "\n")
+    
+    def test_ndjson_shards(self):
+        """Test that every document's mentions land in the shards."""
+        pipeline = EntityExtractionPipeline(self.model_path, self.test_data_dir / "out", batch_size=4)
+        summary = pipeline.run([self.input_dir], line_documents=True)
+        mentions = list(read_mentions(self.test_data_dir / "out"))
+        
+        self.assertEqual(summary['documents'], 12)
+        self.assertEqual(summary['processed_batches'], 3)
+        self.assertEqual(summary['mentions'], len(mentions))
+        self.assertEqual(len(mentions), 2 * 10 + 3)
+        self.assertIn({"doc_id": "WO-003", "start": 7, "end": 16, "text": "mech seal",
+                       "entity": "mechanical seal", "type": "component"}, mentions)
+    
+    def test_parallel_columnar_shards(self):
+        """Test that a process pool writing .npz shards finds the same mentions."""
+        serial = EntityExtractionPipeline(self.model_path, self.test_data_dir / "serial", batch_size=3)
+        serial.run([self.input_dir])
+        parallel = EntityExtractionPipeline(self.model_path, self.test_data_dir / "parallel", workers=2,
+                                            batch_size=3, shard_format='npz')
+        parallel.run([self.input_dir])
+        
+        expected = [{k: v for k, v in m.items() if k != 'text'}
+                    for m in read_mentions(self.test_data_dir / "serial")]
+        self.assertEqual(list(read_mentions(self.test_data_dir / "parallel")), expected)
+    
+    def test_registered_model(self):
+        """Test that a model name is resolved through the registry, in this process and in workers."""
+        registry_dir = self.test_data_dir / "models"
+        ModelRegistry(registry_dir).register("terms", DictionaryEntityExtractor.load(self.model_path),
+                                             version="1.0")
+        EntityExtractionPipeline(self.model_path, self.test_data_dir / "file", batch_size=3).run(
+            [self.input_dir])
+        serial = EntityExtractionPipeline("terms", self.test_data_dir / "serial", batch_size=3,
+                                          registry=registry_dir)
+        serial.run([self.input_dir])
+        parallel = EntityExtractionPipeline("terms", self.test_data_dir / "parallel", workers=2,
+                                            batch_size=3, registry=ModelRegistry(registry_dir),
+                                            model_version="1.0")
+        parallel.run([self.input_dir])
+        
+        expected = list(read_mentions(self.test_data_dir / "file"))
+        self.assertEqual(list(read_mentions(self.test_data_dir / "serial")), expected)
+        self.assertEqual(list(read_mentions(self.test_data_dir / "parallel")), expected)
+        self.assertEqual(serial.model_version, "1.0")
+        with self.assertRaises(ValueError):
+            EntityExtractionPipeline("terms", self.test_data_dir / "other", registry=registry_dir,
+                                     model_version="2.0")
+        with self.assertRaises(KeyError):
+            EntityExtractionPipeline("missing", self.test_data_dir / "other", registry=registry_dir)
+    
+    def test_resume_after_crash(self):
+        """Test that a rerun after a failure only processes the unfinished batches."""
+        output_dir = self.test_data_dir / "out"
+        self._write_notes(self.notes, bad_line_at=7)
+        pipeline = EntityExtractionPipeline(self.model_path, output_dir, batch_size=3)
+        with self.assertRaises(ValueError):
+            pipeline.run([self.input_dir / "notes.ndjson"])
+        
+        self._write_notes(self.notes)
+        summary = EntityExtractionPipeline(self.model_path, output_dir, batch_size=3).run(
+            [self.input_dir / "notes.ndjson"])
+        
+        self.assertEqual(summary['skipped_batches'], 2)
+        self.assertEqual(summary['processed_batches'], 2)
+        self.assertEqual(summary['documents'], 10)
+        self.assertEqual(len(list(read_mentions(output_dir))), 20)
+        with self.assertRaises(ValueError):
+            EntityExtractionPipeline(self.model_path, output_dir, batch_size=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for MinHash/LSH entity resolution.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.knowledge_graph.entity_resolution import (lsh_candidate_pairs, minhash_signatures,
+                                                   normalize_name, resolve_names, token_similarity)
+from src.knowledge_graph.graph_builder import KnowledgeGraphBuilder
+
+
+class TestEntityResolution(unittest.TestCase):
+    """Test cases for entity resolution."""
+    
+    def test_normalize_name(self):
+        """Test that case, punctuation and token order are normalized away."""
+        self.assertEqual(normalize_name("Pump P-101"), "p101 pump")
+        self.assertEqual(normalize_name("P-101  pump"), "p101 pump")
+        self.assertEqual(normalize_name("pump p101"), "p101 pump")
+    
+    def test_signatures_estimate_similarity(self):
+        """Test that signature agreement tracks shingle similarity."""
+        signatures = minhash_signatures(["bearing failure", "bearing failur", "seal leakage"],
+                                        num_perm=128)
+        
+        self.assertGreater((signatures[0] == signatures[1]).mean(), 0.6)
+        self.assertLess((signatures[0] == signatures[2]).mean(), 0.2)
+        a, b = lsh_candidate_pairs(signatures)
+        self.assertEqual(list(zip(a.tolist(), b.tolist())), [(0, 1)])
+    
+    def test_resolve_names(self):
+        """Test that variants merge into the most frequent form and distinct tags stay apart."""
+        names = ["Pump P-101", "pump p101", "P-101 pump", "Pump P-101", "Pump P-102",
+                 "Compressor C-7", "compresor C-7", "Bearing failure", "bearing-failure", "---"]
+        mapping = resolve_names(names)
+        
+        self.assertEqual(mapping, {
+            "pump p101": "Pump P-101",
+            "P-101 pump": "Pump P-101",
+            "compresor C-7": "Compressor C-7",
+            "bearing-failure": "Bearing failure"
+        })
+    
+    def test_close_but_distinct_names_stay_apart(self):
+        """Test that names differing in a real word, not a spelling, are never merged."""
+        names = ["Motor overheating", "Pump overheating", "Fan overheating",
+                 "High oil pressure", "Low oil pressure",
+                 "Valve stuck open", "Valve stuck closed",
+                 "Seal leak", "Seal leak minor", "Bearing noise", "Bearing noises"]
+        
+        self.assertEqual(resolve_names(names), {"Bearing noises": "Bearing noise"})
+        self.assertEqual(token_similarity(normalize_name("High oil pressure"),
+                                          normalize_name("Low oil pressure")), 0.0)
+        self.assertEqual(token_similarity("bearing failure", "bearingfailure"), 1.0)
+        self.assertAlmostEqual(token_similarity("c7 compressor", "c7 compresor"), 1 - 1 / 12)
+    
+    def test_types_must_agree(self):
+        """Test that names of different entity types are never merged, untyped ones may join."""
+        self.assertEqual(resolve_names(["Pump", "pump"], types=["Equipment", "Component"]), {})
+        self.assertEqual(resolve_names(["Pump", "pump"], types=["Equipment", None]), {"pump": "Pump"})
+        # An untyped name does not bridge two typed ones
+        self.assertEqual(resolve_names(["Pump", "PUMP", "pump"], types=["Equipment", None, "Component"]), {})
+    
+    def test_resolve_graph(self):
+        """Test that merging nodes remaps edges and keeps the strongest parallel edge."""
+        builder = KnowledgeGraphBuilder()
+        builder.build_graph([
+            {"source": "Pump P-101", "target": "Seal leakage", "type": "EXHIBITS", "strength": 0.6},
+            {"source": "pump p101", "target": "seal-leakage", "type": "EXHIBITS", "strength": 0.9},
+            {"source": "P-101 pump", "target": "Pump P-101", "type": "RELATES_TO", "strength": 1.0},
+            {"source": "Worn bearing", "target": "Seal leakage", "type": "CAUSES", "strength": 0.8}
+        ])
+        mapping = builder.resolve_entities()
+        graph = builder.graph
+        
+        self.assertEqual(mapping, {"pump p101": "Pump P-101", "P-101 pump": "Pump P-101",
+                                   "seal-leakage": "Seal leakage"})
+        self.assertEqual(sorted(graph.nodes), ["Pump P-101", "Seal leakage", "Worn bearing"])
+        self.assertEqual(sorted(graph.edges), [("Pump P-101", "Seal leakage"),
+                                               ("Worn bearing", "Seal leakage")])
+        self.assertEqual(graph["Pump P-101"]["Seal leakage"]["strength"], 0.9)
+        self.assertEqual(graph.nodes["Pump P-101"]["aliases"], ["P-101 pump", "pump p101"])
+    
+    def test_resolve_graph_keeps_distinct_entities(self):
+        """Test that resolution adds no false edges between opposite symptoms or different types."""
+        builder = KnowledgeGraphBuilder()
+        builder.build_graph([
+            {"source": "Low oil pressure", "target": "Bearing wear", "type": "CAUSES", "strength": 0.7},
+            {"source": "High oil pressure", "target": "Seal leak", "type": "CAUSES", "strength": 0.6},
+            {"source": "Seal", "target": "Seal leak", "type": "EXHIBITS", "strength": 0.5},
+            {"source": "SEAL", "target": "Bearing wear", "type": "EXHIBITS", "strength": 0.5}
+        ], node_types={"Seal": "Component", "SEAL": "Equipment"})
+        
+        self.assertEqual(builder.resolve_entities(), {})
+        self.assertFalse(builder.graph.has_edge("Low oil pressure", "Seal leak"))
+        self.assertEqual(builder.graph.number_of_nodes(), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for the conversion cache of the improved Excel processor.
+"""
+
+import unittest
+import importlib.util
+import os
+import json
+import pickle
+import shutil
+from pathlib import Path
+import openpyxl
+
+PROCESSOR_PATH = (Path(__file__).parent.parent / "src" / "data_processing" /
+                  "excel-to-json" / "improved-excel-processor.py")
+
+
+def load_improved_processor():
+    """Import the improved processor module, whose file name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location("improved_excel_processor", PROCESSOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+processor = load_improved_processor()
+
+
+class TestConversionCache(unittest.TestCase):
+    """Test cases for ConversionCache and cached batch processing."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "cache"
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+        self.input_dir = self.test_data_dir / "input"
+        self.output_dir = self.test_data_dir / "output"
+        self.cache_dir = self.test_data_dir / "cache"
+        os.makedirs(self.input_dir)
+        
+        for name in ("first", "second"):
+            wb = openpyxl.Workbook()
+            sheet = wb.active
+            for col, header in enumerate(["Equipment", "Failure", "Cause", "Impact"], start=1):
+                sheet.cell(row=1, column=col).value = header
+            for row in range(2, 32):
+                for col in range(1, 5):
+                    sheet.cell(row=row, column=col).value = f"{name}_{row}_{col}"
+            wb.save(self.input_dir / f"{name}.xlsx")
+    
+    def test_cache_hit_links_output(self):
+        """A second run is served from the cache without reconverting."""
+        first_results = processor.batch_process_excel_files(self.input_dir, self.output_dir,
+                                                            cache_dir=str(self.cache_dir))
+        first_output = (self.output_dir / "first.json").read_text()
+        
+        original_convert = processor.convert_hierarchical_excel
+        processor.convert_hierarchical_excel = None
+        try:
+            results = processor.batch_process_excel_files(self.input_dir, self.output_dir,
+                                                          cache_dir=str(self.cache_dir))
+        finally:
+            processor.convert_hierarchical_excel = original_convert
+        
+        self.assertEqual(results["first.xlsx"]["status"], "success")
+        self.assertEqual(results["first.xlsx"]["data_rows"],
+                         first_results["first.xlsx"]["data_rows"])
+        self.assertEqual((self.output_dir / "first.json").read_text(), first_output)
+    
+    def test_key_depends_on_config(self):
+        """Changing an output-affecting option changes the cache key."""
+        cache = processor.ConversionCache(str(self.cache_dir))
+        excel_file = str(self.input_dir / "first.xlsx")
+        
+        default_key = cache.key_for(excel_file)
+        self.assertEqual(default_key, cache.key_for(excel_file, {'metadata_max_rows': 6}))
+        self.assertEqual(default_key, cache.key_for(excel_file, {'chunk_size': 50}))
+        self.assertNotEqual(default_key, cache.key_for(excel_file, {'metadata_max_rows': 2}))
+    
+    def test_fast_path_skips_hashing(self):
+        """Unchanged size and mtime reuse the memoized content hash."""
+        cache = processor.ConversionCache(str(self.cache_dir))
+        excel_file = str(self.input_dir / "first.xlsx")
+        cache.content_hash(excel_file)
+        
+        original_hash = processor.get_file_hash
+        processor.get_file_hash = None
+        try:
+            cache.content_hash(excel_file)
+        finally:
+            processor.get_file_hash = original_hash
+    
+    def test_eviction_bounds_entries(self):
+        """Least recently used entries are evicted beyond max_entries."""
+        processor.batch_process_excel_files(self.input_dir, self.output_dir,
+                                            cache_dir=str(self.cache_dir),
+                                            cache_max_entries=1)
+        cache = processor.ConversionCache(str(self.cache_dir))
+        self.assertEqual(len(cache.entries), 1)
+        self.assertEqual(len(list(self.cache_dir.glob("*.json"))), 1)
+        
+        with open(self.output_dir / "processing_summary.json") as f:
+            summary = json.load(f)
+        self.assertEqual(len(summary), 2)
+    
+    def test_index_from_older_version_is_dropped(self):
+        """An index written before outputs gained multiple suffixes is ignored, not misread."""
+        os.makedirs(self.cache_dir)
+        with open(self.cache_dir / processor.ConversionCache.INDEX_FILE, 'wb') as f:
+            pickle.dump({'version': "1.1.0", 'fingerprints': {},
+                         'entries': {"stale": {'rows': 1}}}, f)
+        cache = processor.ConversionCache(str(self.cache_dir))
+        self.assertEqual(cache.entries, {})
+        
+        results = processor.batch_process_excel_files(self.input_dir, self.output_dir,
+                                                      cache_dir=str(self.cache_dir))
+        self.assertEqual(results["first.xlsx"]["status"], "success")
+    
+    def test_version_change_removes_artifacts(self):
+        """Artifacts of a discarded index are deleted; live ones and unrelated files are kept."""
+        processor.batch_process_excel_files(self.input_dir, self.output_dir,
+                                            cache_dir=str(self.cache_dir))
+        artifacts = [path for path in self.cache_dir.iterdir()
+                     if processor.ConversionCache.ARTIFACT_RE.match(path.name)]
+        self.assertTrue(artifacts)
+        (self.cache_dir / "notes.txt").write_text("not a cache artifact")
+        
+        cache = processor.ConversionCache(str(self.cache_dir))
+        self.assertEqual(cache._remove_orphans(), 0)
+        
+        with open(self.cache_dir / processor.ConversionCache.INDEX_FILE, 'rb') as f:
+            index = pickle.load(f)
+        index['version'] = "1.1.0"
+        with open(self.cache_dir / processor.ConversionCache.INDEX_FILE, 'wb') as f:
+            pickle.dump(index, f)
+        processor.ConversionCache(str(self.cache_dir))
+        self.assertFalse(any(path.exists() for path in artifacts))
+        self.assertTrue((self.cache_dir / "notes.txt").exists())
+    
+    def test_fingerprint_memo_is_bounded(self):
+        """Only the most recently hashed paths keep their (size, mtime) memo."""
+        cache = processor.ConversionCache(str(self.cache_dir), max_fingerprints=1)
+        first = str(self.input_dir / "first.xlsx")
+        second = str(self.input_dir / "second.xlsx")
+        cache.content_hash(first)
+        cache.content_hash(second)
+        self.assertEqual(list(cache.fingerprints), [os.path.abspath(second)])
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
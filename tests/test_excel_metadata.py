@@ -6,9 +6,11 @@ Test cases for Excel metadata detection.
 """
 
 import unittest
+import importlib.util
 import sys
 import os
 import json
+import datetime
 from pathlib import Path
 import openpyxl
 from openpyxl.styles import Alignment, PatternFill
@@ -18,6 +20,12 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from src.data_processing.excel_metadata_processor import convert_hierarchical_excel
 
+IMPROVED_PROCESSOR_PATH = (Path(__file__).parent.parent / "src" / "data_processing" /
+                           "excel-to-json" / "improved-excel-processor.py")
+_spec = importlib.util.spec_from_file_location("improved_excel_processor", IMPROVED_PROCESSOR_PATH)
+improved_processor = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(improved_processor)
+
 
 class TestExcelMetadataProcessor(unittest.TestCase):
     """Test cases for the Excel metadata processor."""
@@ -148,6 +156,49 @@ class TestExcelMetadataProcessor(unittest.TestCase):
         self.assertGreaterEqual(len(equipment_entries), 2, 
                                 "Not enough unique equipment entries found")
     
+    def _add_typed_sheet(self):
+        """Add a sheet with numeric, date, boolean and mixed columns to the fixture."""
+        wb = openpyxl.load_workbook(self.test_excel_file)
+        sheet = wb.create_sheet("Typed")
+        sheet.append(["Count", "Reading", "Logged", "Resolved", "Mixed", "Empty"])
+        for i in range(25):
+            mixed = [i, "n/a", 2.5, True, datetime.date(2023, 1, 1 + i % 28)][i % 5]
+            sheet.append([
+                i,
+                None if i % 7 == 0 else i * 0.25,
+                datetime.datetime(2023, 10, 1 + i % 28, 8, i),
+                i % 2 == 0,
+                mixed,
+                None
+            ])
+        wb.save(self.test_excel_file)
+        return openpyxl.load_workbook(self.test_excel_file)
+    
+    def test_columnar_typing_matches_per_cell(self):
+        """Column-at-a-time typing produces exactly the per-cell typed values."""
+        wb = self._add_typed_sheet()
+        for sheet in wb.worksheets:
+            columns = improved_processor.extract_typed_block(
+                sheet, 1, sheet.max_row, sheet.max_column)
+            for row in range(1, sheet.max_row + 1):
+                for col in range(1, sheet.max_column + 1):
+                    expected = improved_processor.get_typed_cell_value(sheet.cell(row, col))
+                    actual = columns[col - 1][row - 1]
+                    self.assertEqual(type(actual), type(expected), (sheet.title, row, col))
+                    self.assertEqual(actual, expected, (sheet.title, row, col))
+    
+    def test_columnar_extraction_matches_per_cell(self):
+        """Hierarchical extraction gives identical records on both typing paths."""
+        wb = self._add_typed_sheet()
+        for sheet in wb.worksheets:
+            merge_map = improved_processor.build_merge_map(sheet)
+            headers = [f"h{i}" for i in range(sheet.max_column)]
+            per_cell = improved_processor.extract_hierarchical_data(
+                sheet, merge_map, 1, headers, chunk_size=4, columnar=False)
+            columnar = improved_processor.extract_hierarchical_data(
+                sheet, merge_map, 1, headers, chunk_size=4, columnar=True)
+            self.assertEqual(columnar, per_cell)
+    
     def tearDown(self):
         """Clean up test fixtures."""
         # Normally we would clean up, but for debugging leave the files
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for the Excel directory watcher.
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+from pathlib import Path
+import openpyxl
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data_processing.excel_watcher import ExcelDirectoryWatcher
+
+
+class TestExcelDirectoryWatcher(unittest.TestCase):
+    """Test cases for the ExcelDirectoryWatcher class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "watch"
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+        self.input_dir = self.test_data_dir / "input"
+        self.output_dir = self.test_data_dir / "output"
+        os.makedirs(self.input_dir)
+        
+        self.watcher = ExcelDirectoryWatcher(self.input_dir, self.output_dir,
+                                             settle_time=5.0, max_workers=1)
+    
+    def _write_workbook(self, name, rows):
+        wb = openpyxl.Workbook()
+        sheet = wb.active
+        for col, header in enumerate(["Equipment", "Failure", "Cause", "Impact"], start=1):
+            sheet.cell(row=1, column=col).value = header
+        for row in range(2, rows + 2):
+            for col in range(1, 5):
+                sheet.cell(row=row, column=col).value = f"{name}_{row}_{col}"
+        wb.save(self.input_dir / name)
+    
+    def test_debounce_and_incremental_conversion(self):
+        """Files are converted once settled, and unchanged files are skipped."""
+        self._write_workbook("pumps.xlsx", 20)
+        
+        # First sighting only starts the settle timer
+        self.assertEqual(self.watcher.poll_once(wait=True, now=100.0), 0)
+        self.assertFalse((self.output_dir / "pumps.json").exists())
+        
+        # Settled - converted
+        self.assertEqual(self.watcher.poll_once(wait=True, now=106.0), 1)
+        self.assertTrue((self.output_dir / "pumps.json").exists())
+        
+        with open(self.output_dir / ExcelDirectoryWatcher.MANIFEST_FILE) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest["pumps.xlsx"]["status"], "success")
+        self.assertIn("hash", manifest["pumps.xlsx"])
+        
+        # Nothing changed - nothing to do
+        self.assertEqual(self.watcher.poll_once(wait=True, now=120.0), 0)
+        
+        # A new file is picked up without reconverting the old one
+        self._write_workbook("valves.xlsx", 20)
+        self.watcher.poll_once(wait=True, now=130.0)
+        self.assertEqual(self.watcher.poll_once(wait=True, now=136.0), 1)
+        
+        with open(self.output_dir / ExcelDirectoryWatcher.SUMMARY_FILE) as f:
+            summary = json.load(f)
+        self.assertEqual(set(summary), {"pumps.xlsx", "valves.xlsx"})
+    
+    def test_manifest_survives_restart(self):
+        """A restarted watcher does not reconvert processed files."""
+        self._write_workbook("pumps.xlsx", 20)
+        self.watcher.poll_once(wait=True, now=0.0)
+        self.watcher.poll_once(wait=True, now=10.0)
+        self.watcher.close()
+        
+        restarted = ExcelDirectoryWatcher(self.input_dir, self.output_dir, settle_time=0)
+        self.assertEqual(restarted.scan(), [])
+        restarted.close()
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.watcher.close()
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
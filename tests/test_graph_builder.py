@@ -15,6 +15,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.knowledge_graph.graph_builder import KnowledgeGraphBuilder
+from src.knowledge_graph.relationship_batch import RelationshipBatch
 
 
 class TestKnowledgeGraphBuilder(unittest.TestCase):
@@ -71,6 +72,29 @@ class TestKnowledgeGraphBuilder(unittest.TestCase):
         self.assertEqual(graph["A"]["B"]["type"], "causes")
         self.assertEqual(graph["A"]["B"]["strength"], 0.8)
     
+    def test_build_graph_from_batch(self):
+        """Test that a RelationshipBatch builds the same graph as dictionaries."""
+        batch = RelationshipBatch.from_records(self.test_relationships)
+        graph = self.builder.build_graph(batch)
+        expected = KnowledgeGraphBuilder().build_graph(self.test_relationships)
+        
+        self.assertEqual(sorted(graph.edges), sorted(expected.edges))
+        self.assertEqual(graph["A"]["C"]["type"], "correlates")
+        self.assertEqual(graph["A"]["C"]["strength"], 0.5)
+        self.assertEqual(graph["A"]["C"]["metadata"], {})
+    
+    def test_load_relationship_batch(self):
+        """Test that a batch spilled to .npz loads back unchanged."""
+        relationships = self.test_relationships + [
+            {"source": "C", "target": "E", "type": "leads", "strength": 0.9, "metadata": {"lag": 3}}
+        ]
+        RelationshipBatch.from_records(relationships).save(self.test_data_dir / "test_relationships.npz")
+        loaded = self.builder.load_relationships("test_relationships.npz")
+        
+        self.assertIsInstance(loaded, RelationshipBatch)
+        self.assertEqual(loaded.to_records(), relationships)
+        self.assertEqual(loaded[-1]["metadata"], {"lag": 3})
+    
     def test_analyze_graph(self):
         """Test analyzing a graph."""
         self.builder.build_graph(self.test_relationships)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for the lazy model registry.
+"""
+
+import unittest
+import sys
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import networkx as nx
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.knowledge_graph.ml.entity_extraction.extractor import DictionaryEntityExtractor
+from src.knowledge_graph.ml.model_registry import ModelRegistry, load_npz
+from src.knowledge_graph.ml.relationship_prediction.predictor import LinkPredictor
+
+
+class TestModelRegistry(unittest.TestCase):
+    """Test cases for the ModelRegistry class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.models_dir = Path(__file__).parent / "test_data" / "models"
+        shutil.rmtree(self.models_dir, ignore_errors=True)
+
+        self.extractor = DictionaryEntityExtractor([
+            {"term": "centrifugal pump", "type": "equipment"},
+            {"term": "mechanical seal", "type": "component", "synonyms": ["mech seal"]}
+        ])
+        graph = nx.DiGraph()
+        for cause in range(6):
+            for symptom in range(6):
+                if (cause + symptom) % 3:
+                    graph.add_edge(f"cause {cause}", f"symptom {symptom}", type="CAUSES", strength=0.8)
+        self.predictor = LinkPredictor(dimensions=4, n_lists=2).fit(graph, "CAUSES")
+
+        registry = ModelRegistry(self.models_dir)
+        registry.register("terms", self.extractor, version="1.0")
+        registry.register("causes", self.predictor, version="1.0")
+
+    def test_lazy_memory_mapped_loading(self):
+        """Test that models load on first use, memory-mapped, and match the originals."""
+        registry = ModelRegistry(self.models_dir)
+        self.assertEqual(registry.loaded(), [])
+        self.assertEqual(registry.names(), ["causes", "terms"])
+
+        extractor = registry.get("terms")
+        text = "Mech seal on the centrifugal pump"
+        self.assertEqual(extractor.extract(text), self.extractor.extract(text))
+        self.assertIsInstance(extractor._tables['fail'], np.memmap)
+        self.assertIs(registry.get("terms"), extractor)
+        self.assertEqual(registry.loaded(), ["terms"])
+
+        predictor = registry.get("causes")
+        self.assertIsInstance(predictor.source_embeddings, np.memmap)
+        np.testing.assert_allclose(predictor.predict(k=2).strength, self.predictor.predict(k=2).strength)
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        """Test that loading past the budget drops the least recently used model."""
+        manifest = ModelRegistry(self.models_dir).manifest()['models']
+        budget = max(entry['bytes'] for entry in manifest.values())
+        registry = ModelRegistry(self.models_dir, memory_budget=budget)
+
+        registry.get("terms")
+        registry.get("causes")
+        self.assertEqual(registry.loaded(), ["causes"])
+        self.assertEqual(registry.cached_bytes, manifest["causes"]['bytes'])
+
+    def test_manifest_validation(self):
+        """Test that version, format and artifact mismatches with the manifest are rejected."""
+        registry = ModelRegistry(self.models_dir)
+        with self.assertRaises(KeyError):
+            registry.get("missing")
+        with self.assertRaises(ValueError):
+            registry.get("terms", version="2.0")
+
+        manifest_path = self.models_dir / "manifest.json"
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest['models']['terms']['format_version'] = 0
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+        registry.reload()
+        with self.assertRaises(ValueError):
+            registry.get("terms")
+
+        with open(self.models_dir / "causes-1.0.npz", 'ab') as f:
+            f.write(b"\0")
+        with self.assertRaises(ValueError):
+            registry.get("causes")
+
+    def test_resolve_by_kind(self):
+        """Test that predictors resolve through the registry and kinds are checked."""
+        predictor = LinkPredictor.from_registry(self.models_dir, "causes", version="1.0")
+        self.assertIsInstance(predictor.source_embeddings, np.memmap)
+        np.testing.assert_allclose(predictor.predict(k=2).strength, self.predictor.predict(k=2).strength)
+
+        registry = ModelRegistry(self.models_dir)
+        self.assertEqual(registry.entry("terms", kind="entity_extractor")['version'], "1.0")
+        self.assertEqual(registry.loaded(), [])
+        with self.assertRaises(ValueError):
+            LinkPredictor.from_registry(registry, "terms")
+        registry.get("terms")
+        with self.assertRaises(ValueError):
+            registry.get("terms", kind="link_predictor")
+
+    def test_load_npz_memory_maps_members(self):
+        """Test that .npz members are mapped in place and read back exactly."""
+        path = self.models_dir / "arrays.npz"
+        arrays = {"values": np.arange(12.0).reshape(3, 4), "names": np.array(["a", "bc"]),
+                  "scalar": np.array(7), "empty": np.zeros((0, 2))}
+        np.savez(path, **arrays)
+        loaded = load_npz(path, mmap_mode='r')
+
+        self.assertIsInstance(loaded["values"], np.memmap)
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(loaded[name], array)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for the node attribute store and its secondary indexes.
+"""
+
+import unittest
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.chatbot.resident_graph import GraphSnapshot
+from src.knowledge_graph.graph_builder import KnowledgeGraphBuilder
+from src.knowledge_graph.node_store import NodeStore
+
+
+class TestNodeStore(unittest.TestCase):
+    """Test cases for the NodeStore class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.store = NodeStore(indexed_properties=["mtbf_hours"])
+        self.store.upsert(
+            ["Pump P-101", "Bearing wear", "bearing noise", "Seal leakage", "Bearing housing"],
+            types=["Equipment", "RootCause", "Symptom", "Symptom", "Component"],
+            properties={"mtbf_hours": [8000, None, None, 350.5, 12000],
+                        "vendor": ["Acme", None, None, None, "Acme"]}
+        )
+
+    def test_indexes(self):
+        """Test type, prefix and range lookups."""
+        self.assertEqual(self.store.of_type("symptom"), ["bearing noise", "Seal leakage"])
+        self.assertEqual(self.store.with_prefix("BEARING"), ["Bearing housing", "bearing noise", "Bearing wear"])
+        self.assertEqual(self.store.with_prefix("bearing n"), ["bearing noise"])
+        self.assertEqual(self.store.in_range("mtbf_hours", 300, 8000), ["Seal leakage", "Pump P-101"])
+        self.assertEqual(self.store.in_range("mtbf_hours", low=9000), ["Bearing housing"])
+        self.assertEqual(self.store.select("Symptom", prefix="b"), ["bearing noise"])
+        self.assertEqual(self.store.get("Pump P-101"),
+                         {"name": "Pump P-101", "type": "Equipment", "mtbf_hours": 8000.0, "vendor": "Acme"})
+        with self.assertRaises(KeyError):
+            self.store.in_range("vendor", 0, 1)
+
+    def test_indexes_follow_updates(self):
+        """Test that retyped, updated, removed and newly added nodes are reflected in lookups."""
+        self.store.upsert(["Seal leakage", "Bearing wear"], types=["RootCause", None],
+                          properties={"mtbf_hours": [20000, 100]})
+        self.store.remove(["Bearing housing"])
+        self.store.add("Bearing seal", "Component", mtbf_hours=150)
+
+        self.assertEqual(self.store.of_type("Symptom"), ["bearing noise"])
+        self.assertEqual(self.store.of_type("RootCause"), ["Bearing wear", "Seal leakage"])
+        self.assertEqual(self.store.with_prefix("bearing"), ["bearing noise", "Bearing seal", "Bearing wear"])
+        self.assertEqual(self.store.in_range("mtbf_hours", 0, 10000), ["Bearing wear", "Bearing seal", "Pump P-101"])
+        self.assertEqual(self.store.in_range("mtbf_hours", 15000), ["Seal leakage"])
+
+        self.store.rebuild_indexes()
+        self.assertEqual(self.store.of_type("RootCause"), ["Bearing wear", "Seal leakage"])
+        self.assertEqual(self.store.in_range("mtbf_hours", 0, 10000), ["Bearing wear", "Bearing seal", "Pump P-101"])
+
+    def test_integer_columns(self):
+        """Test that integer properties stay integers until a float arrives, and missing values stay missing."""
+        store = NodeStore(indexed_properties=["mtbf"])
+        store.upsert(["Pump", "Valve", "Seal"], properties={"mtbf": [5, None, 7], "starts": [3, 4, None]})
+        self.assertEqual(store._properties["mtbf"].data.dtype, np.int64)
+        self.assertEqual(store.get("Pump"), {"name": "Pump", "type": None, "mtbf": 5, "starts": 3})
+        self.assertIsInstance(store.get("Pump")["mtbf"], int)
+        self.assertNotIn("mtbf", store.get("Valve"))
+        self.assertEqual(store.in_range("mtbf", 0, 6), ["Pump"])
+
+        store.remove(["Pump"])
+        self.assertEqual(store.in_range("mtbf", 0, 10), ["Seal"])
+        store.add("Valve", mtbf=2.5)
+        self.assertEqual(store._properties["mtbf"].data.dtype, np.float64)
+        self.assertEqual(store.in_range("mtbf", 0, 10), ["Valve", "Seal"])
+        self.assertEqual(store.get("Seal")["mtbf"], 7)
+
+    def test_range_indexed_property_rejects_non_numbers(self):
+        """Test that a non-number for a range-indexed property is rejected before anything changes."""
+        store = NodeStore(indexed_properties=["mtbf"])
+        with self.assertRaises(ValueError):
+            store.upsert(["Pump", "Valve"], properties={"mtbf": [5, "high"]})
+        self.assertEqual(len(store), 0)
+        self.assertNotIn("mtbf", store._properties)
+
+        builder = KnowledgeGraphBuilder()
+        builder.nodes = store
+        with self.assertRaises(ValueError):
+            builder.build_graph([{"source": "Pump", "target": "Leak", "type": "CAUSES"}],
+                                node_properties={"Pump": {"mtbf": "high"}})
+        self.assertEqual(builder.graph.number_of_edges(), 0)
+        builder.build_graph([{"source": "Pump", "target": "Leak", "type": "CAUSES"}],
+                            node_properties={"Pump": {"mtbf": 5}})
+        self.assertEqual(builder.find_nodes(ranges={"mtbf": (0, 10)}), ["Pump"])
+
+    def test_matches_full_scan(self):
+        """Test that indexed lookups agree with scanning every node after incremental ingest."""
+        rng = np.random.default_rng(0)
+        store = NodeStore(indexed_properties=["score"])
+        names = [f"{rng.choice(['pump', 'Pipe', 'valve'])} {i}" for i in range(3000)]
+        types = rng.choice(["Equipment", "Component", "Symptom"], 3000).tolist()
+        scores = rng.random(3000).tolist()
+        for start in range(0, 3000, 700):
+            store.upsert(names[start:start + 700], types[start:start + 700],
+                         {"score": scores[start:start + 700]})
+
+        self.assertEqual(sorted(store.of_type("Component")),
+                         sorted(name for name, t in zip(names, types) if t == "Component"))
+        self.assertEqual(sorted(store.with_prefix("pi")), sorted(name for name in names if name.startswith("Pipe")))
+        self.assertEqual(sorted(store.in_range("score", 0.25, 0.5)),
+                         sorted(name for name, score in zip(names, scores) if 0.25 <= score <= 0.5))
+        stats = store.stats()
+        self.assertEqual(stats["nodes"], 3000)
+        self.assertIn("range_index.score", stats["memory_bytes"])
+
+    def test_builder_maintains_store(self):
+        """Test that build_graph and resolve_entities keep the builder's node store current."""
+        builder = KnowledgeGraphBuilder()
+        builder.build_graph(
+            [{"source": "Worn bearing", "target": "Bearing noise", "type": "CAUSES", "strength": 0.8},
+             {"source": "worn-bearing", "target": "Seal leakage", "type": "CAUSES", "strength": 0.6}],
+            node_types={"Worn bearing": "RootCause", "Bearing noise": "Symptom", "Seal leakage": "Symptom"},
+            node_properties={"Bearing noise": {"severity": 3}}
+        )
+        builder.resolve_entities()
+
+        self.assertEqual(builder.find_nodes("Symptom"), ["Bearing noise", "Seal leakage"])
+        self.assertEqual(builder.find_nodes(prefix="worn"), ["Worn bearing"])
+        self.assertEqual(builder.nodes.get("Bearing noise")["severity"], 3)
+
+    def test_properties_reach_graph_consumers(self):
+        """Test that node properties are exported and usable by ranking and chatbot retrieval."""
+        builder = KnowledgeGraphBuilder()
+        builder.nodes = NodeStore(indexed_properties=["mtbf_hours"])
+        builder.build_graph(
+            [{"source": "Worn bearing", "target": "Bearing noise", "type": "CAUSES", "strength": 0.8},
+             {"source": "Worn bearing", "target": "Seal leakage", "type": "CAUSES", "strength": 0.6},
+             {"source": "Misalignment", "target": "Bearing noise", "type": "CAUSES", "strength": 0.7}],
+            node_types={"Worn bearing": "RootCause", "Misalignment": "RootCause"},
+            node_properties={"Worn bearing": {"mtbf_hours": 9000, "criticality": "high"},
+                             "Misalignment": {"mtbf_hours": 300}}
+        )
+        
+        self.assertEqual(builder.graph.nodes["Worn bearing"]["mtbf_hours"], 9000)
+        self.assertEqual(builder.analyze_graph()["root_cause_candidates"][0], "Worn bearing")
+        self.assertEqual(builder.analyze_graph("RootCause", {"mtbf_hours": (0, 500)})["root_cause_candidates"],
+                         ["Misalignment"])
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            builder.output_dir = temp_dir
+            with open(builder.export_graph()) as f:
+                graph_data = json.load(f)
+        nodes = {node["id"]: node for node in graph_data["nodes"]}
+        self.assertEqual(nodes["Worn bearing"]["criticality"], "high")
+        
+        results = GraphSnapshot(graph_data).search_index.search("high criticality", kinds=["node"])
+        self.assertEqual(results[0]["name"], "Worn bearing")
+        self.assertEqual(results[0]["properties"], {"mtbf_hours": 9000, "criticality": "high"})
+
+
+if __name__ == "__main__":
+    unittest.main()
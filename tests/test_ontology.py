@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for the compiled ontology.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.knowledge_graph.graph_builder import KnowledgeGraphBuilder
+from src.knowledge_graph.relationship_batch import RelationshipBatch
+from src.knowledge_graph.schema.ontology import DEFAULT_ONTOLOGY, Ontology
+
+
+class TestOntology(unittest.TestCase):
+    """Test cases for the Ontology class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.node_types = {
+            "Pump P-101": "Equipment",
+            "Pump P-102": "equipment",
+            "Mechanical seal": "Component",
+            "Seal leakage": "Symptom",
+            "Worn bearing": "root_cause"
+        }
+        self.relationships = [
+            {"source": "Pump P-101", "target": "Mechanical seal", "type": "CONTAINS", "strength": 1.0},
+            {"source": "Mechanical seal", "target": "Seal leakage", "type": "EXHIBITS", "strength": 0.9},
+            {"source": "Worn bearing", "target": "Seal leakage", "type": "CAUSES", "strength": 0.8},
+            {"source": "Pump P-101", "target": "Pump P-102", "type": "CAUSES", "strength": 0.7},
+            {"source": "Pump P-101", "target": "Pump P-102", "type": "RELATES_TO", "strength": 0.5},
+            {"source": "Vibration", "target": "Seal leakage", "type": "correlated", "strength": 0.6},
+            {"source": "Vibration", "target": "Seal leakage", "type": "CAUSES", "strength": 0.6}
+        ]
+
+    def test_signatures(self):
+        """Test single signature lookups, with case- and separator-insensitive names."""
+        self.assertTrue(DEFAULT_ONTOLOGY.allows("CAUSES", "RootCause", "Symptom"))
+        self.assertTrue(DEFAULT_ONTOLOGY.allows("causes", "root cause", "symptom"))
+        self.assertFalse(DEFAULT_ONTOLOGY.allows("CAUSES", "Equipment", "Equipment"))
+        self.assertTrue(DEFAULT_ONTOLOGY.allows("RELATES_TO", "Equipment", "Equipment"))
+        self.assertFalse(DEFAULT_ONTOLOGY.allows("REPAIRS", "Equipment", "Component"))
+        with self.assertRaises(ValueError):
+            Ontology(signatures={"CAUSES": [("Fault", "Symptom")]})
+
+    def test_validate_reports_each_violation(self):
+        """Test that violations are reported per relationship with their reason."""
+        report = DEFAULT_ONTOLOGY.validate(self.relationships, self.node_types)
+
+        self.assertEqual(report.valid.tolist(), [True, True, True, False, True, True, True])
+        self.assertEqual(report.records(), [{
+            "row": 3, "source": "Pump P-101", "target": "Pump P-102", "type": "CAUSES",
+            "strength": 0.7, "source_type": "Equipment", "target_type": "Equipment",
+            "reason": "signature not allowed"
+        }])
+
+        strict = DEFAULT_ONTOLOGY.validate(self.relationships, self.node_types, strict=True)
+        self.assertEqual(strict.counts(), {"unknown relationship type": 1, "untyped source": 1,
+                                           "signature not allowed": 1})
+        self.assertEqual(strict.violations.tolist(), [3, 5, 6])
+
+    def test_validate_large_batch(self):
+        """Test that a vectorized batch validation agrees with single lookups."""
+        rng = np.random.default_rng(0)
+        nodes = [f"node {i}" for i in range(200)]
+        types = ["Equipment", "Component", "Symptom", "RootCause"]
+        node_types = {node: types[i % 4] for i, node in enumerate(nodes)}
+        rel_types = ["CONTAINS", "EXHIBITS", "CAUSES", "RELATES_TO"]
+        batch = RelationshipBatch(nodes, rng.integers(0, 200, 5000), rng.integers(0, 200, 5000),
+                                  rel_types, rng.integers(0, 4, 5000), np.ones(5000))
+        report = DEFAULT_ONTOLOGY.validate(batch, node_types)
+
+        expected = [DEFAULT_ONTOLOGY.allows(rel['type'], node_types[rel['source']], node_types[rel['target']])
+                    for rel in batch]
+        self.assertEqual(report.valid.tolist(), expected)
+        self.assertEqual(len(report.valid_batch()), sum(expected))
+
+    def test_builder_skips_invalid_relationships(self):
+        """Test that a builder with an ontology keeps valid edges, types nodes and reports the rest."""
+        builder = KnowledgeGraphBuilder(ontology=True)
+        builder.build_graph(self.relationships[:2], node_types=self.node_types)
+        graph = builder.build_graph(RelationshipBatch.from_records(self.relationships[2:4]),
+                                    node_types={"Pump P-102": "Equipment", "Worn bearing": "RootCause"})
+
+        self.assertEqual(graph.nodes["Mechanical seal"]["type"], "Component")
+        self.assertTrue(graph.has_edge("Worn bearing", "Seal leakage"))
+        self.assertFalse(graph.has_edge("Pump P-101", "Pump P-102"))
+        self.assertEqual(builder.validation_report.violations.tolist(), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for the NDJSON and columnar output writers of the improved Excel processor.
+"""
+
+import unittest
+import importlib.util
+import sys
+import os
+import json
+import shutil
+from pathlib import Path
+import openpyxl
+import pandas as pd
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data_processing.structured_data_analysis import StructuredDataProcessor
+
+PROCESSOR_PATH = (Path(__file__).parent.parent / "src" / "data_processing" /
+                  "excel-to-json" / "improved-excel-processor.py")
+_spec = importlib.util.spec_from_file_location("improved_excel_processor", PROCESSOR_PATH)
+processor = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(processor)
+
+
+class TestOutputFormats(unittest.TestCase):
+    """Test cases for the streaming and columnar output writers."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "formats"
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+        os.makedirs(self.test_data_dir)
+        self.excel_file = self.test_data_dir / "readings.xlsx"
+        
+        wb = openpyxl.Workbook()
+        sheet = wb.active
+        sheet.merge_cells("A1:E1")
+        sheet["A1"] = "SENSOR READINGS"
+        sheet.append(["Site:", "Plant A"])
+        sheet.append(["Unit:", "Processing Unit 3"])
+        sheet.append([])
+        sheet.append(["Equipment", "Reading", "Count", "Status", "Note"])
+        for i in range(40):
+            sheet.append([f"Pump {i % 4}", i * 0.5, i, i % 3 == 0, None if i % 5 else "check"])
+        sheet.merge_cells("D30:D32")
+        wb.save(self.excel_file)
+        
+        self.config = {'metadata_max_rows': 3}
+        processor.convert_hierarchical_excel(
+            str(self.excel_file), str(self.test_data_dir / "reference.json"), self.config)
+        with open(self.test_data_dir / "reference.json") as f:
+            self.reference = json.load(f)
+        self.data_processor = StructuredDataProcessor()
+        self.data_processor.data_dir = str(self.test_data_dir)
+    
+    def test_ndjson_matches_json(self):
+        """NDJSON output holds the same records, with metadata in a sidecar."""
+        output = self.test_data_dir / "readings.json"
+        result = processor.convert_hierarchical_excel(
+            str(self.excel_file), str(output), dict(self.config, output_format='ndjson'))
+        
+        self.assertEqual(result["data_rows"], len(self.reference["data"]))
+        with open(self.test_data_dir / "readings.ndjson") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records, self.reference["data"])
+        
+        with open(self.test_data_dir / "readings.meta.json") as f:
+            sidecar = json.load(f)
+        self.assertEqual(sidecar["metadata"], self.reference["metadata"])
+        self.assertEqual(sidecar["record_count"], len(records))
+    
+    def test_npz_column_projection(self):
+        """The .npz writer round-trips through load_data reading single columns."""
+        # The first record repeats the header row - keep the columns homogeneous
+        records = self.reference["data"][1:]
+        output = self.test_data_dir / "readings.json"
+        processor.write_columnar_output(
+            iter(records), self.reference["metadata"], str(output), 'npz')
+        
+        df = self.data_processor.load_data("readings.npz", columns=["Reading", "Count"])
+        self.assertEqual(list(df.columns), ["Reading", "Count"])
+        self.assertEqual(len(df), len(records))
+        expected = [record.get("Reading") for record in records]
+        self.assertEqual(df["Reading"].tolist(), expected)
+        
+        full = self.data_processor.load_data("readings.npz")
+        notes = [record.get("Note") for record in records]
+        self.assertEqual([None if pd.isna(v) else v for v in full["Note"]], notes)
+        self.assertIn("Status.sub_values", full.columns)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for the random-walk corpus generator.
+"""
+
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.knowledge_graph.algorithms.random_walks import CSRGraph, generate_walks
+from src.knowledge_graph.graph_builder import KnowledgeGraphBuilder
+
+
+class TestRandomWalks(unittest.TestCase):
+    """Test cases for random walks."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.builder = KnowledgeGraphBuilder()
+        self.builder.build_graph([
+            {"source": "Pump", "target": "Seal leakage", "type": "EXHIBITS", "strength": 0.9},
+            {"source": "Pump", "target": "Vibration", "type": "EXHIBITS", "strength": 0.1},
+            {"source": "Worn bearing", "target": "Vibration", "type": "CAUSES", "strength": 0.0},
+            {"source": "Worn bearing", "target": "Noise", "type": "CAUSES", "strength": 0.0}
+        ])
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def test_alias_tables_match_strengths(self):
+        """Test that the alias tables reproduce each node's strength distribution exactly."""
+        rng = np.random.default_rng(0)
+        degree = rng.integers(0, 40, 500)
+        indptr = np.concatenate([[0], np.cumsum(degree)])
+        weights = rng.random(indptr[-1]) ** 3
+        weights[rng.random(len(weights)) < 0.1] = 0.0
+        graph = CSRGraph(np.arange(500), indptr, rng.integers(0, 500, indptr[-1]), weights)
+
+        owner = np.repeat(np.arange(500), degree)
+        implied = graph.prob / degree[owner]
+        np.add.at(implied, graph.alias, (1.0 - graph.prob) / degree[owner])
+        totals = np.bincount(owner, weights=weights, minlength=500)
+        expected = np.where(totals[owner] > 0, weights / np.where(totals > 0, totals, 1.0)[owner],
+                            1.0 / degree[owner])
+        np.testing.assert_allclose(implied, expected, atol=1e-12)
+        self.assertTrue(((graph.alias >= indptr[owner]) & (graph.alias < indptr[owner + 1])).all())
+
+    def test_walks_follow_edges(self):
+        """Test that walks move along graph edges, weighted by strength."""
+        graph = CSRGraph.from_graph(self.builder.graph)
+        starts = np.full(20000, list(graph.nodes).index("Pump"))
+        walks = graph.walk(starts, 2, np.random.default_rng(0))
+
+        names = graph.nodes[walks[:, 1]]
+        self.assertAlmostEqual((names == "Seal leakage").mean(), 0.9, delta=0.02)
+        self.assertEqual(set(names), {"Seal leakage", "Vibration"})
+        # All-zero strengths fall back to uniform transitions
+        starts = np.full(20000, list(graph.nodes).index("Worn bearing"))
+        names = graph.nodes[graph.walk(starts, 2, np.random.default_rng(0))[:, 1]]
+        self.assertAlmostEqual((names == "Noise").mean(), 0.5, delta=0.02)
+
+    def test_directed_walks_stop_at_sinks(self):
+        """Test that directed walks are padded with -1 after a node without out-edges."""
+        graph = CSRGraph.from_graph(self.builder.graph, directed=True)
+        walks = graph.walk(np.arange(len(graph.nodes)), 4, np.random.default_rng(0))
+
+        self.assertTrue((walks[:, 2:] == -1).all())
+        self.assertEqual(graph.node_names(walks[:1]), [["Pump", graph.nodes[walks[0, 1]]]])
+
+        # Steps stop at the dead ends instead of counting the -1 padding
+        path = os.path.join(self.temp_dir.name, "directed.npy")
+        stats = generate_walks(graph, path, walks_per_node=2, walk_length=4)
+        written = np.load(path)
+        self.assertEqual(stats['steps'], int((written >= 0).sum()) - len(written))
+        self.assertLess(stats['steps'], len(written) * 3)
+
+    def test_generate_walks_reproducible(self):
+        """Test that the memory-mapped corpus is identical for any worker count."""
+        graph = CSRGraph.from_graph(self.builder.graph)
+        serial = os.path.join(self.temp_dir.name, "serial.npy")
+        parallel = os.path.join(self.temp_dir.name, "parallel.npy")
+        stats = generate_walks(graph, serial, walks_per_node=4, walk_length=6, seed=3, shard_walks=7)
+        generate_walks(graph, parallel, walks_per_node=4, walk_length=6, seed=3, shard_walks=7, workers=2)
+
+        walks = np.load(serial)
+        self.assertEqual(walks.dtype, np.int32)
+        self.assertEqual(walks.shape, (20, 6))
+        self.assertEqual(stats['steps'], 20 * 5)
+        self.assertTrue((walks >= 0).all())
+        np.testing.assert_array_equal(walks[:5, 0], np.arange(5))
+        np.testing.assert_array_equal(walks, np.load(parallel))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for direct Excel-to-relationship extraction.
+"""
+
+import unittest
+import sys
+import os
+import re
+import zipfile
+from pathlib import Path
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data_processing.create_kg_excel import create_knowledge_graph_excel
+from src.data_processing.relationship_extraction import (
+    RelationshipPatternTable, extract_relationships, iter_sheet_relationships, iter_xlsx_rows
+)
+from src.knowledge_graph.graph_builder import KnowledgeGraphBuilder
+
+
+class TestRelationshipExtraction(unittest.TestCase):
+    """Test cases for relationship extraction from entity sheets."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = Path(__file__).parent / "test_data"
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.excel_file = self.test_data_dir / "kg_research_data.xlsx"
+        create_knowledge_graph_excel(str(self.excel_file))
+    
+    def test_pattern_table(self):
+        """Verb phrases map to types and ID lists fan out to one record per target."""
+        table = RelationshipPatternTable()
+        parsed = list(table.parse("KG_001", "- Supervises KG_005, KG_006\n- Member of Lab KG_010"))
+        self.assertEqual(parsed, [
+            ("KG_001", "KG_005", "SUPERVISES"),
+            ("KG_001", "KG_006", "SUPERVISES"),
+            ("KG_001", "KG_010", "MEMBER_OF"),
+        ])
+        self.assertEqual(list(table.parse("KG_001", "Mentors KG_007")),
+                         [("KG_001", "KG_007", "MENTORS")])
+    
+    def test_extract_from_workbook(self):
+        """Merged relationship cells of the demo workbook become relationship records."""
+        relationships = extract_relationships(str(self.excel_file))
+        
+        self.assertEqual(len(relationships), 9)
+        self.assertIn({'source': 'KG_001', 'target': 'KG_002', 'type': 'COLLABORATES_WITH',
+                       'source_type': 'Researcher'}, relationships)
+        self.assertIn({'source': 'KG_002', 'target': 'KG_015', 'type': 'FUNDS',
+                       'source_type': 'Institution'}, relationships)
+    
+    def test_cells_without_references(self):
+        """Cells without the optional 'r' attribute take the column after the previous cell."""
+        stripped = self.test_data_dir / "kg_research_data_no_refs.xlsx"
+        with zipfile.ZipFile(self.excel_file) as source, zipfile.ZipFile(stripped, "w") as target:
+            for item in source.infolist():
+                data = source.read(item.filename)
+                if item.filename.startswith("xl/worksheets/sheet"):
+                    # Drop the reference of every cell that directly follows the previous one
+                    def strip_row(match):
+                        position = -1
+                        cells = []
+                        for cell in re.split(r'(?=<c )', match.group(0)):
+                            ref = re.match(r'<c r="([A-Z]+)\d+"', cell)
+                            if ref:
+                                column = 0
+                                for char in ref.group(1):
+                                    column = column * 26 + ord(char) - 64
+                                if column - 1 == position + 1:
+                                    cell = cell.replace(ref.group(0), "<c", 1)
+                                position = column - 1
+                            cells.append(cell)
+                        return "".join(cells)
+                    data = re.sub(r"<row .*?</row>", strip_row, data.decode("utf-8"), flags=re.S).encode("utf-8")
+                target.writestr(item, data)
+        
+        self.assertEqual(list(iter_xlsx_rows(stripped)), list(iter_xlsx_rows(self.excel_file)))
+        self.assertEqual(extract_relationships(str(stripped)), extract_relationships(str(self.excel_file)))
+    
+    def test_stream_into_builder(self):
+        """The relationship stream feeds build_graph without an intermediate file."""
+        builder = KnowledgeGraphBuilder()
+        graph = builder.build_graph(iter_sheet_relationships(str(self.excel_file)))
+        
+        self.assertEqual(graph.number_of_edges(), 9)
+        self.assertEqual(graph["KG_001"]["KG_006"]["type"], "SUPERVISES")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for link prediction.
+"""
+
+import unittest
+import sys
+import os
+from pathlib import Path
+
+import numpy as np
+import networkx as nx
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.knowledge_graph.graph_builder import KnowledgeGraphBuilder
+from src.knowledge_graph.ml.relationship_prediction.predictor import LinkPredictor
+
+
+class TestLinkPredictor(unittest.TestCase):
+    """Test cases for the LinkPredictor class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = Path(__file__).parent / "test_data"
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        
+        # Ten groups of causes and symptoms; causes only ever cause symptoms of their own group
+        rng = np.random.default_rng(0)
+        self.graph = nx.DiGraph()
+        for group in range(10):
+            for cause in range(15):
+                for symptom in range(15):
+                    if rng.random() < 0.4:
+                        self.graph.add_edge(f"cause {group}-{cause}", f"symptom {group}-{symptom}",
+                                            type="CAUSES", strength=0.8)
+            self.graph.add_edge(f"cause {group}-0", f"pump {group}", type="RELATES_TO", strength=1.0)
+        self.predictor = LinkPredictor(dimensions=16, n_lists=8, n_probe=2).fit(self.graph, "CAUSES")
+    
+    @staticmethod
+    def _pairs(batch):
+        return list(zip(batch.nodes[batch.source].tolist(), batch.nodes[batch.target].tolist()))
+    
+    def test_predictions_are_new_in_group_edges(self):
+        """Test that predicted edges are new, stay within their group and are scored for build_graph."""
+        predictions = self.predictor.predict(k=5)
+        pairs = self._pairs(predictions)
+        
+        self.assertTrue(pairs)
+        self.assertFalse(any(self.graph.has_edge(u, v) or u == v for u, v in pairs))
+        in_group = [u.split()[1].split("-")[0] == v.split()[1].split("-")[0] for u, v in pairs]
+        self.assertGreater(np.mean(in_group), 0.95)
+        self.assertTrue(all(0 <= s <= 1 for s in predictions.strength))
+        self.assertEqual(set(predictions.types), {"CAUSES"})
+        
+        builder = KnowledgeGraphBuilder()
+        builder.build_graph(predictions)
+        self.assertEqual(builder.graph.number_of_edges(), len(predictions))
+    
+    def test_full_probe_matches_brute_force(self):
+        """Test that probing every list returns the exact top-k."""
+        predictions = self.predictor.predict(k=3, n_probe=8)
+        nodes = self.predictor.nodes.tolist()
+        scores = self.predictor.source_embeddings @ self.predictor.target_embeddings.T
+        for u, v in self.graph.edges:
+            scores[nodes.index(u), nodes.index(v)] = -np.inf
+        np.fill_diagonal(scores, -np.inf)
+        
+        found = {}
+        for u, v, score in zip(predictions.source, predictions.target, predictions.metadata['score']):
+            found.setdefault(u, []).append(score)
+        for u, top in found.items():
+            np.testing.assert_allclose(sorted(top, reverse=True), np.sort(scores[u])[::-1][:3],
+                                       rtol=1e-5)
+        self.assertEqual(len(found), 10 * 15)
+    
+    def test_restrict_targets(self):
+        """Test that predictions can be limited to a set of target nodes."""
+        symptoms = [node for node in self.graph if node.startswith("symptom 3-")]
+        predictions = self.predictor.predict(k=2, sources=["cause 3-1", "cause 3-2"], targets=symptoms)
+        
+        self.assertEqual(len(predictions), 4)
+        self.assertTrue(all(v in symptoms for _, v in self._pairs(predictions)))
+    
+    def test_save_and_load(self):
+        """Test that a saved predictor predicts the same edges."""
+        path = self.test_data_dir / "test_predictor.npz"
+        self.predictor.save(path)
+        loaded = LinkPredictor.load(path)
+        
+        self.assertEqual(loaded.predict(k=3).to_records(), self.predictor.predict(k=3).to_records())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for the chatbot's resident, hot-reloading knowledge graph.
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.chatbot.azure_bot import RootCauseAnalysisBot
+from src.chatbot.resident_graph import ResidentGraph
+
+
+def graph_with(causes):
+    """Node-link graph where each (cause, symptom, strength) is a CAUSES edge."""
+    names = sorted({name for cause, symptom, _ in causes for name in (cause, symptom)})
+    return {"nodes": [{"id": name} for name in names],
+            "links": [{"source": cause, "target": symptom, "type": "CAUSES", "strength": strength}
+                      for cause, symptom, strength in causes]}
+
+
+class TestResidentGraph(unittest.TestCase):
+    """Test cases for the ResidentGraph class."""
+
+    def setUp(self):
+        """Write a small graph to a temporary file."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "graph.json")
+        self.write([("Worn bearing", "Bearing noise", 0.8)])
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def write(self, causes, mtime_offset=0):
+        """Replace the graph file atomically, moving its mtime so the change is always visible."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(graph_with(causes), f)
+        os.replace(tmp_path, self.path)
+        stamp = time.time() + mtime_offset
+        os.utime(self.path, (stamp, stamp))
+
+    def test_reload_swaps_snapshots(self):
+        """Test that changes swap in a new snapshot while held snapshots stay unchanged."""
+        graph = ResidentGraph(self.path)
+        self.assertTrue(graph.reload())
+        self.assertFalse(graph.reload())
+        in_flight = graph.current
+
+        self.write([("Worn bearing", "Bearing noise", 0.8), ("Misalignment", "Bearing noise", 0.9)], 10)
+        self.assertTrue(graph.reload())
+        self.assertEqual(graph.current.causes_of("Bearing noise"), ["Misalignment", "Worn bearing"])
+        self.assertEqual(in_flight.causes_of("Bearing noise"), ["Worn bearing"])
+        self.assertEqual(len(in_flight.search_index.search("misalignment")), 0)
+
+        # A broken file keeps the last good snapshot until it changes again
+        with open(self.path, "w") as f:
+            f.write('{"nodes": [')
+        os.utime(self.path, (time.time() + 20, time.time() + 20))
+        current = graph.current
+        self.assertFalse(graph.reload())
+        self.assertIs(graph.current, current)
+        self.assertIsNotNone(graph.last_error)
+        self.write([("Cavitation", "Pump vibration", 0.7)], 30)
+        self.assertTrue(graph.reload())
+        self.assertEqual(graph.reloads, 3)
+
+    def test_background_watcher(self):
+        """Test that the watcher thread picks up a rewritten file."""
+        graph = ResidentGraph(self.path, poll_interval=0.02).start()
+        try:
+            first = graph.current
+            self.write([("Cavitation", "Pump vibration", 0.7)], 10)
+            deadline = time.time() + 5
+            while graph.current is first and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertIn("Cavitation", graph.current.nodes)
+        finally:
+            graph.stop()
+
+    def test_queries_never_parse(self):
+        """Test that bot queries use the resident snapshot without reading the graph file."""
+        bot = RootCauseAnalysisBot()
+        bot.graph.path = self.path
+        self.assertEqual(bot.graph.state, "not_started")
+        bot.create_knowledge_base()
+        try:
+            with mock.patch("json.load", side_effect=AssertionError("graph parsed during a query")):
+                response = bot.query("What causes bearing noise?")
+                self.assertIs(bot.load_knowledge_graph(), bot.graph.current.graph_data)
+            self.assertIn("Worn bearing", response["related_entities"])
+        finally:
+            bot.close()
+
+    def test_query_reports_load_state(self):
+        """Test that a missing or broken graph is reported, and the first query starts loading it."""
+        bot = RootCauseAnalysisBot()
+        bot.graph.path = os.path.join(self.temp_dir.name, "later.json")
+        bot.graph.poll_interval = 0.02
+        try:
+            self.assertIn("No knowledge graph found", bot.query("bearing noise")["answer"])
+            self.assertTrue(bot.graph.running)
+
+            os.replace(self.path, bot.graph.path)
+            deadline = time.time() + 5
+            while bot.graph.current is None and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertIn("Worn bearing", bot.query("What causes bearing noise?")["related_entities"])
+        finally:
+            bot.close()
+
+        graph = ResidentGraph(self.path)
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(graph.state, "not_started")
+        self.assertFalse(graph.reload())
+        self.assertEqual(graph.state, "failed")
+        bot = RootCauseAnalysisBot()
+        bot.graph = graph
+        try:
+            self.assertIn("could not be loaded", bot.query("bearing noise")["answer"])
+        finally:
+            bot.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
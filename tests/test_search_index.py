@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for the chatbot's local BM25 search index.
+"""
+
+import json
+import math
+import os
+import tempfile
+import unittest
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.chatbot.azure_bot import RootCauseAnalysisBot
+from src.chatbot.search_index import LocalSearchIndex, tokenize, vbyte_decode, vbyte_encode
+
+
+GRAPH = {
+    "nodes": [{"id": "Pump P-101", "type": "Equipment"}, {"id": "Seal leakage", "type": "Symptom"},
+              {"id": "Worn bearing", "type": "RootCause"}, {"id": "Bearing noise", "type": "Symptom"}],
+    "links": [{"source": "Worn bearing", "target": "Bearing noise", "type": "CAUSES", "strength": 0.8,
+               "metadata": {"evidence": "vibration spectrum"}},
+              {"source": "Pump P-101", "target": "Seal leakage", "type": "EXHIBITS", "strength": 0.6}]
+}
+
+
+class TestLocalSearchIndex(unittest.TestCase):
+    """Test cases for the LocalSearchIndex class."""
+
+    def setUp(self):
+        """Set up a random corpus over a skewed vocabulary, large enough for multi-block postings."""
+        rng = np.random.default_rng(0)
+        words = [f"w{i}" for i in range(2000)]
+        weights = 1.0 / np.arange(1, 2001)
+        self.index = LocalSearchIndex()
+        for i in range(6000):
+            text = " ".join(rng.choice(words, rng.integers(2, 30), p=weights / weights.sum()))
+            self.index.add_document(f"doc{i}", text, kind=["node", "edge", "chunk"][i % 3])
+        self.index.build()
+
+    def test_vbyte_round_trip(self):
+        """Test variable-byte encoding of small and large gaps."""
+        values = np.array([0, 1, 127, 128, 16383, 16384, 2 ** 31, 2 ** 40])
+        buffer, offsets = vbyte_encode(values)
+        self.assertEqual(len(buffer), 1 + 1 + 1 + 2 + 2 + 3 + 5 + 6)
+        self.assertEqual(offsets.tolist()[:4], [0, 1, 2, 3])
+        self.assertEqual(vbyte_decode(buffer).tolist(), values.tolist())
+
+    def test_matches_bm25(self):
+        """Test that early-terminated top-k equals exhaustive scoring and a direct BM25 computation."""
+        tokens = [tokenize(document["text"]) for document in self.index.documents]
+        avg_length = np.mean([len(doc) for doc in tokens])
+        df = Counter(term for doc in tokens for term in set(doc))
+
+        def bm25(query, doc):
+            counts, score = Counter(doc), 0.0
+            for term in set(tokenize(query)) & set(counts):
+                idf = math.log(1 + (len(tokens) - df[term] + 0.5) / (df[term] + 0.5))
+                tf = counts[term]
+                score += idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * len(doc) / avg_length))
+            return score
+
+        for query in ["w0 w1 w700", "w2 w3 w4 w5 w1500", "w0", "W12 the w40"]:
+            expected = sorted(range(len(tokens)), key=lambda doc: (-bm25(query, tokens[doc]), doc))[:10]
+            results = self.index.search(query, top=10)
+            self.assertEqual([result["id"] for result in results], [f"doc{doc}" for doc in expected])
+            self.assertAlmostEqual(results[0]["@search.score"], bm25(query, tokens[expected[0]]))
+            exhaustive = self.index.search(query, top=10, early_termination=False)
+            self.assertEqual([result["id"] for result in exhaustive], [result["id"] for result in results])
+        self.assertEqual(self.index.search("unknown words"), [])
+
+    def test_ties_match_exhaustive(self):
+        """Test that tied scores at the cut give the same documents with and without early termination."""
+        rng = np.random.default_rng(1)
+        words = [f"t{i}" for i in range(12)]
+        index = LocalSearchIndex()
+        # Few distinct texts, so most scores are shared by many documents
+        texts = [" ".join(rng.choice(words, rng.integers(1, 4))) for _ in range(40)]
+        for i in range(3000):
+            index.add_document(f"doc{i}", texts[rng.integers(len(texts))])
+        for _ in range(200):
+            query = " ".join(rng.choice(words, rng.integers(1, 5)))
+            top = int(rng.integers(1, 30))
+            ranked = index.search(query, top=3000, early_termination=False)
+            expected = sorted(ranked, key=lambda result: (-result["@search.score"], int(result["id"][3:])))
+            expected = [result["id"] for result in expected[:top]]
+            self.assertEqual([result["id"] for result in index.search(query, top=top)], expected)
+            self.assertEqual([result["id"] for result in index.search(query, top=top, early_termination=False)],
+                             expected)
+
+    def test_kind_filter_and_persistence(self):
+        """Test kind filtering and that a saved index answers like the original."""
+        results = self.index.search("w0 w1 w9", top=7, kinds=["edge"])
+        self.assertEqual(len(results), 7)
+        self.assertTrue(all(result["kind"] == "edge" for result in results))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "index.npz")
+            self.index.save(path)
+            loaded = LocalSearchIndex.load(path)
+        self.assertEqual(loaded.search("w3 w77", top=5), self.index.search("w3 w77", top=5))
+        self.assertEqual(loaded.stats(), self.index.stats())
+
+    def test_bot_answers_from_local_index(self):
+        """Test that the chatbot retrieves graph entries and text chunks without Azure."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            graph_path = Path(temp_dir, "graph.json")
+            graph_path.write_text(json.dumps(GRAPH))
+            Path(temp_dir, "manual.txt").write_text("Replace the mechanical seal when leakage exceeds limits.")
+            bot = RootCauseAnalysisBot()
+            bot.graph.path = str(graph_path)
+            bot.process_unstructured_data(temp_dir)
+            bot.create_knowledge_base()
+            bot.close()
+
+        response = bot.query("What causes bearing noise?")
+        self.assertIn("Worn bearing", response["related_entities"])
+        self.assertIn("Bearing noise", response["related_entities"])
+        self.assertEqual(response["sources"][0], "knowledge_graph")
+        self.assertEqual(response["confidence"], 1.0)
+        self.assertIn("manual.txt", bot.query("seal leakage")["sources"])
+        self.assertEqual(bot.query("turbine")["related_entities"], [])
+
+        class AzureSearchClient:
+            """Stand-in returning results shaped like an Azure index's fields."""
+
+            def search(self, search_text, top):
+                return [{"id": "1", "content": "Bearing noise follows bearing wear", "@search.score": 3.2}]
+
+        bot.search_client = AzureSearchClient()
+        response = bot.query("bearing noise")
+        self.assertIn("Bearing noise follows bearing wear", response["answer"])
+        self.assertEqual(response["related_entities"], [])
+        self.assertEqual(response["confidence"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
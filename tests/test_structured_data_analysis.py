@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test cases for the chunked loading and analysis in structured_data_analysis.
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data_processing.structured_data_analysis import StructuredDataProcessor
+from src.data_processing.correlation_engine import (CorrelationStatistics, correlated_pairs,
+                                                    parallel_correlated_pairs)
+from src.knowledge_graph.relationship_batch import RelationshipBatch
+
+
+class TestStructuredDataProcessor(unittest.TestCase):
+    """Test cases for StructuredDataProcessor streaming support."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "structured"
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+        os.makedirs(self.test_data_dir)
+        
+        rng = np.random.default_rng(0)
+        temperature = rng.normal(80, 5, 1000)
+        self.df = pd.DataFrame({
+            'equipment': [f"Pump {i % 5}" for i in range(1000)],
+            'temperature': temperature,
+            'vibration': temperature * 0.3 + rng.normal(0, 0.2, 1000),
+            'pressure': rng.normal(10, 1, 1000),
+            'cycles': np.arange(1000)
+        })
+        self.df.loc[::7, 'pressure'] = np.nan
+        self.df.to_csv(self.test_data_dir / "sensors.csv", index=False)
+        with open(self.test_data_dir / "sensors.json", 'w') as f:
+            json.dump(self.df.head(250).to_dict(orient='records'), f)
+        
+        self.processor = StructuredDataProcessor()
+        self.processor.data_dir = str(self.test_data_dir)
+    
+    def test_csv_chunks_with_projection(self):
+        """Test that CSV chunks respect the row budget, column projection and dtypes."""
+        chunks = list(self.processor.iter_data("sensors.csv", columns=['equipment', 'cycles'],
+                                               chunksize=300, engine='pandas'))
+        
+        self.assertEqual([len(chunk) for chunk in chunks], [300, 300, 300, 100])
+        self.assertEqual(list(chunks[0].columns), ['equipment', 'cycles'])
+        self.assertIsInstance(chunks[0]['equipment'].dtype, pd.CategoricalDtype)
+        self.assertEqual(chunks[0]['cycles'].dtype, np.int16)
+        self.assertEqual(pd.concat(chunks)['cycles'].tolist(), list(range(1000)))
+    
+    def test_json_chunks(self):
+        """Test streaming the records of a JSON array."""
+        chunks = list(self.processor.iter_data("sensors.json", columns=['cycles', 'pressure'],
+                                               chunksize=100))
+        
+        self.assertEqual([len(chunk) for chunk in chunks], [100, 100, 50])
+        self.assertEqual(list(chunks[-1].columns), ['cycles', 'pressure'])
+        self.assertEqual(chunks[-1]['cycles'].iloc[-1], 249)
+    
+    def test_relationships_as_list_or_batch(self):
+        """Test that relationships are plain dictionaries by default and a batch on request."""
+        relationships = self.processor.identify_relationships(self.df)
+        batch = self.processor.identify_relationships(self.df, as_batch=True)
+        
+        self.assertIsInstance(relationships, list)
+        self.assertIsInstance(batch, RelationshipBatch)
+        self.assertEqual(batch.to_records(), relationships)
+        self.assertIsInstance(self.processor.identify_temporal_relationships(self.df), list)
+    
+    def test_streaming_relationships_match_in_memory(self):
+        """Test that correlations over chunks match the whole-frame computation."""
+        expected = self.processor.identify_relationships(self.df)
+        chunks = self.processor.iter_data("sensors.csv", chunksize=128, engine='pandas')
+        streamed = self.processor.identify_relationships(chunks)
+        
+        self.assertEqual([(r['source'], r['target']) for r in streamed],
+                         [(r['source'], r['target']) for r in expected])
+        for got, want in zip(streamed, expected):
+            self.assertAlmostEqual(got['strength'], want['strength'], places=5)
+    
+    def test_block_correlations_match_pandas(self):
+        """Test that block-wise correlation mining matches DataFrame.corr()."""
+        rng = np.random.default_rng(1)
+        base = rng.normal(size=(500, 6))
+        values = np.hstack([base, base + rng.normal(scale=0.5, size=(500, 6)), rng.normal(size=(500, 5))])
+        values[rng.random(values.shape) < 0.05] = np.nan
+        values[:, 16] = 3.0
+        frame = pd.DataFrame(values)
+        
+        rows, cols, strengths = correlated_pairs(values.copy(), 0.3, block_size=4)
+        corr = frame.corr().to_numpy()
+        expected = [(i, j) for i in range(17) for j in range(i + 1, 17) if abs(corr[i, j]) > 0.3]
+        
+        self.assertEqual(list(zip(rows.tolist(), cols.tolist())), expected)
+        np.testing.assert_allclose(strengths, [corr[i, j] for i, j in expected])
+        
+        parallel = parallel_correlated_pairs(frame, 0.3, block_size=4, workers=2)
+        np.testing.assert_array_equal(parallel[0], rows)
+        np.testing.assert_array_equal(parallel[1], cols)
+        np.testing.assert_allclose(parallel[2], strengths)
+    
+    def test_merged_statistics_match_pandas(self):
+        """Test that statistics merged from chunks, workers and disk match DataFrame.corr()."""
+        numeric = self.df.select_dtypes(include=[np.number])
+        columns = list(numeric.columns)
+        worker_a = CorrelationStatistics(columns)
+        worker_b = CorrelationStatistics(columns)
+        for start in range(0, 600, 150):
+            worker_a.update(numeric.iloc[start:start + 150])
+        worker_b.update(numeric.iloc[600:].to_numpy())
+        
+        state_file = self.test_data_dir / "stats.npz"
+        worker_a.save(state_file)
+        merged = CorrelationStatistics.load(state_file).merge(worker_b)
+        
+        np.testing.assert_allclose(merged.correlation(), numeric.corr().to_numpy(), atol=1e-10)
+        self.assertEqual(merged.count[0, 2], numeric[['temperature', 'pressure']].dropna().shape[0])
+        from_stats = self.processor.identify_relationships(merged)
+        from_frame = self.processor.identify_relationships(self.df)
+        self.assertEqual([(r['source'], r['target']) for r in from_stats],
+                         [(r['source'], r['target']) for r in from_frame])
+        self.assertAlmostEqual(from_stats[0]['strength'], from_frame[0]['strength'], places=10)
+    
+    def test_temporal_relationships_find_leader(self):
+        """Test that lagged cross-correlation recovers which series leads and by how much."""
+        rng = np.random.default_rng(2)
+        signal = rng.normal(size=406)
+        series = pd.DataFrame({
+            'timestamp': np.arange(400)[::-1],
+            'outlet_temp': signal[:400][::-1] + rng.normal(scale=0.2, size=400),
+            'inlet_temp': signal[6:][::-1],
+            'humidity': rng.normal(size=400)
+        })
+        
+        relationships = self.processor.identify_temporal_relationships(series, time_column='timestamp')
+        
+        self.assertEqual(len(relationships), 1)
+        self.assertEqual(relationships[0]['source'], 'inlet_temp')
+        self.assertEqual(relationships[0]['target'], 'outlet_temp')
+        self.assertEqual(relationships[0]['type'], 'leads')
+        self.assertEqual(relationships[0]['metadata'], {'lag': 6})
+        self.assertGreater(relationships[0]['strength'], 0.9)
+    
+    def test_association_relationships(self):
+        """Test association rules between categorical columns, checked against direct counts."""
+        rng = np.random.default_rng(3)
+        component = rng.choice(['pump', 'valve', 'motor'], 3000)
+        failure = np.where(component == 'pump', 'cavitation', rng.choice(['wear', 'leak'], 3000))
+        orders = pd.DataFrame({
+            'component': component,
+            'failure': failure,
+            'shift': rng.choice(['day', 'night'], 3000),
+            'hours': rng.normal(size=3000)
+        })
+        
+        relationships = self.processor.identify_association_relationships(orders)
+        by_pair = {(r['source'], r['target']): r for r in relationships}
+        
+        rule = by_pair[('failure=cavitation', 'component=pump')]
+        self.assertEqual(rule['type'], 'implies')
+        self.assertEqual(rule['strength'], 1.0)
+        self.assertAlmostEqual(rule['metadata']['support'], np.mean(component == 'pump'))
+        self.assertAlmostEqual(rule['metadata']['lift'], 1 / np.mean(component == 'pump'))
+        # Independent columns give no rules with lift >= 1 at 60% confidence
+        self.assertFalse(any('shift=' in r['target'] for r in relationships))
+        for r in relationships:
+            self.assertGreaterEqual(r['strength'], self.processor.min_confidence)
+    
+    def test_mutual_information_finds_nonlinear_dependencies(self):
+        """Test that mutual information links non-linear and mixed-type column pairs."""
+        rng = np.random.default_rng(4)
+        load = rng.normal(size=8000)
+        frame = pd.DataFrame({
+            'load': load,
+            'vibration': load ** 2 + rng.normal(scale=0.1, size=8000),
+            'alarm': np.where(np.abs(load) > 1, 'high', 'normal'),
+            'ambient': rng.normal(size=8000),
+            'crew': rng.choice(['A', 'B', 'C'], 8000)
+        })
+        
+        self.assertEqual(self.processor.identify_relationships(frame), [])
+        relationships = self.processor.identify_relationships(frame, method='mutual_information')
+        pairs = {(r['source'], r['target']) for r in relationships}
+        
+        self.assertIn(('load', 'vibration'), pairs)
+        self.assertIn(('vibration', 'alarm'), pairs)
+        self.assertFalse(any('ambient' in pair or 'crew' in pair for pair in pairs))
+        for r in relationships:
+            self.assertEqual(r['type'], 'dependent')
+            self.assertTrue(0 < r['strength'] <= 1)
+    
+    def test_export_relationships(self):
+        """Test that relationships with NumPy values export to JSON and .npz."""
+        self.processor.output_dir = str(self.test_data_dir)
+        relationships = self.processor.identify_relationships(self.df)
+        relationships += [{'source': 'pressure', 'target': 'vibration', 'type': 'leads',
+                           'strength': np.float32(0.75), 'metadata': {'lag': np.int64(2)}}]
+        
+        json_path = self.processor.export_for_knowledge_graph(relationships, "relationships.json")
+        with open(json_path) as f:
+            exported = json.load(f)
+        self.assertEqual(exported[:-1], relationships[:-1])
+        self.assertEqual(exported[-1]['metadata'], {'lag': 2})
+        self.assertEqual(exported[-1]['strength'], 0.75)
+        
+        npz_path = self.processor.export_for_knowledge_graph(relationships, "relationships.npz")
+        self.assertEqual(RelationshipBatch.load(npz_path).to_records(), exported)
+    
+    def test_export_keeps_every_field(self):
+        """Test that exports keep string metadata, integer types and extra record keys."""
+        self.processor.output_dir = str(self.test_data_dir)
+        relationships = [
+            {'source': 'Pump P-101', 'target': 'Seal leakage', 'type': 'EXHIBITS', 'strength': 0.9,
+             'metadata': {'note': 'x', 'lag': 3}, 'source_type': 'Equipment'},
+            {'source': 'Pump P-101', 'target': 'Impeller', 'type': 'CONTAINS', 'strength': 1.0,
+             'metadata': {'lag': 5}}
+        ]
+        
+        json_path = self.processor.export_for_knowledge_graph(relationships, "relationships.json")
+        with open(json_path) as f:
+            self.assertEqual(json.load(f), relationships)
+        
+        batch = RelationshipBatch.from_records(relationships)
+        self.assertEqual(batch.metadata['lag'].dtype, np.int64)
+        self.assertEqual(batch[0]['metadata'], {'note': 'x', 'lag': 3})
+        self.assertEqual(batch[1]['metadata'], {'lag': 5})
+        npz_path = self.processor.export_for_knowledge_graph(batch, "relationships.npz")
+        loaded = RelationshipBatch.load(npz_path)
+        self.assertEqual(loaded.to_records(), batch.to_records())
+        self.assertEqual((loaded + batch[1:]).to_records()[-1], batch[1])
+    
+    def test_threshold_from_config(self):
+        """Test that the correlation threshold is read from a YAML config."""
+        config_path = self.test_data_dir / "config.yaml"
+        with open(config_path, 'w') as f:
+            f.write("analysis:\n  correlation_threshold: 0.995\n")
+        processor = StructuredDataProcessor(str(config_path))
+        
+        self.assertEqual(processor.correlation_threshold, 0.995)
+        self.assertEqual(processor.identify_relationships(self.df), [])
+        self.assertEqual(len(StructuredDataProcessor().identify_relationships(self.df)), 1)
+    
+    def test_clean_data_accepts_chunks(self):
+        """Test that clean_data cleans a chunk stream lazily."""
+        chunks = self.processor.iter_data("sensors.csv", chunksize=400, engine='pandas')
+        cleaned = list(self.processor.clean_data(chunks))
+        
+        self.assertEqual(sum(len(chunk) for chunk in cleaned), 1000)
+        self.assertFalse(any(chunk['pressure'].isna().any() for chunk in cleaned))
+    
+    def test_clean_data_shrinks_frame(self):
+        """Test dtype downcasting, categoricals and per-column filling."""
+        df = self.df.copy()
+        df.loc[3, 'equipment'] = None
+        cleaned = self.processor.clean_data(df)
+        report = self.processor.cleaning_report
+        
+        self.assertIsInstance(cleaned['equipment'].dtype, pd.CategoricalDtype)
+        self.assertEqual(cleaned.loc[3, 'equipment'], "unknown")
+        self.assertEqual(cleaned['cycles'].dtype, np.int16)
+        self.assertEqual(cleaned['pressure'].isna().sum(), 0)
+        self.assertLess(report['bytes_after'], report['bytes_before'])
+        # The caller's frame is left untouched
+        self.assertTrue(df['pressure'].isna().any())
+        self.assertEqual(df['cycles'].dtype, np.int64)
+    
+    def test_clean_data_dedupes_across_chunks(self):
+        """Test that duplicate rows are removed globally across a chunk stream."""
+        rows = pd.concat([self.df, self.df.iloc[100:400], self.df.iloc[[5, 5]]], ignore_index=True)
+        rows.to_csv(self.test_data_dir / "duplicated.csv", index=False)
+        
+        chunks = self.processor.iter_data("duplicated.csv", chunksize=250, engine='pandas')
+        cleaned = pd.concat(list(self.processor.clean_data(chunks)), ignore_index=True)
+        
+        self.assertEqual(len(cleaned), 1000)
+        self.assertEqual(sorted(cleaned['cycles'].tolist()), list(range(1000)))
+        self.assertEqual(self.processor.cleaning_report['rows_before'], 1302)
+        self.assertEqual(self.processor.cleaning_report['rows_after'], 1000)
+    
+    def test_clean_data_dedupes_across_dtypes(self):
+        """Test that a row repeated in a chunk whose NaNs made its columns float is still a duplicate."""
+        first = pd.DataFrame({'cycles': [1, 2, 3], 'load': [10, 20, 30]})
+        second = pd.DataFrame({'cycles': [2.0, 4.0, np.nan], 'load': [20.0, np.nan, 50.0]})
+        self.assertEqual(first['cycles'].dtype, np.int64)
+        self.assertEqual(second['cycles'].dtype, np.float64)
+        
+        cleaned = pd.concat(list(self.processor.clean_data(iter([first, second]))), ignore_index=True)
+        
+        self.assertEqual(self.processor.cleaning_report['rows_after'], 5)
+        self.assertEqual(cleaned['cycles'].tolist(), [1, 2, 3, 4, 0])
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()